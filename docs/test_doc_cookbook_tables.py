@@ -71,6 +71,46 @@ class Meta:
             page_size = None
 
 
+def test_how_do_i_paginate_a_very_large_table():
+    # language=rst
+    """
+    .. _Paginator.keyset:
+
+    How do I paginate a very large table?
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    The default paginator counts the rows to know the number of pages, and
+    fetches a page with an offset. Both get slow for big tables. Use keyset
+    pagination to instead link to the next and previous page with a cursor
+    based on the sort order of the table:
+
+    """
+    Table(
+        auto__model=Album,
+        parts__page__keyset=True,
+    )
+
+    # language=rst
+    """
+    The cursor is made from the values of the sort columns of the table plus
+    the primary key, so sort columns should not be nullable.
+
+    If you want to keep page numbers but the count is too slow, you can
+    change how the paginator counts with `parts__page__count`:
+
+    - `paginator__capped_count` counts at most `parts__page__max_count` rows (default 10000), and sets `count_is_capped` on the paginator if there were more, so you can show "10000+".
+    - `paginator__estimated_count` uses the estimate from the query planner on PostgreSQL for big results.
+    - `paginator__cached_count` caches the count, keyed on the SQL of the query, for `parts__page__count_cache_timeout` seconds (default 60).
+    """
+    from iommi.table import paginator__capped_count
+
+    Table(
+        auto__model=Album,
+        parts__page__count=paginator__capped_count,
+        parts__page__max_count=1000,
+    )
+
+
 def test_how_do_i_customize_the_rendering_of_a_cell():
     # language=rst
     """
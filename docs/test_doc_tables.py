@@ -178,6 +178,11 @@ class Meta:
     """
     This will behave like an ordinary table but when the csv rendering endpoint is invoked the content will be
     returned as a text file in CSV format.
+
+    The CSV file is streamed to the client. For a `QuerySet` the rows are
+    fetched from the database in chunks, so memory use stays constant even for
+    very large exports. The chunk size can be set with the table parameter
+    `extra_evaluated__report_chunk_size` (default 2000).
     """
 
     # @test
@@ -40,13 +40,21 @@
     class Template:
         def __init__(self, template_string):
             self.s = template_string
+            self._compiled = None
 
         def render(self, context):
+            # Compile on first render, so the template engine doesn't need to be set up at import time
+            if self._compiled is None:
+                if DjangoTemplate is not None:
+                    self._compiled = DjangoTemplate(self.s)
+                else:
+                    assert JinjaTemplate is not None
+                    self._compiled = JinjaTemplate(self.s)
+
             if DjangoTemplate is not None:
-                return DjangoTemplate(self.s).render(context=context)
+                return self._compiled.render(context=context)
             else:
-                assert JinjaTemplate is not None
-                return JinjaTemplate(self.s).render(**context.flatten())
+                return self._compiled.render(**context.flatten())
 
     template_types = template_types + (Template,)
 
@@ -60,14 +68,33 @@ def csrf(request):
         # noinspection PyUnresolvedReferences
         from django.template import engines
 
-        def get_template_from_string(template_code, origin=None, name=None):
-            del origin, name  # the origin and name parameters seems not to be implemented in django 1.8
+        def get_template_engine():
             try:
-                engine = engines['django']
+                return engines['django']
             except InvalidTemplateEngineError:
-                engine = engines.all()[0]
+                return engines.all()[0]
 
-            return engine.from_string(template_code)
+        def get_template_from_string(template_code, origin=None, name=None):
+            del origin, name  # the origin and name parameters seems not to be implemented in django 1.8
+            return get_template_engine().from_string(template_code)
+    else:  # pragma: no cover
+        def get_template_engine():
+            return None
+
+    _compiled_template_by_key = {}
+
+    def get_cached_template_from_string(template_code):
+        """
+        Like `get_template_from_string`, but compiled templates are kept per
+        template engine for the lifetime of the process. Only use this for
+        template source from a small fixed set, like the page shell.
+        """
+        key = (get_template_engine(), template_code)
+        template = _compiled_template_by_key.get(key)
+        if template is None:
+            template = get_template_from_string(template_code)
+            _compiled_template_by_key[key] = template
+        return template
 
     def render_template(request, template, context):
         """
@@ -151,14 +178,27 @@ def __call__(self, string_value):
     def get_template_from_string(s, origin=None, name=None):
         return Template(s)
 
+    # Template compiles its source once per process, so there is nothing more to cache here
+    get_cached_template_from_string = get_template_from_string
+
     def render_to_string(template_name, context, request=None):
         return format_html(render(template_name, request=request, **context))
 
+    _compiled_jinja_template_by_source = {}
+
     class Template:
         def __init__(self, template_string, **kwargs):
             from jinja2 import Template
 
-            self.template = Template(template_string, **kwargs)
+            if kwargs:
+                self.template = Template(template_string, **kwargs)
+                return
+
+            # jinja2 templates are immutable once compiled, so they can be shared
+            self.template = _compiled_jinja_template_by_source.get(template_string)
+            if self.template is None:
+                self.template = Template(template_string)
+                _compiled_jinja_template_by_source[template_string] = self.template
 
         def render(self, context, request=None):
             return self.template.render(**context)
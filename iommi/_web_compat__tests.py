@@ -1,7 +1,13 @@
 from django.template import RequestContext
 
+from iommi import (
+    html,
+    Page,
+)
 from iommi._web_compat import (
+    _compiled_template_by_key,
     format_html,
+    get_cached_template_from_string,
     render_template,
     Template,
 )
@@ -105,3 +111,31 @@ def test_format_html7():
 def test_render_template():
     actual = render_template(req('get'), Template('{{foo}}'), dict(foo=1))
     assert type(actual) == SafeText
+
+
+def test_template_compiles_once():
+    t = Template('{{ field }}')
+    assert t.render(context=RequestContext(req('get'), dict(field='foo'))).strip() == 'foo'
+    compiled = t._compiled
+    assert t.render(context=RequestContext(req('get'), dict(field='bar'))).strip() == 'bar'
+    assert t._compiled is compiled
+
+
+def test_cached_template_from_string():
+    t = get_cached_template_from_string('{{ foo }}')
+    assert get_cached_template_from_string('{{ foo }}') is t
+    assert get_cached_template_from_string('{{ bar }}') is not t
+
+
+def test_render_root_reuses_compiled_shell():
+    _compiled_template_by_key.clear()
+
+    class MyPage(Page):
+        foo = html.div('foo')
+
+    first = MyPage().bind(request=req('get')).render_to_response().content
+    assert len(_compiled_template_by_key) == 1
+    shell = list(_compiled_template_by_key.values())[0]
+
+    assert MyPage().bind(request=req('get')).render_to_response().content == first
+    assert list(_compiled_template_by_key.values()) == [shell]
@@ -1,3 +1,4 @@
+import django
 from django.conf import settings
 from django.db.models import QuerySet
 from django.utils.encoding import force_str
@@ -52,6 +53,33 @@ def view_wrapper(request, **view_params):
     return view_wrapper
 
 
+def build_as_async_view_wrapper(target):
+    """
+    Like `build_as_view_wrapper`, but returns an async view. Binding and
+    rendering run in a worker thread, while the parts load their data with
+    the async ORM in between (see `Part.aprefetch`).
+    """
+    assert django.VERSION >= (3, 1), 'Async views need Django 3.1 or later'
+    from asgiref.sync import sync_to_async
+    from iommi.path import decode_path_components  # avoid circular import
+    if not target.is_refine_done and getattr(settings, 'IOMMI_REFINE_DONE_OPTIMIZATION', True):
+        target = target.refine_done()
+
+    def bind(request, **view_params):
+        decode_path_components(request, **view_params)
+        return target.bind(request=request)
+
+    async def view_wrapper(request, **view_params):
+        bound = await sync_to_async(bind)(request, **view_params)
+        return await bound.arender_to_response()
+
+    view_wrapper.__name__ = f'{target.__class__.__name__}.as_async_view'
+    view_wrapper.__doc__ = target.__class__.__doc__
+    view_wrapper.__iommi_target__ = target
+
+    return view_wrapper
+
+
 def capitalize(s):
     if isinstance(s, SafeText):
         return SafeText(capitalize('' + s))  # str(s) will give you back SafeText, and then we have infinite recursion
@@ -71,6 +71,7 @@ def get_default_classes():
         iommi.table.Cell,
         iommi.table.ColumnHeader,
         iommi.table.HeaderConfig,
+        iommi.table.FooterConfig,
         iommi.attrs.Attrs,
         iommi.table.ColumnHeader,
         iommi.fragment.Container,
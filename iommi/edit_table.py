@@ -1,9 +1,12 @@
+import warnings
 from collections import defaultdict
 from typing import (
     Optional,
     Type,
 )
 
+import django
+from django.db import transaction
 from django.db.models import QuerySet
 from django.http import HttpResponseRedirect
 from django.template import (
@@ -197,11 +200,7 @@ def validate(cells_iterator, form, errors):
     if table.edit_errors or table.create_errors:
         return None
 
-    if isinstance(table.initial_rows, QuerySet):
-        prefix = path_join(table.iommi_path, 'pk_delete_')
-        table.bulk_queryset(prefix=prefix).delete()
-
-    def save(cells_iterator, form):
+    def write(cells_iterator, form):
         for cells in cells_iterator:
             instance = cells.row
             form.instance = instance
@@ -219,10 +218,53 @@ def save(cells_iterator, form):
                 instance.pk = None
             if instance.pk is None:
                 attrs_to_save = None
-            instance.save(update_fields=attrs_to_save)
+            yield instance, attrs_to_save
 
-    save(table.cells_for_rows(), table.edit_form)
-    save(table.cells_for_rows_for_create(), table.create_form)
+    def save():
+        for instance, attrs_to_save in write(table.cells_for_rows(), table.edit_form):
+            instance.save(update_fields=attrs_to_save)
+            table.on_save_row(table=table, row=instance, is_create=False, update_fields=attrs_to_save)
+        for instance, attrs_to_save in write(table.cells_for_rows_for_create(), table.create_form):
+            instance.save(update_fields=attrs_to_save)
+            table.on_save_row(table=table, row=instance, is_create=True, update_fields=attrs_to_save)
+
+    def bulk_save():
+        manager = table.model._default_manager
+
+        # Rows that changed the same set of attributes can share one UPDATE statement
+        instances_by_attrs = defaultdict(list)
+        for instance, attrs_to_save in write(table.cells_for_rows(), table.edit_form):
+            if attrs_to_save:
+                instances_by_attrs[tuple(attrs_to_save)].append(instance)
+        for attrs_to_save, instances in items(instances_by_attrs):
+            manager.bulk_update(instances, attrs_to_save, batch_size=table.bulk_save_batch_size)
+
+        created = [instance for instance, _ in write(table.cells_for_rows_for_create(), table.create_form)]
+        if created:
+            manager.bulk_create(created, batch_size=table.bulk_save_batch_size)
+
+        for attrs_to_save, instances in items(instances_by_attrs):
+            for instance in instances:
+                table.on_save_row(table=table, row=instance, is_create=False, update_fields=list(attrs_to_save))
+        for instance in created:
+            table.on_save_row(table=table, row=instance, is_create=True, update_fields=None)
+
+    def delete():
+        if isinstance(table.initial_rows, QuerySet):
+            prefix = path_join(table.iommi_path, 'pk_delete_')
+            table.bulk_queryset(prefix=prefix).delete()
+
+    # QuerySet.bulk_update is new in Django 2.2, before that the rows are saved one by one
+    if table.bulk_save and django.VERSION < (2, 2):
+        warnings.warn('EditTable.bulk_save requires Django 2.2+, saving the rows one by one instead')
+    if table._use_bulk_save():
+        assert table.model is not None, 'bulk_save requires EditTable.model to be set'
+        with transaction.atomic(using=table.model._default_manager.db):
+            delete()
+            bulk_save()
+    else:
+        delete()
+        save()
 
     if 'post_save' in table.extra:
         table.extra.post_save(**table.iommi_evaluate_parameters())
@@ -237,6 +279,8 @@ class EditTable(Table):
     create_form: Form = Refinable()
     form_class: Type[Form] = Refinable()
     parent_form: Optional[Form] = Refinable()
+    bulk_save: bool = Refinable()
+    bulk_save_batch_size: Optional[int] = Refinable()
 
     class Meta:
         form_class = Form
@@ -245,6 +289,8 @@ class Meta:
         outer__attrs__enctype = 'multipart/form-data'
         outer__attrs__method = 'post'
         cells_class = EditCells
+        # The rows are edited and saved, so they should be complete
+        projection = False
         actions__submit = dict(
             call_target__attribute='primary',
             display_name=gettext_lazy('Save'),
@@ -265,6 +311,8 @@ class Meta:
         actions_below = True
         edit_form = EMPTY
         create_form = EMPTY
+        bulk_save = False
+        bulk_save_batch_size = None
 
         attrs = {
             'data-next-virtual-pk': '-1',
@@ -433,6 +481,11 @@ def parse_virtual_pk(k):
         if not virtual_pks:
             return
 
+        if self._use_bulk_save():
+            # Virtual pks count down from -1 as rows are added, so this is the order the user added them in.
+            # bulk_create inserts the rows in this order.
+            virtual_pks = sorted(virtual_pks, reverse=True)
+
         rows = [
             self.model(pk=pk)
             for pk in virtual_pks
@@ -446,7 +499,20 @@ def parse_virtual_pk(k):
     def get_errors(self):
         return set()
 
+    def _use_bulk_save(self):
+        return self.bulk_save and django.VERSION >= (2, 2)
+
     @staticmethod
     @refinable
     def preprocess_row_for_create(row, **_):
         return row
+
+    @staticmethod
+    @refinable
+    def on_save_row(row, is_create, update_fields, **_):
+        """
+        Called for each row after it has been saved. With `bulk_save=True` rows are written with `bulk_update`/`bulk_create`, which do not send the `pre_save`/`post_save` signals, so this is the place to do per row work instead.
+
+        Rows created by `bulk_create` only get their `pk` set on databases that can return rows from a bulk insert (e.g. PostgreSQL and SQLite 3.35+, but not MySQL), so there `row.pk` is `None` for new rows. On Django before 2.2 `bulk_save` is not available, so a warning is issued and the rows are saved one by one.
+        """
+        pass
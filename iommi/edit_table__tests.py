@@ -1,4 +1,6 @@
+import django
 import pytest
+from django.db.models import QuerySet
 from iommi.struct import Struct
 
 from iommi.declarative.namespace import Namespace
@@ -286,4 +288,94 @@ def test_formset_table_post_delete():
 
     assert TFoo.objects.all().count() == 0
 
+
+@pytest.mark.django_db
+def test_formset_table_post_bulk_save():
+    from django.db import connection
+
+    foos = [TFoo.objects.create(a=i, b='asd') for i in range(4)]
+    saved_rows = []
+
+    def on_save_row(row, is_create, update_fields, **_):
+        saved_rows.append((row.pk, is_create, update_fields))
+
+    edit_table = EditTable(
+        auto__rows=TFoo.objects.all(),
+        columns__a__edit=dict(include=True, call_target__attribute='integer'),
+        columns__b__edit__include=True,
+        bulk_save=True,
+        on_save_row=on_save_row,
+    ).refine_done()
+
+    executed = []
+
+    def count_queries(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count_queries):
+        response = edit_table.bind(request=req('POST', **{
+            f'columns/a/{foos[0].pk}': '10',
+            f'columns/b/{foos[0].pk}': 'asd',
+            f'columns/a/{foos[1].pk}': '11',
+            f'columns/b/{foos[1].pk}': 'asd',
+            f'columns/a/{foos[2].pk}': '2',
+            f'columns/b/{foos[2].pk}': 'changed',
+            f'columns/a/{foos[3].pk}': '3',
+            f'columns/b/{foos[3].pk}': 'asd',
+            'columns/a/-1': '20',
+            'columns/b/-1': 'new',
+            'columns/a/-2': '21',
+            'columns/b/-2': 'new',
+            '-actions/submit': '',
+        })).render_to_response()
+    assert response.status_code == 302
+
+    # count, select rows, one update per changed attribute set, one insert
+    assert len([x for x in executed if not x.startswith(('SAVEPOINT', 'RELEASE'))]) == 5
+
+    assert [(x.a, x.b) for x in TFoo.objects.all()] == [
+        (10, 'asd'),
+        (11, 'asd'),
+        (2, 'changed'),
+        (3, 'asd'),
+        (20, 'new'),
+        (21, 'new'),
+    ]
+
+    assert saved_rows[:3] == [
+        (foos[0].pk, False, ['a']),
+        (foos[1].pk, False, ['a']),
+        (foos[2].pk, False, ['b']),
+    ]
+    assert [(is_create, update_fields) for _, is_create, update_fields in saved_rows[3:]] == [(True, None), (True, None)]
+
+
+@pytest.mark.django_db
+def test_formset_table_post_bulk_save_before_django_2_2(monkeypatch):
+    monkeypatch.setattr(django, 'VERSION', (2, 1, 0, 'final', 0))
+
+    def bulk_update(*_, **__):
+        assert False, 'bulk_update is not available before Django 2.2'  # pragma: no cover
+
+    monkeypatch.setattr(QuerySet, 'bulk_update', bulk_update)
+    foo = TFoo.objects.create(a=1, b='asd')
+    saved_rows = []
+
+    edit_table = EditTable(
+        auto__rows=TFoo.objects.all(),
+        columns__a__edit=dict(include=True, call_target__attribute='integer'),
+        bulk_save=True,
+        on_save_row=lambda row, update_fields, **_: saved_rows.append((row.pk, update_fields)),
+    )
+    with pytest.warns(UserWarning, match='bulk_save requires Django 2.2'):
+        response = edit_table.bind(request=req('POST', **{
+            f'columns/a/{foo.pk}': '10',
+            '-actions/submit': '',
+        })).render_to_response()
+    assert response.status_code == 302
+
+    assert saved_rows == [(foo.pk, ['a'])]
+    assert TFoo.objects.get().a == 10
+
 # TODO: attr=None on a column crashes
@@ -1,14 +1,23 @@
-from typing import Callable
+from typing import (
+    Callable,
+    List,
+    Optional,
+)
 
-from iommi.base import keys
+from iommi.base import (
+    keys,
+    MISSING,
+)
 from iommi.refinable import (
     EvaluatedRefinable,
     Refinable,
 )
 from iommi.shortcut import with_defaults
 from iommi.traversable import (
+    build_long_path,
     get_long_path_by_path,
     get_path_by_long_path,
+    rebuild_shared_path_index,
     Traversable,
 )
 
@@ -70,11 +79,13 @@ def own_evaluate_parameters(self):
         return dict(endpoint=self)
 
 
-def find_target(*, path, root):
+def find_long_path(*, path, root):
     assert path.startswith(DISPATCH_PATH_SEPARATOR)
     p = path[1:]
 
     long_path = get_long_path_by_path(root).get(p)
+    if long_path is None and p not in get_path_by_long_path(root) and rebuild_shared_path_index(root):
+        long_path = get_long_path_by_path(root).get(p)
     if long_path is None:
         long_path = p
         if long_path not in keys(get_path_by_long_path(root)):
@@ -87,6 +98,11 @@ def format_paths(paths):
                 f"    Short alternatives:\n        {format_paths(get_long_path_by_path(root))}\n"
                 f"    Long alternatives:\n        {format_paths(get_path_by_long_path(root))}"
             )
+    return long_path
+
+
+def find_target(*, path, root):
+    long_path = find_long_path(path=path, root=root)
 
     node = root
     for part in long_path.split('/'):
@@ -99,6 +115,58 @@ def format_paths(paths):
     return node
 
 
+def get_dispatch_long_path(root) -> Optional[str]:
+    """
+    The long path of the target of the ajax or post dispatch in the request,
+    or `None` if the request is not a (valid) dispatch.
+    """
+    dispatch_long_path = getattr(root, '_dispatch_long_path', MISSING)
+    if dispatch_long_path is MISSING:
+        dispatch_long_path = None
+        request = root.get_request()
+        if request is not None and request.method in ('GET', 'POST'):
+            data, prefix = (request.GET, DISPATCH_PATH_SEPARATOR) if request.method == 'GET' else (request.POST, '-')
+            dispatch_commands = [key for key in data if key.startswith(prefix)]
+            if len(dispatch_commands) == 1:
+                try:
+                    dispatch_long_path = find_long_path(path=DISPATCH_PATH_SEPARATOR + dispatch_commands[0][1:], root=root)
+                except InvalidEndpointPathException:
+                    pass
+        root._dispatch_long_path = dispatch_long_path
+    return dispatch_long_path
+
+
+def get_partial_bind_path(node) -> Optional[List[str]]:
+    """
+    If the request is a dispatch to something below `node`, return the names
+    on the path from `node` down to the target. Otherwise return `None`.
+
+    Containers use this in `on_bind` to only bind what is needed to reach
+    the target of an ajax endpoint or post handler, instead of binding
+    everything like for a full render.
+    """
+    dispatch_long_path = get_dispatch_long_path(node.iommi_root())
+    if not dispatch_long_path:
+        return None
+    long_path = build_long_path(node)
+    if not long_path:
+        return dispatch_long_path.split('/')
+    if not dispatch_long_path.startswith(long_path + '/'):
+        return None
+    return dispatch_long_path[len(long_path) + 1:].split('/')
+
+
+def finish_partial_binds(root):
+    """
+    Do the rest of the bind of the containers that only bound what was needed
+    to reach the dispatch target. This is for when the dispatch doesn't
+    produce the response, and `root` is rendered after all.
+    """
+    deferred_binds, root._iommi_deferred_binds = root._iommi_deferred_binds, []
+    for finish_bind in deferred_binds:
+        finish_bind()
+
+
 def perform_ajax_dispatch(*, root, path, value):
     assert root._is_bound
 
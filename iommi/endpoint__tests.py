@@ -16,6 +16,7 @@
 from iommi.declarative.with_meta import with_meta
 from iommi.endpoint import (
     find_target,
+    get_partial_bind_path,
     InvalidEndpointPathException,
     path_join,
     perform_post_dispatch,
@@ -102,6 +103,25 @@ def test_find_target_with_invalid_path():
     )
 
 
+def test_get_partial_bind_path():
+    def bind(request):
+        return Box(items__basket=Basket(fruits__banana=Fruit())).bind(request=request)
+
+    root = bind(req('get', **{'/banana': ''}))
+    basket = find_target(path='/basket', root=root)
+    banana = find_target(path='/banana', root=root)
+    assert get_partial_bind_path(root) == ['items', 'basket', 'fruits', 'banana']
+    assert get_partial_bind_path(basket) == ['fruits', 'banana']
+    assert get_partial_bind_path(banana) is None
+
+    root = bind(req('post', **{'-basket': ''}))
+    assert get_partial_bind_path(root) == ['items', 'basket']
+
+    assert get_partial_bind_path(bind(req('get'))) is None
+    assert get_partial_bind_path(bind(req('get', **{'/does_not_exist': ''}))) is None
+    assert get_partial_bind_path(bind(None)) is None
+
+
 def test_middleware_fallthrough_on_non_part():
     sentinel = object()
     assert request_with_middleware(sentinel, req('get')) is sentinel
@@ -1,4 +1,5 @@
 import inspect
+import sys
 
 from iommi.declarative.namespace import Namespace
 
@@ -9,9 +10,17 @@
 
 _matches_cache = {}
 
+_signature_by_keys = {}
+
+# Upper bound on the number of caller signatures remembered per callable
+MAX_MATCHES_PER_CALLABLE = 32
+
+# Upper bound on the number of distinct parameter sets whose signature is remembered
+MAX_CACHED_SIGNATURES = 10000
+
 
 def matches(caller_parameters, callee_parameters, __match_empty=False):
-    cache_key = ';'.join((caller_parameters, callee_parameters))  # pragma: no mutate
+    cache_key = (caller_parameters, callee_parameters, __match_empty)  # pragma: no mutate
     cached_value = _matches_cache.get(
         cache_key, None
     )  # pragma: no mutate (mutation changes this to cached_value = None, which just slows down the code)
@@ -26,9 +35,8 @@ def matches(caller_parameters, callee_parameters, __match_empty=False):
     wildcard = c == '*'
 
     if not __match_empty and not required and not optional and wildcard:
-        return False  # Special case to not match no-specification function "lambda **whatever: ..."
-
-    if wildcard:
+        result = False  # Special case to not match no-specification function "lambda **whatever: ..."
+    elif wildcard:
         result = caller >= required
     else:
         result = required <= caller <= required.union(optional)
@@ -39,6 +47,39 @@ def matches(caller_parameters, callee_parameters, __match_empty=False):
     return result
 
 
+def matches_callable(caller_parameters, func, __match_empty=False):
+    """
+    Like `matches`, but remembers the result on the callable itself, so
+    evaluating the same callable again with the same parameters is a single
+    dict lookup. `caller_parameters` should come from `signature_from_kwargs`.
+    """
+    try:
+        matches_by_caller = object.__getattribute__(func, '__iommi_matches_by_caller')
+    except AttributeError:
+        matches_by_caller = {}
+        try:
+            object.__setattr__(func, '__iommi_matches_by_caller', matches_by_caller)
+        except TypeError:
+            # For classes
+            type.__setattr__(func, '__iommi_matches_by_caller', matches_by_caller)
+        except AttributeError:
+            matches_by_caller = None
+
+    if matches_by_caller is not None:
+        result = matches_by_caller.get((caller_parameters, __match_empty))
+        if result is not None:
+            return result
+
+    callee_parameters = get_signature(func)
+    result = callee_parameters is not None and matches(caller_parameters, callee_parameters, __match_empty)
+
+    if matches_by_caller is not None:
+        if len(matches_by_caller) >= MAX_MATCHES_PER_CALLABLE:
+            matches_by_caller.clear()
+        matches_by_caller[(caller_parameters, __match_empty)] = result
+    return result
+
+
 def get_callable_description(c):
     if getattr(c, '__name__', None) == '<lambda>':
         import inspect
@@ -55,8 +96,7 @@ def evaluate(func_or_value, __signature=None, __strict=False, __match_empty=True
         if __signature is None:
             __signature = signature_from_kwargs(kwargs)
 
-        callee_parameters = get_signature(func_or_value)
-        if callee_parameters is not None and matches(__signature, callee_parameters, __match_empty):
+        if matches_callable(__signature, func_or_value, __match_empty):
             return func_or_value(**kwargs)
 
         if __strict:
@@ -73,7 +113,7 @@ def evaluate(func_or_value, __signature=None, __strict=False, __match_empty=True
 
 def evaluate_strict(func_or_value, __signature=None, __match_empty=True, **kwargs):
     # noinspection PyArgumentEqualDefault
-    return evaluate(func_or_value, __signature=None, __strict=True, __match_empty=__match_empty, **kwargs)
+    return evaluate(func_or_value, __signature=__signature, __strict=True, __match_empty=__match_empty, **kwargs)
 
 
 def get_signature(func):
@@ -114,20 +154,37 @@ def get_signature(func):
 
 
 def signature_from_kwargs(kwargs):
-    return ','.join(sorted(keys(kwargs)))
+    """
+    The caller signature for a set of keyword arguments. The same set of
+    keys gives back the same interned string, so it can be used as a cheap
+    cache key.
+    """
+    parameter_names = tuple(kwargs)
+    try:
+        return _signature_by_keys[parameter_names]
+    except KeyError:
+        pass
+
+    signature = sys.intern(','.join(sorted(parameter_names)))
+    if len(_signature_by_keys) >= MAX_CACHED_SIGNATURES:
+        _signature_by_keys.clear()
+    _signature_by_keys[parameter_names] = signature
+    return signature
 
 
 def evaluate_members(obj, keys, **kwargs):
+    signature = signature_from_kwargs(kwargs)
     for key in keys:
-        evaluate_member(obj, key, **kwargs)
+        evaluate_member(obj, key, __signature=signature, **kwargs)
 
 
-def evaluate_member(obj, key, strict=True, **kwargs):
+def evaluate_member(obj, key, strict=True, __signature=None, **kwargs):
     value = getattr(obj, key)
-    new_value = evaluate(value, __strict=strict, **kwargs)
+    new_value = evaluate(value, __signature=__signature, __strict=strict, **kwargs)
     if new_value is not value:
         setattr(obj, key, new_value)
 
 
 def evaluate_strict_container(c, **kwargs):
-    return Namespace({k: evaluate_strict(v, **kwargs) for k, v in items(c)})
+    signature = signature_from_kwargs(kwargs)
+    return Namespace({k: evaluate_strict(v, __signature=signature, **kwargs) for k, v in items(c)})
@@ -8,7 +8,10 @@
     get_callable_description,
     get_signature,
     matches,
+    matches_callable,
+    MAX_MATCHES_PER_CALLABLE,
     Namespace,
+    signature_from_kwargs,
 )
 
 
@@ -206,3 +209,34 @@ def __init__(self):
 
     evaluate_member(foo, 'foo', x=3)
     assert foo.foo == 3
+
+
+def test_signature_from_kwargs_is_interned():
+    a = signature_from_kwargs(dict(b=1, a=2))
+    assert a == 'a,b'
+    assert signature_from_kwargs(dict(b=3, a=4)) is a
+    assert signature_from_kwargs(dict(a=3, b=4)) == a
+
+
+def test_matches_callable_caches_per_callable():
+    def f(a, **_):
+        return a
+
+    assert matches_callable('a,b', f)
+    assert not matches_callable('b', f)
+    assert object.__getattribute__(f, '__iommi_matches_by_caller') == {('a,b', False): True, ('b', False): False}
+
+    for i in range(MAX_MATCHES_PER_CALLABLE + 1):
+        assert matches_callable(f'a,x{i}', f)
+    assert len(object.__getattribute__(f, '__iommi_matches_by_caller')) <= MAX_MATCHES_PER_CALLABLE
+
+    # Match empty is part of the key
+    def g(**_):
+        pass
+
+    assert not matches_callable('a', g)
+    assert matches_callable('a', g, True)
+
+
+def test_matches_callable_on_builtin():
+    assert not matches_callable('a', max)
@@ -1,6 +1,7 @@
 import re
 from contextlib import contextmanager
 from datetime import datetime
+from hashlib import sha256
 from decimal import (
     Decimal,
     InvalidOperation,
@@ -19,7 +20,11 @@
     Union,
 )
 
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.cache import cache
+from django.core.exceptions import (
+    EmptyResultSet,
+    ObjectDoesNotExist,
+)
 from django.db import IntegrityError
 from django.db.models import (
     Case,
@@ -32,7 +37,10 @@
 from django.http.response import HttpResponseBase
 from django.template import Context
 from django.utils.functional import Promise
-from django.utils.translation import gettext
+from django.utils.translation import (
+    get_language,
+    gettext,
+)
 from iommi.struct import Struct
 
 from iommi._db_compat import field_defaults_factory
@@ -53,6 +61,7 @@
 )
 from iommi.attrs import Attrs
 from iommi.base import (
+    build_as_async_view_wrapper,
     build_as_view_wrapper,
     capitalize,
     get_display_name,
@@ -77,6 +86,7 @@
 )
 from iommi.shortcut import Shortcut
 from iommi.declarative.with_meta import with_meta
+from iommi.endpoint import get_partial_bind_path
 from iommi.error import Errors
 from iommi.evaluate import (
     evaluate,
@@ -268,48 +278,108 @@ def choice_parse(form, field, string_value):
     return string_value
 
 
+def choice_queryset__choice_by_pk(field):
+    """
+    Look up all the submitted values of a `choice_queryset` or
+    `multi_choice_queryset` field with a single `pk__in` query. Submitted pks
+    that aren't among the choices map to None. The result is kept on the
+    bound field, so parse and is_valid can share it.
+    """
+    choice_by_pk = getattr(field, '_choice_by_pk', None)
+    if choice_by_pk is not None:
+        return choice_by_pk
+
+    raw_data = field.raw_data if field.is_list else [field.raw_data]
+    choice_by_pk = {}
+    for string_value in raw_data or []:
+        if string_value:
+            try:
+                choice_by_pk[field.model._meta.pk.to_python(string_value)] = None
+            except ValidationError:
+                pass  # reported by parse
+
+    if choice_by_pk:
+        choice_by_pk.update((choice.pk, choice) for choice in field.choices.filter(pk__in=list(choice_by_pk)))
+    field._choice_by_pk = choice_by_pk
+    return choice_by_pk
+
+
 def choice_queryset__is_valid(field, parsed_data, **_):
+    choice_by_pk = choice_queryset__choice_by_pk(field)
+    if parsed_data.pk in choice_by_pk:
+        is_valid = choice_by_pk[parsed_data.pk] is not None
+    else:
+        # A custom parse can produce objects that weren't submitted by pk
+        is_valid = field.choices.filter(pk=parsed_data.pk).exists()
     return (
-        field.choices.filter(pk=parsed_data.pk).exists(),
+        is_valid,
         f'{", ".join(field.raw_data) if field.is_list else field.raw_data} not in available choices',
     )
 
 
 def choice_queryset__endpoint_handler(*, form, field, value, page_size=40, **_):
-    from django.core.paginator import (
-        EmptyPage,
-        Paginator,
-    )
-
+    """
+    The ajax endpoint for select2. Configured via `extra` on the field:
+
+    - `extra__choices_values`: a list of field names. The choices are then
+      fetched with `.values('pk', *choices_values)` and the formatters get a
+      `Struct` of those values as `choice` instead of a model instance.
+    - `extra__choices_cache_timeout`: cache the results for this many
+      seconds in the Django cache. The key is the SQL of the query, so
+      choices that depend on the request are cached separately.
+    """
     page = int(form.get_request().GET.get('page', 1))
+    if page < 1:
+        return dict(results=[], page=page, pagination=dict(more=False))
+
     choices = field.extra.filter_and_sort(form=form, field=field, value=value)
-    try:
-        paginator = Paginator(choices, page_size)
-        result = paginator.page(page)
-        has_more = result.has_next()
-    except EmptyPage:
-        result = []
-        has_more = False
+    choices_values = field.extra.get('choices_values')
+    if choices_values is not None:
+        choices = choices.values('pk', *choices_values)
 
-    return dict(
-        results=field.extra.model_from_choices(form, field, result),
+    # Fetch one row past the page to know if there are more, instead of counting all the matches
+    offset = (page - 1) * page_size
+    choices = choices[offset:offset + page_size + 1]
+
+    key = None
+    cache_timeout = field.extra.get('choices_cache_timeout')
+    if cache_timeout and isinstance(choices, QuerySet):
+        try:
+            sql, params = choices.query.sql_with_params()
+        except EmptyResultSet:
+            sql, params = None, None
+        key = 'iommi_choices:' + sha256(
+            f'{form.get_request().path}:{field.iommi_path}:{get_language()}:{choices.db}:{sql}:{params!r}'.encode()
+        ).hexdigest()
+        result = cache.get(key)
+        if result is not None:
+            return result
+
+    choices = list(choices)
+    if choices_values is not None:
+        choices = [Struct(x) for x in choices]
+
+    result = dict(
+        results=field.extra.model_from_choices(form, field, choices[:page_size]),
         page=page,
         pagination=dict(
-            more=has_more,
+            more=len(choices) > page_size,
         ),
     )
+    if key is not None:
+        cache.set(key, result, cache_timeout)
+    return result
 
 
 def choice_queryset__extra__model_from_choices(form, field, choices):
-    def traverse():
-        for choice in choices:
-            option = field._build_option(choice)
-            yield Struct(
-                id=option[1],
-                text=option[2],
-            )
-
-    return list(traverse())
+    evaluate_parameters = field.iommi_evaluate_parameters()
+    return [
+        Struct(
+            id=field.choice_id_formatter(choice=choice, **evaluate_parameters),
+            text=field.choice_display_name_formatter(choice=choice, **evaluate_parameters),
+        )
+        for choice in choices
+    ]
 
 
 def choice_queryset__extra__filter_and_sort(field, value, **_):
@@ -336,10 +406,16 @@ def create_q_objects(suffix):
 
 
 def choice_queryset__parse(field, string_value, **_):
-    try:
-        return field.choices.get(pk=string_value) if string_value else None
-    except field.model.DoesNotExist as e:
-        raise ValidationError(str(e))
+    if not string_value:
+        return None
+    pk = field.model._meta.pk.to_python(string_value)
+    choice_by_pk = choice_queryset__choice_by_pk(field)
+    if pk not in choice_by_pk:
+        # Not a submitted value, so it wasn't part of the batched lookup
+        choice_by_pk[pk] = field.choices.filter(pk=pk).first()
+    if choice_by_pk[pk] is None:
+        raise ValidationError(f'{field.model._meta.object_name} matching query does not exist.')
+    return choice_by_pk[pk]
 
 
 datetime_iso_formats = [
@@ -1531,12 +1607,22 @@ def on_bind(self) -> None:
 
         self.all_fields = Namespace()
         self.nested_forms = Namespace()
-        bind_members(self, name='fields', lazy=False)
-        bind_members(self, name='endpoints')
+        partial_bind_path = get_partial_bind_path(self)
+        self._is_partially_bound = partial_bind_path is not None and partial_bind_path[0] == 'fields' and len(partial_bind_path) > 1
+        if self._is_partially_bound:
+            # An ajax endpoint of a field: only bind that field. The other
+            # fields are bound if something touches them, and aren't validated.
+            bind_members(self, name='fields')
+            self.fields.get(partial_bind_path[1])
+            bind_members(self, name='endpoints')
+            self.parts = self.fields
+        else:
+            bind_members(self, name='fields', lazy=False)
+            bind_members(self, name='endpoints')
 
-        self.parts = self.fields
-        self.fields = self.all_fields
-        del self.all_fields
+            self.parts = self.fields
+            self.fields = self.all_fields
+            del self.all_fields
 
         self.errors = Errors(parent=self, **self.errors)
 
@@ -1613,7 +1699,7 @@ def validate(self):
         # everything up until this point was valid.
         if self._valid is None:
             self._valid = True
-        for field in values(self.fields):
+        for field in list(values(self.all_fields if self._is_partially_bound else self.fields)):
             with validation_errors_reported_on(field):
                 field.post_validation(**field.iommi_evaluate_parameters())
 
@@ -1780,3 +1866,6 @@ def delete(cls, **kwargs):
 
     def as_view(self):
         return build_as_view_wrapper(self)
+
+    def as_async_view(self):
+        return build_as_async_view_wrapper(self)
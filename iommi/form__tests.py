@@ -1051,6 +1051,37 @@ class MyForm(Form):
     )
 
 
+@pytest.mark.django_db
+def test_multi_choice_queryset_parses_and_validates_with_one_query():
+    from django.contrib.auth.models import User
+    from django.db import connection
+
+    executed = []
+
+    def count_queries(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+
+    users = [User.objects.create(username=f'foo{i}') for i in range(10)]
+    not_a_choice = User.objects.create(username='bar')
+
+    class MyForm(Form):
+        foo = Field.multi_choice_queryset(attr=None, choices=User.objects.filter(username__startswith='foo'))
+
+    with connection.execute_wrapper(count_queries):
+        form = MyForm().bind(request=req('post', foo=[smart_str(x.pk) for x in users], **{'-submit': ''}))
+        assert form.is_valid()
+    assert len(executed) == 1
+    assert form.fields.foo.value == users
+
+    executed.clear()
+    with connection.execute_wrapper(count_queries):
+        form = MyForm().bind(request=req('post', foo=[smart_str(users[0].pk), smart_str(not_a_choice.pk), 'baz'], **{'-submit': ''}))
+        assert not form.is_valid()
+    assert len(executed) == 1
+    assert form.fields.foo._errors == {'User matching query does not exist.', '“baz” value must be an integer.'}
+
+
 def test_missing_choices():
     with pytest.raises(AssertionError, match='To use Field.choice, you must pass the choices list'):
         Field.choice().refine_done()
@@ -1928,6 +1959,34 @@ class ChoiceQuerySetAjaxAttrsForeignKeyModel(models.Model):
     }
 
 
+@pytest.mark.django_db
+def test_ajax_dispatch_to_field_binds_only_that_field():
+    from django.contrib.auth.models import User
+
+    user = User.objects.create(username='foo')
+
+    def choices(form, **_):
+        # Touching another field binds it lazily
+        assert form.fields.name.value == 'bar'
+        return User.objects.all()
+
+    form = Form(
+        fields=dict(
+            name=Field(initial='bar'),
+            user=Field.choice_queryset(model=User, choices=choices),
+            other=Field(is_valid=lambda **_: (False, 'never valid')),
+        ),
+    ).bind(request=req('get', **{'/fields/user/endpoints/choices': ''}))
+
+    # choices is evaluated when user is bound, and that binds name
+    assert list(form.all_fields.keys()) == ['user', 'name']
+    assert form.is_valid()
+
+    response = form.render_to_response()
+    assert json.loads(response.content)['results'] == [{'id': user.pk, 'text': 'foo'}]
+    assert 'other' not in form.all_fields
+
+
 @pytest.mark.django_db
 @pytest.mark.filterwarnings("ignore:Model 'tests.foomodel' was already registered")
 @pytest.mark.filterwarnings("ignore:Pagination may yield inconsistent results")
@@ -1949,6 +2008,84 @@ class ChoiceQuerySetAjaxOnePastTheEndModel(models.Model):
     }
 
 
+@pytest.mark.django_db
+def test_choice_queryset_ajax_pages_without_count():
+    from django.contrib.auth.models import User
+    from django.db import connection
+
+    users = [User.objects.create(username=f'foo{i}') for i in range(5)]
+
+    executed = []
+
+    def capture_queries(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+
+    class MyForm(Form):
+        foo = Field.choice_queryset(choices=User.objects.all())
+
+    def get_page(page):
+        form = MyForm().bind(request=req('get', page=page))
+        return form.fields.foo.endpoints.choices.func(form=form, field=form.fields.foo, value='foo', page_size=2)
+
+    with connection.execute_wrapper(capture_queries):
+        assert get_page(1) == dict(
+            results=[dict(id=users[0].pk, text='foo0'), dict(id=users[1].pk, text='foo1')],
+            page=1,
+            pagination=dict(more=True),
+        )
+        assert get_page(3) == dict(
+            results=[dict(id=users[4].pk, text='foo4')],
+            page=3,
+            pagination=dict(more=False),
+        )
+    assert len(executed) == 2
+    assert not any('COUNT' in x for x in executed)
+
+
+@pytest.mark.django_db
+def test_choice_queryset_ajax_values_and_cache():
+    from django.contrib.auth.models import User
+    from django.core.cache import cache
+    from django.db import connection
+
+    cache.clear()
+    user = User.objects.create(username='foo', first_name='Foo')
+
+    executed = []
+
+    def capture_queries(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+
+    class MyForm(Form):
+        foo = Field.choice_queryset(
+            choices=User.objects.all(),
+            choice_display_name_formatter=lambda choice, **_: f'{choice.username} ({choice.first_name})',
+            extra__choices_values=['username', 'first_name'],
+            extra__choices_cache_timeout=10,
+        )
+
+    expected = dict(results=[dict(id=user.pk, text='foo (Foo)')], page=1, pagination=dict(more=False))
+
+    with connection.execute_wrapper(capture_queries):
+        form = MyForm().bind(request=req('get'))
+        assert perform_ajax_dispatch(root=form, path='/fields/foo/endpoints/choices', value='fo') == expected
+        assert len(executed) == 1
+        assert '"auth_user"."password"' not in executed[0]
+
+        form = MyForm().bind(request=req('get'))
+        assert perform_ajax_dispatch(root=form, path='/fields/foo/endpoints/choices', value='fo') == expected
+        assert len(executed) == 1
+
+        # A different search term is a different cache entry
+        form = MyForm().bind(request=req('get'))
+        assert perform_ajax_dispatch(root=form, path='/fields/foo/endpoints/choices', value='bar')['results'] == []
+        assert len(executed) == 2
+
+    cache.clear()
+
+
 @override_settings(DEBUG=True)
 def test_ajax_namespacing():
     class MyForm(Form):
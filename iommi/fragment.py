@@ -3,6 +3,9 @@
     Union,
 )
 
+from django.utils.functional import Promise
+from django.utils.translation import get_language
+
 from iommi._web_compat import (
     format_html,
     render_template,
@@ -14,6 +17,7 @@
 )
 from iommi.base import (
     capitalize,
+    items,
     MISSING,
     NOT_BOUND_MESSAGE,
     values,
@@ -24,6 +28,7 @@
     Namespace,
 )
 from iommi.declarative.with_meta import with_meta
+from iommi.debug import iommi_debug_on
 from iommi.evaluate import (
     evaluate_strict,
     evaluate_strict_container,
@@ -63,11 +68,108 @@
     'wbr',
 ]
 
+# Rendered html of static fragments, see `render_key`
+_render_cache = {}
+
+MAX_RENDER_CACHE_SIZE = 10000
+
+
+def _static_value(value):
+    """
+    A hashable version of value, or MISSING if it could change between requests.
+    """
+    if isinstance(value, dict):
+        frozen = []
+        for k, v in items(value):
+            v = _static_value(v)
+            if v is MISSING:
+                return MISSING
+            frozen.append((k, v))
+        return dict, tuple(frozen)
+    if value is None or isinstance(value, (str, int, float, Promise)):
+        # The type is part of the key since a SafeString renders differently from a str
+        return type(value), value
+    return MISSING
+
+
+def is_static(fragment):
+    """
+    Fragments without callables, templates or non-static children render the
+    same html on every request.
+    """
+    if not fragment.render_cache or fragment.template is not None:
+        return False
+
+    fragment_class = type(fragment)
+    if fragment_class.on_bind is not Fragment.on_bind or fragment_class.render_text_or_children is not Fragment.render_text_or_children:
+        return False
+
+    if fragment.include is not True or not (fragment.tag is None or isinstance(fragment.tag, str)):
+        return False
+
+    if _static_value(fragment.attrs or {}) is MISSING:
+        return False
+
+    for child in values(fragment.iommi_namespace.children):
+        if isinstance(child, Fragment):
+            if not child._is_static:
+                return False
+        elif isinstance(child, dict) or _static_value(child) is MISSING:
+            return False
+
+    return True
+
+
+def render_key(fragment):
+    """
+    A hashable key describing the html a bound static fragment renders, or
+    None if it isn't static. This is computed from the bound values, since
+    the parent of a fragment may still change it after bind.
+    """
+    if not fragment._is_static or fragment.template is not None or not (fragment.tag is None or isinstance(fragment.tag, str)):
+        return None
+
+    attrs = _static_value(fragment.attrs or {})
+    if attrs is MISSING:
+        return None
+
+    children = []
+    for child in values(fragment.children):
+        if isinstance(child, Fragment):
+            child = render_key(child)
+            if child is None:
+                return None
+        else:
+            if isinstance(child, dict):
+                return None
+            child = _static_value(child)
+            if child is MISSING:
+                return None
+        children.append(child)
+
+    return type(fragment), fragment.tag, attrs, tuple(children)
+
 
 def fragment__render(fragment, context):
     if not fragment.include:
         return ''
 
+    key = render_key(fragment) if not iommi_debug_on() else None
+    if key is not None:
+        style = fragment.iommi_style
+        key = (key, getattr(style, 'name', style), get_language())
+        result = _render_cache.get(key)
+        if result is None:
+            result = _render_fragment(fragment, context)
+            if len(_render_cache) >= MAX_RENDER_CACHE_SIZE:
+                _render_cache.clear()
+            _render_cache[key] = result
+        return result
+
+    return _render_fragment(fragment, context)
+
+
+def _render_fragment(fragment, context):
     rendered_children = fragment.render_text_or_children(context=context)
 
     if fragment.template:
@@ -150,17 +252,25 @@ class MyPage(Page):
 
     Rendering a `MyPage` will result in a `<h1>`, but if you do
     `MyPage(parts__header__tag='h2')` it will be rendered with a `<h2>`.
+
+    Fragments that contain no callables, no template and only static
+    children render the same html on every request, so iommi renders them
+    once per process (per style and language) and reuses the result. If
+    you have a fragment whose output depends on the request in some other
+    way, pass `render_cache=False`.
     """
 
     attrs: Attrs = Refinable()  # attrs is evaluated, but in a special way so gets no EvaluatedRefinable type
     tag = EvaluatedRefinable()
     template: Union[str, Template] = EvaluatedRefinable()
     children = RefinableMembers()
+    render_cache: bool = Refinable()
 
     class Meta:
         children = EMPTY
         attrs__class = EMPTY
         attrs__style = EMPTY
+        render_cache = True
 
     @with_defaults
     def __init__(self, text=None, **kwargs):
@@ -171,6 +281,7 @@ def __init__(self, text=None, **kwargs):
     def on_refine_done(self):
         super().on_refine_done()
         refine_done_members(self, name='children', members_from_namespace=self.iommi_namespace.children, cls=Fragment, unknown_types_fall_through=True)
+        self._is_static = is_static(self)
 
     def render_text_or_children(self, context):
         request = self.get_request()
@@ -1,6 +1,7 @@
 import pytest
 from django.template import Template
 from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 
 from iommi import (
     Form,
@@ -10,7 +11,10 @@
     Page,
 )
 from iommi.attrs import Attrs
-from iommi.fragment import fragment__render
+from iommi.fragment import (
+    _render_cache,
+    fragment__render,
+)
 from tests.helpers import req
 
 
@@ -336,3 +340,43 @@ def test_build_and_bind_h_tag():
     assert form.h_tag._name == 'h_tag'
     assert form.h_tag.iommi_parent() is form
     assert form.h_tag.__html__() == '<div>hello</div>'
+
+
+def test_static_fragment_render_is_cached():
+    _render_cache.clear()
+
+    f = html.div(html.span('foo'), attrs__class__bar=True).bind(request=req('get'))
+    assert f._is_static
+    assert f.__html__() == '<div class="bar"><span>foo</span></div>'
+    assert len(_render_cache) == 2
+
+    cached = _render_cache.copy()
+    assert html.div(html.span('foo'), attrs__class__bar=True).bind(request=req('get')).__html__() == '<div class="bar"><span>foo</span></div>'
+    assert _render_cache == cached
+
+    # Changes after bind are part of the key
+    f = html.div(html.span('foo'), attrs__class__bar=True).bind(request=req('get'))
+    f.attrs['class']['baz'] = True
+    assert f.__html__() == '<div class="bar baz"><span>foo</span></div>'
+
+    # str and SafeString render differently
+    assert html.div('<b>').bind(request=req('get')).__html__() == '<div>&lt;b&gt;</div>'
+    assert html.div(mark_safe('<b>')).bind(request=req('get')).__html__() == '<div><b></div>'
+
+
+def test_fragment_render_cache_not_used_for_dynamic_fragments():
+    _render_cache.clear()
+
+    f = html.div(lambda request, **_: request.GET['foo']).bind(request=req('get', foo='1'))
+    assert not f._is_static
+    assert f.__html__() == '<div>1</div>'
+
+    f = html.div(html.span(attrs__title=lambda request, **_: request.GET['foo'])).bind(request=req('get', foo='2'))
+    assert not f._is_static
+    assert f.__html__() == '<div><span title="2"></span></div>'
+
+    f = html.div('foo', render_cache=False).bind(request=req('get'))
+    assert not f._is_static
+    assert f.__html__() == '<div>foo</div>'
+
+    assert not _render_cache
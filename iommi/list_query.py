@@ -0,0 +1,291 @@
+"""
+Evaluate the `Q` objects a `Query` produces against a list of objects or
+dicts, so tables with rows that are not a `QuerySet` can be filtered too.
+
+Plain lists are filtered with a linear scan. Wrap the rows in `IndexedRows`
+to keep them around between requests: it builds a hash index and a sorted
+index per attribute the first time it is filtered on, so later equality and
+range lookups on that attribute don't need to look at every row.
+"""
+import operator
+from bisect import (
+    bisect_left,
+    bisect_right,
+)
+from functools import lru_cache
+
+from django.db.models import (
+    DateTimeField,
+    F,
+    Field,
+    Q,
+)
+
+
+def _casefold(value):
+    return value.casefold() if isinstance(value, str) else value
+
+
+def _compare(op):
+    def compare(value, arg):
+        # Like in SQL, NULL is neither smaller nor larger than anything
+        if value is None or arg is None:
+            return False
+        try:
+            return op(value, arg)
+        except TypeError:
+            return False
+
+    return compare
+
+
+def _text(op, fold):
+    def text(value, arg):
+        if value is None or arg is None:
+            return False
+        value, arg = str(value), str(arg)
+        if fold:
+            value, arg = value.casefold(), arg.casefold()
+        return op(value, arg)
+
+    return text
+
+
+MATCHER_BY_LOOKUP = {
+    'exact': operator.eq,
+    'iexact': lambda value, arg: _casefold(value) == _casefold(arg),
+    'contains': _text(lambda value, arg: arg in value, fold=False),
+    'icontains': _text(lambda value, arg: arg in value, fold=True),
+    'startswith': _text(str.startswith, fold=False),
+    'istartswith': _text(str.startswith, fold=True),
+    'endswith': _text(str.endswith, fold=False),
+    'iendswith': _text(str.endswith, fold=True),
+    'gt': _compare(operator.gt),
+    'gte': _compare(operator.ge),
+    'lt': _compare(operator.lt),
+    'lte': _compare(operator.le),
+    'in': lambda value, arg: value in arg,
+    'isnull': lambda value, arg: (value is None) == bool(arg),
+}
+
+HASH_INDEXED_LOOKUPS = {'exact', 'iexact', 'in', 'isnull'}
+SORTED_INDEXED_LOOKUPS = {'gt', 'gte', 'lt', 'lte'}
+
+
+@lru_cache(maxsize=1000)
+def split_lookup(key):
+    """
+    Split a `Q` keyword like `foo__bar__icontains` into the attribute path
+    and the lookup: `('foo__bar', 'icontains')`. A keyword without a lookup
+    is an `exact` lookup. Lookups that Django has but that can't be done on
+    a list, like `range` or `year`, raise `QueryException`.
+    """
+    path, _, lookup = key.rpartition('__')
+    if path and lookup in MATCHER_BY_LOOKUP:
+        return path, lookup
+    if path and lookup in _django_lookups():
+        from iommi.query import QueryException
+
+        raise QueryException(f'The lookup "{lookup}" is not supported when filtering rows that are not a QuerySet')
+    return key, 'exact'
+
+
+def _django_lookups():
+    # Not computed at import time, since lookups can be registered later
+    return set(Field.get_lookups()) | set(DateTimeField.get_lookups())
+
+
+def get_path(row, path):
+    """
+    Like `getattr_path`, but also looks up keys of dicts. A missing attribute
+    or key is `None`, so the row doesn't match instead of crashing the filter.
+    """
+    current = row
+    for name in path.split('__'):
+        if isinstance(current, dict):
+            current = current.get(name)
+        else:
+            current = getattr(current, name, None)
+        if current is None:
+            return None
+    return current
+
+
+class IndexedRows(list):
+    """
+    A list of rows that `Query` can filter without looking at every row. The
+    indexes are built lazily, per attribute, and thrown away if the list is
+    modified.
+
+    .. code-block:: python
+
+        report_rows = IndexedRows(fetch_report())
+
+        table = Table(
+            rows=lambda **_: report_rows,
+            columns__name=Column(filter__include=True),
+        )
+    """
+
+    def __init__(self, *args):
+        super(IndexedRows, self).__init__(*args)
+        self._index_by_key = {}
+
+    def hash_index(self, path, fold=False):
+        """
+        Return a dict from value to the positions of the rows with that
+        value, or `None` if the values are not hashable.
+        """
+        key = ('hash', path, fold)
+        if key not in self._index_by_key:
+            index = {}
+            try:
+                for position, row in enumerate(self):
+                    value = get_path(row, path)
+                    if fold:
+                        value = _casefold(value)
+                    index.setdefault(value, []).append(position)
+            except TypeError:
+                index = None
+            self._index_by_key[key] = index
+        return self._index_by_key[key]
+
+    def sorted_index(self, path):
+        """
+        Return the non-`None` values sorted and the positions of the rows
+        they come from, or `None` if the values can't be ordered.
+        """
+        key = ('sorted', path)
+        if key not in self._index_by_key:
+            pairs = [(value, position) for position, value in enumerate(get_path(row, path) for row in self) if value is not None]
+            try:
+                pairs.sort(key=operator.itemgetter(0))
+                index = [value for value, _ in pairs], [position for _, position in pairs]
+            except TypeError:
+                index = None
+            self._index_by_key[key] = index
+        return self._index_by_key[key]
+
+    def lookup(self, path, lookup, arg):
+        """
+        Return the positions of the rows that match, or `None` if the lookup
+        can't be done with an index.
+        """
+        if lookup not in HASH_INDEXED_LOOKUPS and lookup not in SORTED_INDEXED_LOOKUPS:
+            return None
+        try:
+            if lookup in SORTED_INDEXED_LOOKUPS:
+                index = self.sorted_index(path)
+                if index is None or arg is None:
+                    return None
+                keys, positions = index
+                if lookup == 'gt':
+                    return set(positions[bisect_right(keys, arg):])
+                if lookup == 'gte':
+                    return set(positions[bisect_left(keys, arg):])
+                if lookup == 'lt':
+                    return set(positions[:bisect_left(keys, arg)])
+                return set(positions[:bisect_right(keys, arg)])
+
+            index = self.hash_index(path, fold=lookup == 'iexact')
+            if index is None:
+                return None
+            if lookup == 'exact':
+                return set(index.get(arg, ()))
+            if lookup == 'iexact':
+                return set(index.get(_casefold(arg), ()))
+            if lookup == 'in':
+                return {position for value in arg for position in index.get(value, ())}
+            if arg:
+                return set(index.get(None, ()))
+            return set(range(len(self))) - set(index.get(None, ()))
+        except TypeError:
+            # Unhashable or unorderable argument
+            return None
+
+
+def _invalidates_indexes(name):
+    method = getattr(list, name)
+
+    def invalidating_method(self, *args, **kwargs):
+        self._index_by_key.clear()
+        return method(self, *args, **kwargs)
+
+    invalidating_method.__name__ = name
+    return invalidating_method
+
+
+for _name in ('append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort', 'reverse', '__setitem__', '__delitem__', '__iadd__', '__imul__'):
+    setattr(IndexedRows, _name, _invalidates_indexes(_name))
+
+
+def _is_indexable(child):
+    if isinstance(child, Q):
+        return False
+    key, arg = child
+    _, lookup = split_lookup(key)
+    return (lookup in HASH_INDEXED_LOOKUPS or lookup in SORTED_INDEXED_LOOKUPS) and not isinstance(arg, F)
+
+
+def _leaf_positions(rows, child, candidates):
+    key, arg = child
+    path, lookup = split_lookup(key)
+
+    # Once the candidates have been narrowed down it's cheaper to check them than to use an index
+    if candidates is None and isinstance(rows, IndexedRows) and not isinstance(arg, F):
+        positions = rows.lookup(path, lookup, arg)
+        if positions is not None:
+            return positions
+
+    matcher = MATCHER_BY_LOOKUP[lookup]
+    if candidates is None:
+        candidates = range(len(rows))
+    if isinstance(arg, F):
+        return {
+            position
+            for position in candidates
+            if matcher(get_path(rows[position], path), get_path(rows[position], arg.name))
+        }
+    return {position for position in candidates if matcher(get_path(rows[position], path), arg)}
+
+
+def _positions(rows, q, candidates):
+    children = q.children
+    if q.connector == Q.AND:
+        # Do the lookups that can use an index first, to get a small set of candidates for the rest
+        result = candidates
+        for child in sorted(children, key=lambda x: not _is_indexable(x)):
+            result = _child_positions(rows, child, result)
+            if not result:
+                break
+        if result is None:
+            result = set(range(len(rows)))
+    elif q.connector == Q.OR:
+        result = set()
+        for child in children:
+            result |= _child_positions(rows, child, candidates)
+    else:
+        # XOR: rows that match an odd number of the children
+        result = set()
+        for child in children:
+            result ^= _child_positions(rows, child, candidates)
+
+    if q.negated:
+        return (set(range(len(rows))) if candidates is None else set(candidates)) - result
+    return result
+
+
+def _child_positions(rows, child, candidates):
+    if isinstance(child, Q):
+        return _positions(rows, child, candidates)
+    return _leaf_positions(rows, child, candidates)
+
+
+def filter_rows(rows, q):
+    """
+    Return the rows that match the `Q` object `q`, in the order they have in
+    `rows`.
+    """
+    if not isinstance(rows, list):
+        rows = list(rows)
+    return [rows[position] for position in sorted(_positions(rows, q, None))]
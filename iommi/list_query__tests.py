@@ -0,0 +1,132 @@
+from datetime import date
+
+import pytest
+from django.db.models import (
+    F,
+    Q,
+)
+
+from iommi.list_query import (
+    filter_rows,
+    get_path,
+    IndexedRows,
+    split_lookup,
+)
+from iommi.query import QueryException
+from iommi.struct import Struct
+
+ROWS = [
+    Struct(pk=1, name='Alice', age=31, born=date(1990, 1, 1), boss=None, score=10),
+    Struct(pk=2, name='bob', age=25, born=date(1998, 5, 3), boss=Struct(name='Alice'), score=25),
+    Struct(pk=3, name='Carol', age=None, born=None, boss=Struct(name='bob'), score=3),
+    Struct(pk=4, name='dave', age=40, born=date(1983, 2, 1), boss=Struct(name='Alice'), score=40),
+]
+
+
+def test_split_lookup():
+    assert split_lookup('name') == ('name', 'exact')
+    assert split_lookup('name__icontains') == ('name', 'icontains')
+    assert split_lookup('boss__name') == ('boss__name', 'exact')
+    assert split_lookup('boss__name__gte') == ('boss__name', 'gte')
+    assert split_lookup('boss__pk') == ('boss__pk', 'exact')
+
+
+@pytest.mark.parametrize('key', ['age__range', 'name__regex', 'born__year', 'boss__name__iregex'])
+def test_split_lookup_unsupported(key):
+    with pytest.raises(QueryException, match='is not supported'):
+        split_lookup(key)
+
+    with pytest.raises(QueryException):
+        filter_rows(ROWS, Q(**{key: 1}))
+
+
+def test_get_path():
+    assert get_path(ROWS[1], 'boss__name') == 'Alice'
+    assert get_path(ROWS[0], 'boss__name') is None
+    assert get_path(dict(foo=dict(bar=7)), 'foo__bar') == 7
+    assert get_path(object(), 'foo') is None
+    assert get_path(dict(foo=dict(bar=7)), 'foo__baz') is None
+    assert get_path(ROWS[1], 'boss__title') is None
+
+
+def test_filter_rows_missing_attribute():
+    rows = [dict(name='Alice'), dict(name='bob', boss=dict(name='Alice'))]
+    assert filter_rows(rows, Q(boss__name='Alice')) == [rows[1]]
+    assert filter_rows(ROWS, Q(title='boss')) == []
+
+
+@pytest.mark.parametrize('rows_class', [list, IndexedRows])
+@pytest.mark.parametrize('q, expected', [
+    (Q(), [1, 2, 3, 4]),
+    (Q(name='bob'), [2]),
+    (Q(name__exact='Bob'), []),
+    (Q(name__iexact='BOB'), [2]),
+    (Q(name__icontains='A'), [1, 3, 4]),
+    (Q(name__contains='a'), [3, 4]),
+    (Q(name__istartswith='c'), [3]),
+    (Q(name__endswith='e'), [1, 4]),
+    (Q(age__gt=31), [4]),
+    (Q(age__gte=31), [1, 4]),
+    (Q(age__lt=31), [2]),
+    (Q(age__lte=31), [1, 2]),
+    (Q(born__lt=date(1991, 1, 1)), [1, 4]),
+    (Q(age=None), [3]),
+    (Q(age__isnull=False), [1, 2, 4]),
+    (Q(pk__in=[4, 2, 7]), [2, 4]),
+    (Q(boss__name='Alice'), [2, 4]),
+    (Q(boss__name__iexact='alice') & Q(age__gt=30), [4]),
+    (Q(name='bob') | Q(age__gte=40), [2, 4]),
+    (~Q(name='bob'), [1, 3, 4]),
+    (~Q(name='bob') & Q(age__lt=35), [1]),
+    (Q(age__gt=F('score')), [1]),
+    (Q(name='bob') ^ Q(age__lt=35), [1]),
+])
+def test_filter_rows(rows_class, q, expected):
+    rows = rows_class(ROWS)
+    assert [x.pk for x in filter_rows(rows, q)] == expected
+    # Again, to use the indexes built by the first call
+    assert [x.pk for x in filter_rows(rows, q)] == expected
+
+
+def test_filter_rows_of_dicts():
+    rows = [dict(a=1, b='x'), dict(a=2, b='y'), dict(a=3, b='x')]
+    assert filter_rows(rows, Q(b='x') & Q(a__gt=1)) == [dict(a=3, b='x')]
+    assert filter_rows(IndexedRows(rows), Q(b='x') & Q(a__gt=1)) == [dict(a=3, b='x')]
+
+
+def test_indexed_rows_builds_indexes_lazily():
+    rows = IndexedRows(ROWS)
+    assert rows._index_by_key == {}
+
+    filter_rows(rows, Q(name='bob'))
+    assert list(rows._index_by_key) == [('hash', 'name', False)]
+
+    filter_rows(rows, Q(age__gt=20))
+    assert list(rows._index_by_key) == [('hash', 'name', False), ('sorted', 'age')]
+
+    # Once the rows are narrowed down by an indexed lookup the rest are checked directly
+    filter_rows(rows, Q(name='bob') & Q(score__gt=20))
+    assert ('sorted', 'score') not in rows._index_by_key
+
+
+def test_indexed_rows_drops_indexes_when_modified():
+    rows = IndexedRows(ROWS)
+    assert [x.pk for x in filter_rows(rows, Q(name='bob'))] == [2]
+
+    rows.append(Struct(pk=5, name='bob'))
+    assert rows._index_by_key == {}
+    assert [x.pk for x in filter_rows(rows, Q(name='bob'))] == [2, 5]
+
+    rows[1] = Struct(pk=6, name='eve')
+    assert [x.pk for x in filter_rows(rows, Q(name='bob'))] == [5]
+
+
+def test_indexed_rows_falls_back_to_scanning():
+    rows = IndexedRows([
+        Struct(pk=1, tags=['a', 'b'], value=1),
+        Struct(pk=2, tags=['b'], value='x'),
+    ])
+    # Unhashable values
+    assert [x.pk for x in filter_rows(rows, Q(tags=['b']))] == [2]
+    # Values that can't be ordered
+    assert [x.pk for x in filter_rows(rows, Q(value__gt=0))] == [1]
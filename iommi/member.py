@@ -185,20 +185,33 @@ class ForbiddenNamesException(Exception):
 
 # noinspection PyCallByClass
 class MemberBinder(dict):
+    """
+    Lazily bound members, kept in declaration order.
+
+    Every member has a fixed position from the declaration. Binding a single
+    member is O(1): if it's bound out of order the dict is only marked as
+    unordered, and the order is restored in one O(n) pass the next time the
+    members are iterated.
+    """
+
     def __init__(self, parent: Members, _declared_members: Dict[str, Traversable], _unknown_types_fall_through: bool):
-        if _unknown_types_fall_through:
-            bindable_names = []
-            for name, member in items(_declared_members):
-                if not hasattr(member, 'bind'):
-                    self[name] = copy(member)
-                    continue
-                bindable_names.append(name)
-        else:
-            bindable_names = list(keys(_declared_members))
+        position_by_name = {}
+        bindable_names = {}
+        last_position = -1
+        for position, (name, member) in enumerate(items(_declared_members)):
+            position_by_name[name] = position
+            if _unknown_types_fall_through and not hasattr(member, 'bind'):
+                self[name] = copy(member)
+                last_position = position
+                continue
+            bindable_names[name] = position
 
         object.__setattr__(self, '_parent', parent)
         object.__setattr__(self, '_bindable_names', bindable_names)
         object.__setattr__(self, '_declared_members', _declared_members)
+        object.__setattr__(self, '_position_by_name', position_by_name)
+        object.__setattr__(self, '_last_position', last_position)
+        object.__setattr__(self, '_is_ordered', True)
         super().__init__()
 
     def __getattribute__(self, name):
@@ -222,11 +235,21 @@ def __getitem__(self, name):
         return dict.__getitem__(self, name)
 
     def __delitem__(self, name):
-        dict.__delitem__(self, name)
         _bindable_names = object.__getattribute__(self, '_bindable_names')
-        _declared_members = object.__getattribute__(self, '_declared_members')
-        _bindable_names.remove(name)
+        # A member that isn't bound yet can be deleted too
+        if name not in _bindable_names or dict.__contains__(self, name):
+            dict.__delitem__(self, name)
+        # The declared members are shared with the declaration, so copy them instead of deleting in place
+        _declared_members = dict(object.__getattribute__(self, '_declared_members'))
         del _declared_members[name]
+        object.__setattr__(self, '_declared_members', _declared_members)
+        _position_by_name = object.__getattribute__(self, '_position_by_name')
+        del _bindable_names[name]
+        del _position_by_name[name]
+
+    def __iter__(self):
+        _restore_order(self)
+        return dict.__iter__(self)
 
     def get(self, name, *args):
         _force_bind(self, name)
@@ -245,9 +268,8 @@ def keys(self):
         return super().keys()
 
     def __repr__(self):
-        bound_members = list(dict.keys(self))
         members = [
-            name + (' (bound)' if name in bound_members else '')
+            name + (' (bound)' if dict.__contains__(self, name) else '')
             for name in object.__getattribute__(self, '_declared_members')
         ]
         return f'<{self.__class__.__name__}: {", ".join(members)}>'
@@ -264,16 +286,32 @@ def _force_bind(member_binder: MemberBinder, name: str):
         if name in _bindable_names:
             bound_member = _declared_members[name].bind(parent=_parent)
             if bound_member is not None:
-                bound_members = dict.copy(member_binder)
-                dict.clear(member_binder)  # re-insert values in dict to retain ordering
-                dict.update(
-                    member_binder,
-                    (
-                        (k, bound_member if k == name else bound_members[k])
-                        for k in dict.keys(_declared_members)
-                        if k == name or k in bound_members
-                    ),
-                )
+                _insert(member_binder, name, bound_member)
+
+
+# noinspection PyCallByClass
+def _insert(member_binder: MemberBinder, name: str, bound_member):
+    position = object.__getattribute__(member_binder, '_position_by_name')[name]
+    if position > object.__getattribute__(member_binder, '_last_position'):
+        object.__setattr__(member_binder, '_last_position', position)
+    else:
+        object.__setattr__(member_binder, '_is_ordered', False)
+    dict.__setitem__(member_binder, name, bound_member)
+
+
+# noinspection PyCallByClass
+def _restore_order(member_binder: MemberBinder):
+    if object.__getattribute__(member_binder, '_is_ordered'):
+        return
+
+    _position_by_name = object.__getattribute__(member_binder, '_position_by_name')
+    bound_members = dict(dict.items(member_binder))
+    dict.clear(member_binder)  # re-insert values in dict to retain ordering
+    dict.update(
+        member_binder,
+        ((k, bound_members[k]) for k in _position_by_name if k in bound_members),
+    )
+    object.__setattr__(member_binder, '_is_ordered', True)
 
 
 # noinspection PyCallByClass
@@ -282,3 +320,4 @@ def _force_bind_all(member_binder: MemberBinder):
     for name in _bindable_names:
         if name not in member_binder:
             _force_bind(member_binder, name)
+    _restore_order(member_binder)
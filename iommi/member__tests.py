@@ -8,7 +8,10 @@
     Style,
 )
 from iommi.declarative.with_meta import with_meta
-from iommi.member import ForbiddenNamesException
+from iommi.member import (
+    ForbiddenNamesException,
+    MemberBinder,
+)
 from iommi.refinable import Refinable
 from iommi.shortcut import with_defaults
 from tests.helpers import (
@@ -382,3 +385,58 @@ class MyBasket(Basket):
         ):
         # noinspection PyStatementEffect
         my_basket.fruits.fruit_fly
+
+
+def test_bind_in_reverse_order_keeps_declared_order():
+    class MyBasket(Basket):
+        banana = Fruit()
+        orange = Fruit()
+        pear = Fruit()
+
+    my_basket = MyBasket().bind()
+    # noinspection PyStatementEffect
+    my_basket.fruits.pear
+    # noinspection PyStatementEffect
+    my_basket.fruits.banana
+    assert list(my_basket.fruits) == ['banana', 'pear']
+    assert list(my_basket.fruits.keys()) == ['banana', 'orange', 'pear']
+
+
+def test_lazy_bind_is_linear():
+    hash_calls = [0]
+
+    class CountingName(str):
+        def __hash__(self):
+            hash_calls[0] += 1
+            return str.__hash__(self)
+
+    class Member:
+        def bind(self, parent):
+            return self
+
+    def work_to_bind_in_reverse(n):
+        names = [CountingName(f'member_{i}') for i in range(n)]
+        member_binder = MemberBinder(
+            parent=None,
+            _declared_members={name: Member() for name in names},
+            _unknown_types_fall_through=False,
+        )
+        hash_calls[0] = 0
+        for name in reversed(names):
+            member_binder[name]
+        assert list(member_binder.keys()) == names
+        return hash_calls[0]
+
+    # Binding members one by one used to re-insert every already bound member each time
+    assert work_to_bind_in_reverse(1000) < 20 * work_to_bind_in_reverse(100)
+
+
+def test_deleting_a_member_does_not_change_the_declaration():
+    basket = Basket(fruits__banana=Fruit(), fruits__orange=Fruit()).refine_done()
+
+    bound = basket.bind(request=None)
+    del bound.fruits['banana']
+    del bound.fruits['orange']  # not bound yet
+    assert list(bound.fruits.keys()) == []
+
+    assert list(basket.bind(request=None).fruits.keys()) == ['banana', 'orange']
@@ -1,14 +1,19 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import (
     Dict,
     Type,
     Union,
 )
 
+from django.db import connections
+
 from iommi._web_compat import (
     format_html,
+    settings,
     template_types,
 )
 from iommi.base import (
+    build_as_async_view_wrapper,
     build_as_view_wrapper,
     items,
     values,
@@ -43,6 +48,13 @@
 from iommi.traversable import Traversable
 
 
+def _run_query_in_thread(query):
+    try:
+        return query()
+    finally:
+        connections.close_all()
+
+
 @with_meta
 @declarative(
     parameter='parts_dict',
@@ -63,9 +75,12 @@ class Page(Part):
     # h_tag is evaluated, but in a special way so gets no EvaluatedRefinable type
     h_tag: Union[Fragment, str] = Refinable()
     parts: Dict[str, PartType] = RefinableMembers()
+    # Run the prefetch queries of the parts in a thread pool before rendering, see `prefetch`
+    concurrent_prefetch: bool = Refinable()
 
     class Meta:
         member_class = Fragment
+        concurrent_prefetch = False
 
         parts = EMPTY
         context = EMPTY
@@ -94,12 +109,15 @@ def on_bind(self) -> None:
             assert False, 'The context property is only valid on the root page'
 
         build_and_bind_h_tag(self)
+        self._is_prefetched = False
 
     def own_evaluate_parameters(self):
         return dict(page=self)
 
     @dispatch(render=lambda rendered: format_html('{}' * len(rendered), *values(rendered)))
     def __html__(self, *, render=None):
+        if self.concurrent_prefetch:
+            self.prefetch()
         self.context = evaluate_strict_container(self.context or {}, **self.iommi_evaluate_parameters())
         request = self.get_request()
         context = {**self.get_context(), **self.iommi_evaluate_parameters()}
@@ -113,5 +131,68 @@ def __html__(self, *, render=None):
 
         return render(rendered)
 
+    def prefetch(self):
+        """
+        Prefetch the data of the parts, e.g. the count and the current page
+        of a `Table`.
+
+        With `concurrent_prefetch=True` the queries of the parts (see
+        `Part.prefetch_queries`) run at the same time in a thread pool, so a
+        page with many tables doesn't pay for the queries of each table one
+        after the other. The threads only run the queries, everything else
+        happens in the request thread. Every thread uses its own database
+        connection, which can't see the changes of an open transaction, so
+        inside `transaction.atomic` (e.g. with `ATOMIC_REQUESTS`) the parts
+        are prefetched one after the other. The
+        `IOMMI_CONCURRENT_PREFETCH_MAX_WORKERS` setting caps the number of
+        threads per request (default 4). The parts are still rendered in
+        order, after all of them are prefetched.
+        """
+        if self._is_prefetched:
+            return
+        self._is_prefetched = True
+
+        parts = [part for part in values(self.parts) if isinstance(part, Part)]
+        max_workers = min(len(parts), getattr(settings, 'IOMMI_CONCURRENT_PREFETCH_MAX_WORKERS', 4))
+        in_transaction = any(connection.in_atomic_block for connection in connections.all())
+        if not self.concurrent_prefetch or max_workers <= 1 or in_transaction:
+            for part in parts:
+                part.prefetch()
+            return
+
+        pending = {}
+        for queries in [part.prefetch_queries() for part in parts]:
+            query = next(queries, None)
+            if query is not None:
+                pending[queries] = query
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending:
+                futures = {
+                    queries: executor.submit(_run_query_in_thread, query)
+                    for queries, query in items(pending)
+                }
+                pending = {}
+                for queries, future in items(futures):
+                    try:
+                        pending[queries] = queries.send(future.result())
+                    except StopIteration:
+                        pass
+
+    async def aprefetch(self):
+        from asgiref.sync import sync_to_async
+        if self.concurrent_prefetch:
+            await sync_to_async(self.prefetch)()
+            return
+
+        # Binding the parts can hit the database, so that is done in a worker thread
+        parts = await sync_to_async(lambda: list(values(self.parts)))()
+        for part in parts:
+            if isinstance(part, Part):
+                await part.aprefetch()
+
     def as_view(self):
         return build_as_view_wrapper(self)
+
+    def as_async_view(self):
+        return build_as_async_view_wrapper(self)
@@ -1,23 +1,31 @@
+import threading
 from platform import python_implementation
 
 import pytest
+from django.core.management.color import no_style
+from django.db import connection
+from django.db.models import QuerySet
 from django.test import override_settings
 
 from iommi import (
     Fragment,
     html,
+    Column,
     Page,
+    Table,
 )
 from iommi._web_compat import (
     Template,
 )
 from iommi.member import _force_bind_all
 from iommi.part import as_html
+from iommi.struct import Struct
 from tests.helpers import (
     prettify,
     req,
     user_req,
 )
+from tests.models import TFoo
 
 
 def test_simple_page():
@@ -134,3 +142,132 @@ def test_title_empty():
 
 def test_title_attr():
     assert '<h1 class="foo">Foo</h1>' == Page(title='foo', h_tag__attrs__class__foo=True).bind(request=req('get')).__html__()
+
+
+@pytest.fixture
+def reset_sequences_after():
+    yield
+    # The rows of a transactional test are committed, so the sequences are not
+    # rolled back. Other tests depend on the pks starting at 1.
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_by_name_sql(no_style(), connection.introspection.sequence_list()):
+            cursor.execute(sql)
+
+
+@override_settings(IOMMI_CONCURRENT_PREFETCH_MAX_WORKERS=2)
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_prefetch(monkeypatch, reset_sequences_after):
+    for x in range(3):
+        TFoo.objects.create(a=x, b='foo')
+
+    counted_in_threads = []
+    count = QuerySet.count
+
+    def count_in_thread(self):
+        counted_in_threads.append(threading.get_ident())
+        return count(self)
+
+    monkeypatch.setattr(QuerySet, 'count', count_in_thread)
+
+    def table(**filters):
+        return Table(auto__rows=TFoo.objects.filter(**filters).order_by('a'), columns__b__include=False, page_size=2)
+
+    page = Page(
+        concurrent_prefetch=True,
+        parts=dict(
+            first=table(),
+            second=table(a__gte=1),
+            third=table(a__gte=5),
+        ),
+    ).bind(request=req('get'))
+
+    page.prefetch()
+    assert len(counted_in_threads) == 3
+    assert threading.get_ident() not in counted_in_threads
+    assert len(set(counted_in_threads)) <= 2
+
+    executed = []
+
+    def capture(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(capture):
+        html = page.__html__()
+    # Already prefetched, so nothing more is queried
+    assert executed == []
+    assert len(counted_in_threads) == 3
+    first, second, third = html.split('</table>')[:3]
+    assert '<td class="rj">0</td>' in first and '<td class="rj">1</td>' in first and '<td class="rj">2</td>' not in first
+    assert '<td class="rj">1</td>' in second and '<td class="rj">2</td>' in second
+    assert '<td class="rj">' not in third
+
+
+@pytest.mark.django_db
+def test_concurrent_prefetch_in_a_transaction(monkeypatch):
+    # The threads can't see the rows of the transaction, so the parts are prefetched in the request thread
+    TFoo.objects.create(a=1, b='foo')
+
+    counted_in_threads = []
+    count = QuerySet.count
+
+    def count_in_thread(self):
+        counted_in_threads.append(threading.get_ident())
+        return count(self)
+
+    monkeypatch.setattr(QuerySet, 'count', count_in_thread)
+
+    page = Page(
+        concurrent_prefetch=True,
+        parts=dict(
+            first=Table(auto__model=TFoo, page_size=2),
+            second=Table(auto__model=TFoo, page_size=2),
+        ),
+    ).bind(request=req('get'))
+    page.prefetch()
+    assert counted_in_threads == [threading.get_ident()] * 2
+    assert page.__html__().count('<td class="rj">1</td>') == 2
+
+
+def test_concurrent_prefetch_of_lists():
+    counted = []
+
+    def count(rows, **_):
+        counted.append(threading.get_ident())
+        return len(rows)
+
+    def table(rows):
+        return Table(rows=[Struct(a=x) for x in rows], columns__a=Column(), page_size=2, parts__page__count=count)
+
+    page = Page(
+        concurrent_prefetch=True,
+        parts=dict(
+            first=table([0, 1, 2]),
+            second=table([1, 2]),
+        ),
+    ).bind(request=req('get'))
+
+    page.prefetch()
+    # No queries to run in threads, the rows are paginated in the request thread
+    assert counted == [threading.get_ident()] * 2
+
+    html = page.__html__()
+    assert len(counted) == 2
+    first, second = html.split('</table>')[:2]
+    assert '<td>0</td>' in first and '<td>1</td>' in first and '<td>2</td>' not in first
+    assert '<td>1</td>' in second and '<td>2</td>' in second
+
+
+def test_prefetch_is_sequential_by_default():
+    prefetched = []
+
+    class PrefetchingFragment(Fragment):
+        def prefetch(self):
+            prefetched.append((self._name, threading.get_ident()))
+
+    page = Page(
+        parts__a=PrefetchingFragment(),
+        parts__b=PrefetchingFragment(),
+    ).bind(request=req('get'))
+    page.prefetch()
+    assert prefetched == [('a', threading.get_ident()), ('b', threading.get_ident())]
@@ -8,7 +8,7 @@
 )
 
 from iommi._web_compat import (
-    get_template_from_string,
+    get_cached_template_from_string,
     HttpResponse,
     HttpResponseBase,
     mark_safe,
@@ -31,6 +31,7 @@
 from iommi.endpoint import (
     DISPATCH_PATH_SEPARATOR,
     Endpoint,
+    finish_partial_binds,
     InvalidEndpointPathException,
     perform_ajax_dispatch,
     perform_post_dispatch,
@@ -128,6 +129,7 @@ def dispatch_response_handler(r):
             elif isinstance(r, Part):
                 if not r._is_bound:
                     r = r.bind(request=request)
+                finish_partial_binds(r.iommi_root())
                 return HttpResponse(render_root(part=r, **kwargs))
             else:
                 return HttpResponse(json.dumps(r), content_type='application/json')
@@ -162,6 +164,8 @@ def dispatch_response_handler(r):
             if request.method == 'POST':
                 assert False, 'This request was a POST, but there was no dispatch command present.'
 
+        # The dispatch didn't produce the response, so this part will be rendered
+        finish_partial_binds(self.iommi_root())
         return None
 
     @dispatch
@@ -174,6 +178,55 @@ def render_to_response(self, **kwargs):
         response.iommi_part = self
         return response
 
+    async def arender_to_response(self, **kwargs):
+        """
+        Async version of `render_to_response`. Dispatch and rendering run in a
+        worker thread. For a normal render `aprefetch` is awaited first, so
+        the parts can load their data with the async ORM.
+        """
+        from asgiref.sync import sync_to_async
+        dispatch = await sync_to_async(self.perform_dispatch)(**kwargs)
+        if dispatch is not None:
+            return dispatch
+
+        await self.aprefetch()
+
+        response = HttpResponse(await sync_to_async(render_root)(part=self, **kwargs))
+        response.iommi_part = self
+        return response
+
+    def prefetch(self):
+        """
+        Load the data needed to render this part, before it is rendered, by
+        running the queries from `prefetch_queries` one after the other.
+        """
+        queries = self.prefetch_queries()
+        try:
+            query = next(queries)
+            while True:
+                query = queries.send(query())
+        except StopIteration:
+            pass
+
+    def prefetch_queries(self):
+        """
+        Generator of the queries needed to render this part. Each query is a
+        function without arguments that only evaluates querysets that are
+        already built, like `rows.count`, and doesn't touch the part. The
+        result of calling it is sent back into the generator. `Page` runs the
+        queries of its parts concurrently with `concurrent_prefetch=True`.
+        The default has no queries.
+        """
+        return
+        yield
+
+    async def aprefetch(self):
+        """
+        Load the data needed to render this part with the async ORM. Called by
+        `arender_to_response` on a bound part. The default does nothing.
+        """
+        pass
+
     def iommi_collected_assets(self):
         return sort_after(self.iommi_root()._iommi_collected_assets)
 
@@ -240,7 +293,7 @@ def render_root(*, part, context, **render):
         + content_block_name
         + ' %}{{ iommi_debug_panel }}{{ content }}{% endblock %}'
     )
-    return get_template_from_string(template_string).render(context=context, request=part.get_request())
+    return get_cached_template_from_string(template_string).render(context=context, request=part.get_request())
 
 
 PartType = Union[Part, str, Template]
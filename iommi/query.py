@@ -1,5 +1,8 @@
 import operator
-from functools import reduce
+from functools import (
+    lru_cache,
+    reduce,
+)
 from typing import (
     Type,
     Union,
@@ -80,6 +83,7 @@
     member_from_model,
     NoRegisteredSearchFieldException,
 )
+from iommi.list_query import filter_rows
 from iommi.member import (
     bind_members,
     refine_done_members,
@@ -535,6 +539,32 @@ class StringValue(str):
     pass
 
 
+class QueryStatement:
+    """
+    A statement of a parsed query string. The grammar only records what was
+    written, and the bound `Query` turns it into a `Q` object afterwards. This
+    way the grammar and the parse results can be shared by all queries.
+    """
+
+    def __init__(self, to_q_method_name, tokens):
+        self.to_q_method_name = to_q_method_name
+        self.tokens = tuple(tokens)
+
+    def __repr__(self):
+        return f'<QueryStatement {self.to_q_method_name} {self.tokens!r}>'
+
+
+# Number of distinct query strings per Query class to keep the parse result for
+PARSED_QUERY_STRING_CACHE_SIZE = 1000
+
+_grammar_by_query_class = {}
+
+
+@lru_cache(maxsize=PARSED_QUERY_STRING_CACHE_SIZE)
+def _parse_query_string(grammar, query_string):
+    return grammar.parseString(query_string, parseAll=True)
+
+
 def default_endpoint__errors(query, **_):
     try:
         query.get_q()
@@ -755,6 +785,7 @@ def on_bind(self) -> None:
         self.form_container = self.form_container.bind(parent=self)
 
         self.filter_name_by_query_name = {x.query_name: name for name, x in items(self.filters)}
+        self._filter_by_lowercase_name = {k.lower(): v for k, v in items(self.filters)}
 
     @staticmethod
     @refinable
@@ -766,7 +797,10 @@ def filter(query, rows, **_):
             except QueryException:
                 pass
             if q:
-                rows = rows.filter(q)
+                if isinstance(rows, QuerySet):
+                    rows = rows.filter(q)
+                else:
+                    rows = filter_rows(rows, q)
 
         return query.postprocess(rows=rows, **query.iommi_evaluate_parameters())
 
@@ -786,9 +820,12 @@ def parse_query_string(self, query_string: str) -> Q:
         query_string = query_string.strip()
         if not query_string:
             return Q()
-        parser = self._create_grammar()
+        grammar = _grammar_by_query_class.get(type(self))
+        if grammar is None:
+            grammar = self._create_grammar()
+            _grammar_by_query_class[type(self)] = grammar
         try:
-            tokens = parser.parseString(query_string, parseAll=True)
+            tokens = _parse_query_string(grammar, query_string)
         except ParseException:
             raise QueryException('Invalid syntax for query')
         return self._compile(tokens)
@@ -798,6 +835,8 @@ def _compile(self, tokens) -> Q:
         for token in tokens:
             if isinstance(token, ParseResults):
                 items.append(self._compile(token))
+            elif isinstance(token, QueryStatement):
+                items.append(getattr(self, token.to_q_method_name)(token.tokens))
             elif isinstance(token, Q):
                 items.append(token)
             elif token in ('and', 'or'):
@@ -860,6 +899,10 @@ def _create_grammar(self):
         Example
         something < 10 AND other >= 2015-01-01 AND (foo < 1 OR bar > 1)
 
+        The grammar is created once per `Query` class and shared between all
+        instances, so it must not refer to the instance. The statements are
+        parsed into `QueryStatement` objects that the bound query then
+        converts into `Q` objects.
         """
         quoted_string_excluding_quotes = QuotedString('"', escChar='\\').setParseAction(
             lambda token: StringValue(token[0])
@@ -876,9 +919,15 @@ def _create_grammar(self):
 
         # Define a where expression
         where_expression = Forward()
-        binary_operator_statement = (identifier + binary_op + value_string).setParseAction(self._binary_op_to_q)
-        unary_operator_statement = (identifier | (Char('!') + identifier)).setParseAction(self._unary_op_to_q)
-        free_text_statement = quotedString.copy().setParseAction(self._freetext_to_q)
+        binary_operator_statement = (identifier + binary_op + value_string).setParseAction(
+            lambda tokens: QueryStatement('_binary_op_to_q', tokens)
+        )
+        unary_operator_statement = (identifier | (Char('!') + identifier)).setParseAction(
+            lambda tokens: QueryStatement('_unary_op_to_q', tokens)
+        )
+        free_text_statement = quotedString.copy().setParseAction(
+            lambda tokens: QueryStatement('_freetext_to_q', tokens)
+        )
         operator_statement = binary_operator_statement | free_text_statement | unary_operator_statement
         where_condition = Group(operator_statement | ('(' + where_expression + ')'))
         where_expression << where_condition + ZeroOrMore((and_ | or_) + where_expression)
@@ -928,7 +977,7 @@ def _binary_op_to_q(self, token):
                 f'Unknown filter "{query_name}", available filters: {list(keys(self.filter_name_by_query_name))}'
             )
 
-        filter = self._lowercase_filters().get(filter_name.lower())
+        filter = self._filter_by_lowercase_name.get(filter_name.lower())
         if filter is None:
             raise QueryException(
                 f'Unknown filter "{query_name}", available filters: {list(keys(self.filter_name_by_query_name))}'
@@ -1031,11 +1080,6 @@ def get_q(self):
             self.query_error = str(e)
             raise
 
-    def _lowercase_filters(self):
-        if not hasattr(self, '_lowercase_filters_cache'):
-            self._lowercase_filters_cache = {k.lower(): v for k, v in items(self.filters)}
-        return self._lowercase_filters_cache
-
     @classmethod
     @dispatch()
     def filters_from_model(cls, **kwargs):
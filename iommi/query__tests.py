@@ -32,6 +32,8 @@
     register_search_fields,
 )
 from iommi.query import (
+    _grammar_by_query_class,
+    _parse_query_string,
     build_query_expression,
     choice_queryset_value_to_q,
     Filter,
@@ -129,6 +131,27 @@ def test_unknown_field_wrong_case(MyTestQuery):
     assert isinstance(e.value, QueryException)
 
 
+def test_grammar_and_parse_result_are_shared(MyTestQuery):
+    _parse_query_string.cache_clear()
+
+    query = MyTestQuery().bind(request=None)
+    expected = repr(Q(**{'foo__iexact': 'asd'}) & Q(**{'bar__exact': '7'}))
+    assert repr(query.parse_query_string('foo_name="asd" and bar_name = 7')) == expected
+    grammar = _grammar_by_query_class[MyTestQuery]
+    assert _parse_query_string.cache_info().misses == 1
+
+    query = MyTestQuery().bind(request=None)
+    assert repr(query.parse_query_string('foo_name="asd" and bar_name = 7')) == expected
+    assert _grammar_by_query_class[MyTestQuery] is grammar
+    assert _parse_query_string.cache_info().hits == 1
+
+    # The cached parse result is compiled by each bound query
+    query = MyTestQuery(filters__bar_name__attr='other_bar').bind(request=None)
+    assert repr(query.parse_query_string('foo_name="asd" and bar_name = 7')) == repr(
+        Q(**{'foo__iexact': 'asd'}) & Q(**{'other_bar__exact': '7'})
+    )
+
+
 def test_freetext(MyTestQuery):
     query = MyTestQuery().bind(request=None)
     expected = repr(Q(**{'foo__icontains': 'asd'}) | Q(**{'bar__contains': 'asd'}))
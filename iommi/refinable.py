@@ -63,6 +63,33 @@ def flatten_items(namespace, _prefix=''):
             yield path, value
 
 
+def _apply_layer(result, prio, params, flattened_params):
+    missing = object()
+
+    for path, value in flattened_params:
+        found = False
+        for prefix in prefixes(path):
+            existing = getattr_path(result, prefix, missing)
+            if existing is missing:
+                break
+            new_updates = getattr_path(params, prefix)
+
+            if isinstance(existing, RefinableObject):
+                if isinstance(new_updates, dict):
+                    existing = existing.refine(prio, **new_updates)
+                else:
+                    existing = new_updates
+                result.setitem_path(prefix, existing)
+                found = True
+
+            if isinstance(new_updates, RefinableObject):
+                result.setitem_path(prefix, new_updates)
+                found = True
+
+        if not found:
+            result.setitem_path(path, value)
+
+
 class RefinableNamespace(Namespace):
     __iommi_refined_stack: List[Tuple[Prio, Namespace, List[Tuple[str, Any]]]]
 
@@ -81,41 +108,29 @@ def _get_parent_stack(self):
             ]
 
     def _refine(self, prio: Prio, **kwargs):
-        params = Namespace(**kwargs)
+        return self._refine_layers([(prio, Namespace(**kwargs))])
 
-        stack = self._get_parent_stack() + [
-            (prio, params, list(flatten_items(params))),
+    def _refine_layers(self, layers):
+        parent_stack = self._get_parent_stack()
+        stack = parent_stack + [
+            (prio, params, list(flatten_items(params)))
+            for prio, params in layers
         ]
         stack.sort(key=lambda x: x[0].value)
 
         result = RefinableNamespace()
         object.__setattr__(result, '__iommi_refined_stack', stack)
 
-        missing = object()
-
-        for prio, params, flattened_params in stack:
-            for path, value in flattened_params:
-                found = False
-                for prefix in prefixes(path):
-                    existing = getattr_path(result, prefix, missing)
-                    if existing is missing:
-                        break
-                    new_updates = getattr_path(params, prefix)
-
-                    if isinstance(existing, RefinableObject):
-                        if isinstance(new_updates, dict):
-                            existing = existing.refine(prio, **new_updates)
-                        else:
-                            existing = new_updates
-                        result.setitem_path(prefix, existing)
-                        found = True
-
-                    if isinstance(new_updates, RefinableObject):
-                        result.setitem_path(prefix, new_updates)
-                        found = True
+        if all(a is b for a, b in zip(parent_stack, stack)):
+            # The new layers all ended up on top of the existing ones, so
+            # only they need to be applied on top of what we already have
+            dict.update(result, self)
+            new_layers = stack[len(parent_stack):]
+        else:
+            new_layers = stack
 
-                if not found:
-                    result.setitem_path(path, value)
+        for prio, params, flattened_params in new_layers:
+            _apply_layer(result, prio, params, flattened_params)
 
         return result
 
@@ -159,9 +174,12 @@ class RefinableMembers(Refinable):
     add_init_kwargs=False,
 )
 class RefinableObject:
-    iommi_namespace: RefinableNamespace
     is_refine_done: bool
 
+    # Refinements not yet merged into the namespace. They are merged in one
+    # go the first time iommi_namespace is read, normally at refine_done.
+    _iommi_pending_refines = ()
+
     @dispatch
     def __init__(self, **kwargs):
         self.is_refine_done = False
@@ -229,10 +247,22 @@ def refine(self, prio: Prio = Prio.refine, **kwargs):
         else:
             result = copy(self)
 
-        result.iommi_namespace = self.iommi_namespace._refine(prio, **kwargs)
+        result._iommi_pending_refines = self._iommi_pending_refines + ((prio, Namespace(**kwargs)),)
 
         return result
 
+    @property
+    def iommi_namespace(self) -> RefinableNamespace:
+        if self._iommi_pending_refines:
+            self._iommi_namespace = self._iommi_namespace._refine_layers(self._iommi_pending_refines)
+            self._iommi_pending_refines = ()
+        return self._iommi_namespace
+
+    @iommi_namespace.setter
+    def iommi_namespace(self, value: RefinableNamespace):
+        self._iommi_namespace = value
+        self._iommi_pending_refines = ()
+
     def refine_defaults(self, **kwargs):
         return self.refine(Prio.refine_defaults, **kwargs)
 
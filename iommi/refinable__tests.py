@@ -324,3 +324,42 @@ def test_check_attribute_existence():
         '    taste\n'
     )):
         Fruit(smell=17)
+
+
+def test_refine_is_linear_in_number_of_refines(monkeypatch):
+    from iommi import refinable
+
+    prefixes_calls = [0]
+
+    def counting_prefixes(path):
+        prefixes_calls[0] += 1
+        return prefixes(path)
+
+    monkeypatch.setattr(refinable, 'prefixes', counting_prefixes)
+
+    class MyRefinableObject(RefinableObject):
+        a = Refinable()
+
+    def work_to_refine(n):
+        prefixes_calls[0] = 0
+        o = MyRefinableObject(a=Namespace())
+        for i in range(n):
+            o = o.refine(Prio.refine if i % 2 else Prio.refine_defaults, **{f'a__x{i}': i})
+        o = o.refine_done()
+        assert len(o.a) == n
+        return prefixes_calls[0]
+
+    # Each refine used to replay the entire stack of earlier refines
+    assert work_to_refine(500) < 20 * work_to_refine(50)
+
+
+def test_refine_incremental_matches_full_replay():
+    namespace = RefinableNamespace(a__b=1, c=Fruit(color='red'))
+    incremental = namespace._refine(Prio.refine, a__d=2)._refine(Prio.refine, c__taste='sweet')
+    full = namespace._refine_layers([
+        (Prio.refine, Namespace(a__d=2)),
+        (Prio.refine, Namespace(c__taste='sweet')),
+    ])
+    assert incremental.a == full.a == Namespace(b=1, d=2)
+    assert incremental.c.iommi_namespace == full.c.iommi_namespace == Namespace(color='red', taste='sweet')
+    assert incremental.as_stack() == full.as_stack()
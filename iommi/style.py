@@ -1,5 +1,6 @@
 from collections import defaultdict
 from contextlib import contextmanager
+from functools import lru_cache
 from typing import (
     Any,
     List,
@@ -105,31 +106,48 @@ def resolve(self, obj, is_root=False):
         Calculate the namespaces of additional argument that should be applied
         to the given object. If is_root is set to True, assets might also be
         added to the namespace.
+
+        The result only depends on the class of the object and its shortcut
+        stack, so it is kept in an LRU cache of `RESOLVE_CACHE_SIZE` entries.
+        The cache is cleared by `register_style` and `unregister_style`.
         """
-        result = []
+        shortcut_stack = tuple(getattr(obj, 'iommi_shortcut_stack', ()))
+        return list(_resolve(self, type(obj), shortcut_stack, is_root))
 
-        for class_name in class_names_for(type(obj)):
-            if class_name in self.config:
-                config = dict(self.config.get(class_name))
-                shortcuts_config = config.pop('shortcuts', {})
-                if config:
-                    result.append(config)
+    def __repr__(self):
+        return f'<Style: {self.name}>'
 
-                for shortcut_name in reversed(getattr(obj, 'iommi_shortcut_stack', [])):
-                    config = shortcuts_config.get(shortcut_name)
-                    if config:
-                        result.append(config)
 
-        if is_root and self.root:
-            result.append(self.root)
+_styles = {}
 
-        return result
+# Number of distinct (style, class, shortcut stack) combinations to keep the resolved namespaces for
+RESOLVE_CACHE_SIZE = 1000
 
-    def __repr__(self):
-        return f'<Style: {self.name}>'
 
+@lru_cache(maxsize=RESOLVE_CACHE_SIZE)
+def _resolve(style, klass, shortcut_stack, is_root):
+    result = []
 
-_styles = {}
+    for class_name in class_names_for(klass):
+        if class_name in style.config:
+            config = Namespace(style.config.get(class_name))
+            shortcuts_config = config.pop('shortcuts', {})
+            if config:
+                result.append(config)
+
+            for shortcut_name in reversed(shortcut_stack):
+                config = shortcuts_config.get(shortcut_name)
+                if config:
+                    result.append(Namespace(config))
+
+    if is_root and style.root:
+        result.append(Namespace(style.root))
+
+    return tuple(result)
+
+
+def clear_style_cache():
+    _resolve.cache_clear()
 
 
 def register_style(name, style):
@@ -137,6 +155,7 @@ def register_style(name, style):
     assert style.name is None
     style.name = name
     _styles[name] = style
+    clear_style_cache()
 
     @contextmanager
     def _unregister():
@@ -150,6 +169,7 @@ def _unregister():
 def unregister_style(name):
     assert name in _styles
     del _styles[name]
+    clear_style_cache()
 
 
 def get_global_style(name):
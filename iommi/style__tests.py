@@ -22,10 +22,13 @@
 )
 from iommi.shortcut import with_defaults
 from iommi.style import (
+    clear_style_cache,
     get_global_style,
     get_style_object,
     InvalidStyleConfigurationException,
     register_style,
+    _resolve,
+    RESOLVE_CACHE_SIZE,
     resolve_style,
     Style,
     validate_styles,
@@ -744,3 +747,33 @@ def garfield(cls, **kwargs):
     )
 
     assert style.resolve(Cat.garfield()) == [dict(teeth='sharp'), dict(legs='long', belly='slim'), dict(belly='fat')]
+
+
+def test_resolve_is_cached_per_class_and_shortcut_stack():
+    style = Style(Dog__tail='short', Dog__shortcuts__puppy__size='small')
+
+    class Puppy(Dog):
+        iommi_shortcut_stack = ['puppy']
+
+    clear_style_cache()
+    assert style.resolve(Dog()) == [dict(tail='short')]
+    assert style.resolve(Puppy()) == [dict(tail='short'), dict(size='small')]
+    assert _resolve.cache_info().currsize == 2
+    assert style.resolve(Puppy()) == [dict(tail='short'), dict(size='small')]
+    assert _resolve.cache_info().hits == 1
+
+    # Mutating the result must not leak into the cache
+    style.resolve(Dog()).clear()
+    assert style.resolve(Dog()) == [dict(tail='short')]
+
+    with register_style('test_resolve_is_cached', Style()):
+        assert _resolve.cache_info().currsize == 0
+        style.resolve(Dog())
+    assert _resolve.cache_info().currsize == 0
+
+
+def test_resolve_cache_is_bounded():
+    clear_style_cache()
+    for _ in range(RESOLVE_CACHE_SIZE + 10):
+        Style(Dog__tail='short').resolve(Dog())
+    assert _resolve.cache_info().currsize == RESOLVE_CACHE_SIZE
@@ -1,4 +1,13 @@
 import csv
+import json
+import logging
+from array import array
+from base64 import (
+    urlsafe_b64decode,
+    urlsafe_b64encode,
+)
+from copy import copy
+from hashlib import sha256
 from datetime import (
     date,
     datetime,
@@ -8,9 +17,14 @@
     auto,
     Enum,
 )
-from functools import total_ordering
-from io import StringIO
-from itertools import groupby
+from functools import (
+    partial,
+    total_ordering,
+)
+from itertools import (
+    groupby,
+    islice,
+)
 from typing import (
     Any,
     Callable,
@@ -22,15 +36,34 @@
 )
 from urllib.parse import quote_plus
 
+import django
+from django.core.cache import cache
+from django.core.exceptions import (
+    EmptyResultSet,
+    FieldDoesNotExist,
+)
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import (
+    connections,
+    transaction,
+)
 from django.db.models import (
     AutoField,
+    Avg,
     BooleanField,
+    Count,
     ManyToManyField,
+    Max,
+    Min,
     Model,
+    Q,
     QuerySet,
+    Sum,
 )
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.query import ModelIterable
 from django.http import (
-    FileResponse,
+    StreamingHttpResponse,
 )
 from django.utils.formats import date_format
 from django.utils.html import (
@@ -63,6 +96,7 @@
     render_attrs,
 )
 from iommi.base import (
+    build_as_async_view_wrapper,
     build_as_view_wrapper,
     get_display_name,
     items,
@@ -86,12 +120,14 @@
 
 from iommi.endpoint import (
     DISPATCH_PREFIX,
+    get_partial_bind_path,
     path_join,
 )
 from iommi.evaluate import (
     evaluate,
     evaluate_member,
     evaluate_strict,
+    get_signature,
 )
 from iommi.form import (
     Field,
@@ -107,6 +143,8 @@
 from iommi.from_model import (
     AutoConfig,
     create_members_from_model,
+    get_field,
+    get_field_path,
     get_search_fields,
     member_from_model,
     NoRegisteredSearchFieldException,
@@ -142,6 +180,8 @@
 
 LAST = LAST
 
+log = logging.getLogger('iommi')
+
 _column_factory_by_field_type = {}
 
 
@@ -158,6 +198,8 @@ def register_column_factory(django_field_class, *, shortcut_name=MISSING, factor
 
 DEFAULT_PAGE_SIZE = 16
 
+BULK_EDIT_BATCH_SIZE = 1000
+
 
 def params_of_request(request):
     if request is None:
@@ -304,12 +346,73 @@ def default_cell__value(column, row, **kwargs):
         return getattr_path(row, evaluate_strict(column.attr, row=row, column=column, **kwargs))
 
 
+def default_select__checked(row, **_):
+    return False
+
+
+def default_row__attrs__data_pk(row, **_):
+    return getattr(row, 'pk', None)
+
+
 class DataRetrievalMethods(Enum):
     attribute_access = auto()
     prefetch = auto()
     select = auto()
 
 
+# The database aggregate, and how to do the same on a list of values that are not None
+_aggregate_by_name = dict(
+    sum=(Sum, sum),
+    avg=(Avg, lambda values: sum(values) / len(values)),
+    min=(Min, min),
+    max=(Max, max),
+    count=(Count, len),
+)
+
+
+def _aggregate_expressions(columns):
+    # The aliases can't be the column names, those can clash with the fields of the model
+    return {
+        # A count without an attr counts the rows, like it does for a list
+        f'iommi_aggregate_{column._name}': Count('*') if column.attr is None else _aggregate_by_name[column.aggregate][0](column.attr)
+        for column in columns
+    }
+
+
+def _validate_aggregate_attr(column):
+    rows = column.table.initial_rows
+    model = column.model or column.table.model
+    if not isinstance(rows, QuerySet) or not isinstance(model, type) or not issubclass(model, Model):
+        return
+    if column.attr.partition('__')[0] in rows.query.annotations:
+        return
+    try:
+        get_field_path(model, column.attr)
+    except FieldDoesNotExist:
+        assert False, (
+            f'The aggregate of column {column._name} is done in the database, so attr must be a field of {model.__name__}, '
+            f'not a property or method. {model.__name__} has no field with path {column.attr!r}'
+        )
+
+
+def _aggregates_from_result(result, columns):
+    return {column._name: result[f'iommi_aggregate_{column._name}'] for column in columns}
+
+
+def _aggregate_rows(rows, columns):
+    result = {}
+    for column in columns:
+        if column.attr is None:
+            column_values = list(rows)
+        else:
+            column_values = [x for x in (getattr_path(row, column.attr) for row in rows) if x is not None]
+        if column_values or column.aggregate == 'count':
+            result[column._name] = _aggregate_by_name[column.aggregate][1](column_values)
+        else:
+            result[column._name] = None
+    return result
+
+
 def default_icon__cell__format(column, value, **_):
     if not value:
         return ''
@@ -357,6 +460,8 @@ class Column(Part):
     superheader = EvaluatedRefinable()
     header: Namespace = EvaluatedRefinable()
     data_retrieval_method = EvaluatedRefinable()
+    projection = EvaluatedRefinable()
+    aggregate: Optional[str] = EvaluatedRefinable()
     render_column: bool = EvaluatedRefinable()
 
     class Meta:
@@ -372,6 +477,8 @@ class Meta:
         auto_rowspan=False,
         bulk__include=False,
         data_retrieval_method=DataRetrievalMethods.attribute_access,
+        projection=None,
+        aggregate=None,
         cell__template=None,
         cell__value=default_cell__value,
         cell__format=default_cell_formatter,
@@ -409,6 +516,8 @@ def __init__(self, **kwargs):
         :param cell__url: callable that receives kw arguments: `table`, `column`, `row` and `value`.
         :param cell__url_title: callable that receives kw arguments: `table`, `column`, `row` and `value`.
         :param render_column: If set to `False` the column won't be rendered in the table, but still be available in `table.columns`. This can be useful if you want some other feature from a column like filtering.
+        :param aggregate: show the `sum`, `avg`, `min`, `max` or `count` of the column for all the rows in the footer of the table. For a `QuerySet` this is done in the database, so `attr` must be a field or an annotation, not a property. A `count` without an `attr` counts the rows. See `Table.footer`.
+        :param projection: list of attr paths the cells of this column read from the row, besides `attr`. By default this is figured out from the cell configuration: callables that take `row` are assumed to need the whole row. Set this to `False` if the cells need the whole row anyway, e.g. because `cell__format` calls a method on the row. See `Table.projection`.
         """
 
         model_field = kwargs.get('model_field')
@@ -461,6 +570,14 @@ def on_bind(self) -> None:
         self.declared_column = self._declared
         self.cell = Namespace(flatten(self.cell))
 
+        assert self.aggregate is None or self.aggregate in _aggregate_by_name, (
+            f'Unknown aggregate {self.aggregate!r} on column {self._name}, use one of: {", ".join(_aggregate_by_name)}'
+        )
+        assert self.aggregate in (None, 'count') or self.attr is not None, f'The aggregate of column {self._name} needs an attr'
+        if self.aggregate is not None and self.attr is not None:
+            assert isinstance(self.attr, str), f'The aggregate of column {self._name} needs attr to be a field name, not {self.attr!r}'
+            _validate_aggregate_attr(self)
+
         # Not strict evaluate on purpose
         self.model = evaluate(self.model, **self.iommi_evaluate_parameters())
 
@@ -569,7 +686,7 @@ def run(cls, **kwargs):
         filter__field__include=False,
         attr=None,
     )
-    def select(cls, checkbox_name='pk', checked=lambda row, **_: False, **kwargs):
+    def select(cls, checkbox_name='pk', checked=default_select__checked, **kwargs):
         """
         Shortcut for a column of checkboxes to select rows. This is useful for implementing bulk operations.
 
@@ -601,7 +718,11 @@ def cell__value(row, table, cells, **kwargs):
                 row_id = cells.row_index
             return mark_safe(f'<input type="checkbox"{checked_str} class="checkbox" name="{checkbox_name}_{row_id}" />')
 
-        setdefaults_path(kwargs, dict(cell__value=cell__value))
+        setdefaults_path(kwargs, dict(
+            cell__value=cell__value,
+            # The checkbox only needs the pk, unless `checked` looks at the row
+            projection=[] if checked is default_select__checked else None,
+        ))
         return cls(**kwargs)
 
     @classmethod
@@ -880,14 +1001,16 @@ def __str__(self):
         return self.__html__()
 
     def __iter__(self):
-        for column in values(self.get_table().columns):
+        table = self.get_table()
+        for column in values(table.columns):
             if not column.render_column:
                 continue
-            yield self.cell_class(cells=self, column=column).refine_done(parent=self)
+            yield table.compiled_cell(column).cell(cells=self)
 
     def __getitem__(self, name):
-        column = self.iommi_parent().columns[name]
-        return self.cell_class(cells=self, column=column).refine_done(parent=self)
+        table = self.get_table()
+        column = table.columns[name]
+        return table.compiled_cell(column).cell(cells=self)
 
 
 class CellConfig(RefinableObject, Tag):
@@ -902,7 +1025,85 @@ class CellConfig(RefinableObject, Tag):
     link = Refinable()
 
 
+_cell_evaluated_members = ('value', 'url', 'url_title', 'tag')
+
+
+def _attrs_are_static(attrs):
+    if not attrs:
+        return True
+    for value in values(attrs):
+        if isinstance(value, dict):
+            if any(callable(x) for x in values(value)):
+                return False
+        elif callable(value):
+            return False
+    return True
+
+
+def _copy_attrs(attrs):
+    if not isinstance(attrs, Attrs):
+        # Empty attrs are rendered as ''
+        return attrs
+    return Attrs(None, **{k: dict(v) if isinstance(v, dict) else v for k, v in items(attrs)})
+
+
+class CompiledCell:
+    """
+    Internal class holding the cell configuration of a column, merged and
+    classified once per bind of the table.
+
+    The first cell created for a column goes through the full `Cell`
+    construction. Cells for the following rows are cloned from that one,
+    and only the members that are callable are evaluated again. A custom
+    `cell_class` always gets the full construction, since its `__init__`
+    might do more than `Cell` does.
+    """
+
+    def __init__(self, column):
+        self.column = column
+        self.config = setdefaults_path(
+            Namespace(),
+            column.cell,
+            column.table.cell,
+        )
+        self.members = {k: self.config.get(k) for k in _cell_evaluated_members}
+        self.dynamic_members = {k for k, v in items(self.members) if callable(v)}
+        self.static_attrs = _attrs_are_static(self.config.get('attrs'))
+        self._prototype = None
+
+    def value(self, cells):
+        """
+        Evaluate only the value of the cell, without creating a `Cell`.
+        """
+        return evaluate_strict(self.config.value, **{**cells.iommi_evaluate_parameters(), 'column': self.column})
+
+    def cell(self, cells):
+        cell_class = cells.cell_class
+        if cell_class is not Cell:
+            return cell_class(cells=cells, column=self.column).refine_done(parent=cells)
+
+        if self._prototype is None:
+            cell = Cell(cells=cells, column=self.column).refine_done(parent=cells)
+            self._prototype = copy(cell)
+            self._prototype.attrs = _copy_attrs(cell.attrs)
+            return cell
+
+        cell = copy(self._prototype)
+        cell._set_cells(cells)
+        cell._compiled = self
+        cell.__dict__.update(self.members)
+        if self.static_attrs:
+            # Every cell gets its own attrs, so changing them on one cell doesn't change the others
+            cell.attrs = _copy_attrs(cell.attrs)
+        else:
+            cell.attrs = self.config.attrs
+        cell.on_refine_done()
+        return cell
+
+
 class Cell(CellConfig):
+    _compiled: CompiledCell = None
+
     @dispatch
     def __init__(self, cells: Cells, column):
         kwargs = setdefaults_path(
@@ -912,12 +1113,15 @@ def __init__(self, cells: Cells, column):
         )
         super(Cell, self).__init__(**kwargs)
         self._name = 'cell'
-        self._parent = cells
         self._is_bound = True
         self.iommi_style = None
         self._unapplied_config = {}
 
         self.column = column
+        self._set_cells(cells)
+
+    def _set_cells(self, cells):
+        self._parent = cells
         self.cells = cells
         self.table = cells.get_table()
         self.row = cells.row
@@ -925,12 +1129,20 @@ def __init__(self, cells: Cells, column):
     def on_refine_done(self):
         self._evaluate_parameters = {**self.cells.iommi_evaluate_parameters(), 'column': self.column}
 
-        self.value = evaluate_strict(self.value, **self._evaluate_parameters)
+        # A compiled cell knows which members are static, those are already in place
+        dynamic_members = self._compiled.dynamic_members if self._compiled is not None else _cell_evaluated_members
+
+        if 'value' in dynamic_members:
+            self.value = evaluate_strict(self.value, **self._evaluate_parameters)
         self._evaluate_parameters['value'] = self.value
-        self.url = evaluate_strict(self.url, **self._evaluate_parameters)
-        self.attrs = evaluate_attrs(self, **self._evaluate_parameters)
-        self.url_title = evaluate_strict(self.url_title, **self._evaluate_parameters)
-        self.tag = evaluate_strict(self.tag, **self._evaluate_parameters)
+        if 'url' in dynamic_members:
+            self.url = evaluate_strict(self.url, **self._evaluate_parameters)
+        if self._compiled is None or not self._compiled.static_attrs:
+            self.attrs = evaluate_attrs(self, **self._evaluate_parameters)
+        if 'url_title' in dynamic_members:
+            self.url_title = evaluate_strict(self.url_title, **self._evaluate_parameters)
+        if 'tag' in dynamic_members:
+            self.tag = evaluate_strict(self.tag, **self._evaluate_parameters)
 
     @property
     def iommi_dunder_path(self):
@@ -1002,6 +1214,26 @@ def __str__(self):
         return self.__html__()
 
 
+class FooterConfig(Traversable):
+    """
+    Configuration of the footer of a table, with the aggregates of the
+    columns that have `aggregate` set. The footer isn't rendered if no
+    column has an aggregate.
+    """
+
+    template: Union[str, Template] = EvaluatedRefinable()
+    per_page: bool = EvaluatedRefinable()
+
+    def __html__(self):
+        table = self.iommi_parent()
+        if not table._aggregated_columns():
+            return ''
+        return render_template(self.get_request(), self.template, table.iommi_evaluate_parameters())
+
+    def __str__(self):
+        return self.__html__()
+
+
 class HeaderColumnConfig(Traversable):
     attrs: Attrs = Refinable()  # attrs is evaluated, but in a special way so gets no EvaluatedRefinable type
     template: Union[str, Template] = EvaluatedRefinable()
@@ -1066,6 +1298,36 @@ def iommi_dunder_path(self):
         return path_join(self.column.iommi_dunder_path, self._name, separator='__')
 
 
+def _bulk_edit_pk_batches(queryset):
+    # Keyset pagination on pk: rows in later batches are untouched when they are
+    # fetched, so updating a batch can't change which rows the following batches contain
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+    batch = list(dict.fromkeys(pks[:BULK_EDIT_BATCH_SIZE]))
+    while batch:
+        yield batch
+        batch = list(dict.fromkeys(pks.filter(pk__gt=batch[-1])[:BULK_EDIT_BATCH_SIZE]))
+
+
+def _bulk_set_m2m(model_field, attr, pks, value):
+    through = model_field.remote_field.through
+    # A custom through model can have fields we don't know how to fill in, and
+    # bulk_create(ignore_conflicts=True) is new in Django 2.2
+    if not through._meta.auto_created or django.VERSION < (2, 2):
+        for obj in model_field.model.objects.filter(pk__in=pks):
+            getattr(obj, attr).set(value)
+        return
+
+    source = through._meta.get_field(model_field.m2m_field_name()).attname
+    target = through._meta.get_field(model_field.m2m_reverse_field_name()).attname
+    target_pks = [getattr(x, 'pk', x) for x in value]
+
+    through._default_manager.filter(**{f'{source}__in': pks}).exclude(**{f'{target}__in': target_pks}).delete()
+    through._default_manager.bulk_create(
+        [through(**{source: pk, target: target_pk}) for pk in pks for target_pk in target_pks],
+        ignore_conflicts=True,
+    )
+
+
 def bulk__post_handler(table, form, **_):
     if not form.is_valid():
         return
@@ -1089,20 +1351,35 @@ def bulk__post_handler(table, form, **_):
             simple_updates.append(field)
 
     updates = {field.attr: field.value for field in simple_updates}
+    m2m_fields = {field.attr: field.model_field for field in m2m_updates}
     m2m_updates = {field.attr: field.value for field in m2m_updates}
 
-    pks = list(queryset.values_list('pk', flat=True))
-
-    queryset.model.objects.filter(pk__in=pks).update(**updates)
-
-    if m2m_updates:
-        for obj in queryset:
-            for attr, value in items(m2m_updates):
-                getattr(obj, attr).set(value)
-            obj.save()
+    model = queryset.model
+    # Filter on a pk subquery instead of using the table queryset directly, since
+    # Django can't update when there are annotations to a foreign table
+    selected = model.objects.filter(pk__in=queryset.order_by().values('pk'))
+    with transaction.atomic(using=queryset.db):
+        if not m2m_updates and connections[queryset.db].features.update_can_self_select:
+            if updates:
+                selected.update(**updates)
+        else:
+            for batch in _bulk_edit_pk_batches(queryset):
+                if updates:
+                    model.objects.filter(pk__in=batch).update(**updates)
+                if not m2m_updates:
+                    continue
+                if table.bulk_per_object:
+                    for obj in model.objects.filter(pk__in=batch):
+                        for attr, value in items(m2m_updates):
+                            getattr(obj, attr).set(value)
+                        obj.save()
+                else:
+                    for attr, value in items(m2m_updates):
+                        _bulk_set_m2m(model_field=m2m_fields[attr], attr=attr, pks=batch, value=value)
 
     response = table.post_bulk_edit(
-        pks=pks,
+        # Lazy, so the pks of all selected rows are only fetched if post_bulk_edit uses them
+        pks=selected.values_list('pk', flat=True),
         queryset=queryset,
         updates=updates,
         m2m_updates=m2m_updates,
@@ -1171,6 +1448,180 @@ def paginator__count(rows, **_):
         return None
 
 
+def paginator__capped_count(rows, paginator, **_):
+    """
+    Count at most `paginator.max_count` rows. If there are more rows than
+    that `paginator.count_is_capped` is set, and the paginator shows the count
+    as e.g. "10000+". Paging past the cap is still possible.
+    """
+    if not isinstance(rows, QuerySet):
+        return paginator__count(rows=rows)
+    count = rows.order_by()[:paginator.max_count + 1].count()
+    if count > paginator.max_count:
+        paginator.count_is_capped = True
+        return paginator.max_count
+    return count
+
+
+def paginator__estimated_count(rows, paginator, **_):
+    """
+    Use the row estimate of the query planner on PostgreSQL. If the estimate
+    is below `paginator.max_count` an exact count is cheap enough, so that is
+    done instead, otherwise `paginator.count_is_estimated` is set and the
+    paginator shows the count as e.g. "~10000". On other databases this is an
+    exact count.
+    """
+    if not isinstance(rows, QuerySet) or connections[rows.db].vendor != 'postgresql':
+        return paginator__count(rows=rows)
+    try:
+        sql, params = rows.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    with connections[rows.db].cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    estimate = int(plan[0]['Plan']['Plan Rows'])
+    if estimate < paginator.max_count:
+        return rows.count()
+    paginator.count_is_estimated = True
+    return estimate
+
+
+def paginator__cached_count(rows, paginator, **_):
+    """
+    Exact count, cached in the Django cache for `paginator.count_cache_timeout`
+    seconds. The cache key is the SQL and parameters of the query.
+    """
+    if not isinstance(rows, QuerySet):
+        return paginator__count(rows=rows)
+    try:
+        sql, params = rows.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    key = 'iommi_count:' + sha256(f'{rows.db}:{sql}:{params!r}'.encode()).hexdigest()
+    count = cache.get(key)
+    if count is None:
+        count = rows.count()
+        cache.set(key, count, paginator.count_cache_timeout)
+    return count
+
+
+def _keyset_ordering_fields(model, ordering, annotations, seen_models=()):
+    descending = ordering.startswith('-')
+    path = ordering.lstrip('-')
+    names = path.split('__')
+    field = None
+    for i, name in enumerate(names):
+        if name == 'pk' and i == len(names) - 1:
+            return [ordering]
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return [ordering] if path in annotations else None
+        if field.many_to_many or field.one_to_many:
+            # Many valued relations repeat the rows
+            return None
+        if field.is_relation:
+            model = field.related_model
+
+    if not field.is_relation or names[-1] == field.attname:
+        return [ordering]
+
+    # Ordering on a foreign key is ordering on the default ordering of the
+    # related model, like Django does. Without one it's the key itself.
+    if not model._meta.ordering:
+        return ['-' * descending + '__'.join(names[:-1] + [field.attname])]
+    if model in seen_models:
+        return None
+    result = []
+    for x in model._meta.ordering:
+        if not isinstance(x, str) or x == '?':
+            return None
+        related_descending = x.startswith('-') != descending
+        fields = _keyset_ordering_fields(
+            model=model,
+            ordering='-' * related_descending + x.lstrip('-'),
+            annotations=set(),
+            seen_models=seen_models + (model,),
+        )
+        if fields is None:
+            return None
+        for field_ordering in fields:
+            result.append('-' * field_ordering.startswith('-') + path + '__' + field_ordering.lstrip('-'))
+    return result
+
+
+def keyset_ordering(rows):
+    """
+    The ordering used for keyset pagination of a `QuerySet`: the ordering
+    the table applied when sorting (or the default ordering of the model),
+    with `pk` added as a tie breaker so the ordering is total. Ordering on a
+    foreign key is replaced by the fields of the default ordering of the
+    related model.
+
+    Returns `None` for orderings keyset pagination can't handle, like
+    expressions or fields of many valued relations.
+    """
+    result = []
+    for x in list(rows.query.order_by) or list(rows.model._meta.ordering):
+        if not isinstance(x, str) or x == '?':
+            return None
+        fields = _keyset_ordering_fields(model=rows.model, ordering=x, annotations=rows.query.annotations)
+        if fields is None:
+            return None
+        result.extend(fields)
+    pk_names = {'pk', rows.model._meta.pk.name, rows.model._meta.pk.attname}
+    if not any(x.lstrip('-') in pk_names for x in result):
+        result.append('pk')
+    return result
+
+
+def keyset_value(row, field):
+    value = getattr_path(row, field.lstrip('-'))
+    if isinstance(value, Model):
+        value = value.pk
+    return value
+
+
+def keyset_q(ordering, values, reverse=False):
+    """
+    Build a `Q` that matches the rows after (or before, if `reverse` is set)
+    the row with the given values for the fields in `ordering`.
+    """
+    result = Q(pk__in=[])
+    equal = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        if value is not None:
+            op = 'lt' if field.startswith('-') != reverse else 'gt'
+            result |= equal & Q(**{f'{name}__{op}': value})
+        equal &= Q(**{name: value})
+    return result
+
+
+def encode_keyset_cursor(direction, values):
+    s = json.dumps([direction, values], cls=DjangoJSONEncoder, separators=(',', ':'))
+    return urlsafe_b64encode(s.encode()).decode().rstrip('=')
+
+
+def decode_keyset_cursor(cursor):
+    """
+    Returns a tuple of direction ("next" or "previous") and the values of the
+    boundary row. Anything that isn't a valid cursor means the first page.
+    """
+    if not cursor:
+        return None, None
+    try:
+        direction, values = json.loads(urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        return None, None
+    if direction not in ('next', 'previous') or not isinstance(values, list):
+        return None, None
+    return direction, values
+
+
 @with_meta
 class Paginator(Traversable):
     attrs: Attrs = Refinable()  # attrs is evaluated, but in a special way so gets no EvaluatedRefinable type
@@ -1187,6 +1638,9 @@ class Paginator(Traversable):
     count: int = Refinable()  # count is evaluated, but in a special way so gets no EvaluatedRefinable type
     slice = Refinable()
     show_always = Refinable()
+    keyset: bool = Refinable()
+    max_count: int = Refinable()
+    count_cache_timeout: int = Refinable()
 
     class Meta:
         attrs__class = EMPTY
@@ -1209,14 +1663,27 @@ class Meta:
             max(1, (paginator.count - (paginator.min_page_size - 1))) / paginator.page_size
         ),
         slice=lambda top, bottom, rows, **_: rows[bottom:top],
+        keyset=False,
+        max_count=10000,
+        count_cache_timeout=60,
     )
     def __init__(self, **kwargs):
+        """
+        :param count: callable that counts the rows. Defaults to an exact count. Use `paginator__capped_count` to count at most `max_count` rows, `paginator__estimated_count` to use the query planner estimate on PostgreSQL, or `paginator__cached_count` to cache the count for `count_cache_timeout` seconds.
+        :param max_count: the limit for `paginator__capped_count`, and the estimate below which `paginator__estimated_count` does an exact count.
+        :param count_cache_timeout: number of seconds `paginator__cached_count` caches a count.
+        :param keyset: Use keyset (also called seek) pagination. Instead of page numbers the paginator links to the next and previous page with a cursor built from the sort columns of the table plus `pk`. This skips the count query and the cost of a page doesn't grow with how deep into the table it is. Only works for `QuerySet` rows. The fields used for sorting should not be nullable. Orderings keyset pagination can't handle, like expressions or fields of many valued relations, get page numbers instead.
+        """
         super(Paginator, self).__init__(**kwargs)
 
     def on_refine_done(self):
         self.context = None
         self.page_size = None
         self.rows = None
+        self.has_next = None
+        self.has_previous = None
+        self.count_is_capped = False
+        self.count_is_estimated = False
         super(Paginator, self).on_refine_done()
 
     def on_bind(self) -> None:
@@ -1238,30 +1705,50 @@ def on_bind(self) -> None:
             **self.iommi_evaluate_parameters(),
         )
 
+        if self.keyset and self.page_size is not None and rows is not None:
+            assert isinstance(rows, QuerySet), 'Keyset pagination only works on querysets'
+            ordering = keyset_ordering(rows)
+            if ordering is not None:
+                self._bind_keyset(request=request, table=table, rows=rows, ordering=ordering)
+                return
+            # The ordering can't be used for keyset pagination, use page numbers instead
+
         if self.page_size is None:
             self.number_of_pages = 1
         else:
-            self.count = evaluate_strict(self.count, **evaluate_parameters) if rows is not None else 0
+            if table._prefetched_count is not None and self.count is paginator__count:
+                # Counted by Table.prefetch_queries or Table.aprefetch
+                self.count = table._prefetched_count
+            else:
+                self.count = evaluate_strict(self.count, **evaluate_parameters) if rows is not None else 0
             if self.count is None:
                 self.number_of_pages = 1
             else:
                 self.number_of_pages = evaluate_strict(self.number_of_pages, **evaluate_parameters)
 
         page = request.GET.get(self.iommi_path) if request else None
-        page = evaluate_strict(self.page, **evaluate_parameters) if page is None else int(page)
+        try:
+            page = int(page)
+        except (TypeError, ValueError):
+            # No page, or a cursor from keyset pagination
+            page = evaluate_strict(self.page, **evaluate_parameters)
         self.page = page
 
-        if self.page > self.number_of_pages:
+        # A capped or estimated count is not the real number of rows, so it
+        # must not stop the user from paging past it
+        count_is_exact = not (self.count_is_capped or self.count_is_estimated)
+        if self.page > self.number_of_pages and count_is_exact:
             self.page = self.number_of_pages
-        elif self.page < 1:
+        if self.page < 1:
             self.page = 1
+        last_page = max(self.number_of_pages, self.page)
 
         self.context = self.iommi_evaluate_parameters().copy()
 
-        if self.number_of_pages != 1:
+        if last_page != 1:
             bottom = (self.page - 1) * self.page_size
             top = bottom + self.page_size
-            if top + self.min_page_size - 1 >= self.count:
+            if count_is_exact and top + self.min_page_size - 1 >= self.count:
                 top = self.count
             paginated_rows = self.slice(**evaluate_parameters, bottom=bottom, top=top)
             self.rows = paginated_rows
@@ -1271,12 +1758,12 @@ def on_bind(self) -> None:
         foo = self.page
         if foo <= self.adjacent_pages:
             foo = self.adjacent_pages + 1
-        elif foo > self.number_of_pages - self.adjacent_pages:
-            foo = self.number_of_pages - self.adjacent_pages
+        elif foo > last_page - self.adjacent_pages:
+            foo = last_page - self.adjacent_pages
         page_numbers = [
             n
             for n in range(self.page - self.adjacent_pages, foo + self.adjacent_pages + 1)
-            if 0 < n <= self.number_of_pages
+            if 0 < n <= last_page
         ]
 
         get = params_of_request(request)
@@ -1288,23 +1775,80 @@ def on_bind(self) -> None:
             dict(
                 extra=get and (get.urlencode() + "&") or "",
                 page_numbers=page_numbers,
+                first=1,
                 show_first=1 not in page_numbers,
-                show_last=self.number_of_pages not in page_numbers,
+                show_last=self.number_of_pages not in page_numbers and not self.count_is_capped,
             )
         )
 
-        has_next = self.page < self.number_of_pages
-        has_previous = self.page > 1
+        self.has_next = self.page < self.number_of_pages
+        if not self.has_next and not count_is_exact:
+            top = self.page * self.page_size
+            self.has_next = evaluate_parameters['rows'][top:top + 1].exists()
+        self.has_previous = self.page > 1
         self.context.update(
             {
                 'page_size': table.page_size,
-                'has_next': has_next,
-                'has_previous': has_previous,
-                'next': self.page + 1 if has_next else None,
-                'previous': self.page - 1 if has_previous else None,
+                'has_next': self.has_next,
+                'has_previous': self.has_previous,
+                'next': self.page + 1 if self.has_next else None,
+                'previous': self.page - 1 if self.has_previous else None,
                 'page': self.page,
                 'pages': self.number_of_pages,
                 'hits': self.count,
+                'hits_capped': self.count_is_capped,
+                'hits_estimated': self.count_is_estimated,
+                'paginator': self,
+            }
+        )
+
+    def _bind_keyset(self, *, request, table, rows, ordering):
+        direction, cursor_values = decode_keyset_cursor(request.GET.get(self.iommi_path) if request else None)
+        if cursor_values is not None and len(cursor_values) != len(ordering):
+            direction, cursor_values = None, None
+
+        if direction == 'previous':
+            reversed_ordering = [x[1:] if x.startswith('-') else '-' + x for x in ordering]
+            page_rows = list(rows.filter(keyset_q(ordering, cursor_values, reverse=True)).order_by(*reversed_ordering)[:self.page_size + 1])
+            has_previous = len(page_rows) > self.page_size
+            has_next = True
+            page_rows = page_rows[:self.page_size][::-1]
+        else:
+            if direction == 'next':
+                rows = rows.filter(keyset_q(ordering, cursor_values))
+            page_rows = list(rows.order_by(*ordering)[:self.page_size + 1])
+            has_previous = direction == 'next'
+            has_next = len(page_rows) > self.page_size
+            page_rows = page_rows[:self.page_size]
+
+        self.rows = page_rows
+        self.page = None
+        self.number_of_pages = None
+        self.count = 0 if not page_rows and direction is None else None
+        self.has_next = has_next and bool(page_rows)
+        self.has_previous = has_previous and bool(page_rows)
+
+        get = params_of_request(request)
+        if self.iommi_path in get:
+            del get[self.iommi_path]
+
+        self.context = self.iommi_evaluate_parameters().copy()
+        self.context.update(
+            {
+                'extra': get and (get.urlencode() + "&") or "",
+                'page_numbers': [],
+                # The first page has no cursor
+                'first': None,
+                'show_first': self.has_previous,
+                'show_last': False,
+                'page_size': table.page_size,
+                'has_next': self.has_next,
+                'has_previous': self.has_previous,
+                'next': encode_keyset_cursor('next', [keyset_value(page_rows[-1], x) for x in ordering]) if self.has_next else None,
+                'previous': encode_keyset_cursor('previous', [keyset_value(page_rows[0], x) for x in ordering]) if self.has_previous else None,
+                'page': None,
+                'pages': None,
+                'hits': None,
                 'paginator': self,
             }
         )
@@ -1314,7 +1858,9 @@ def own_evaluate_parameters(self):
 
     def is_paginated(self):
         assert self._is_bound, NOT_BOUND_MESSAGE
-        return self.number_of_pages > 1
+        if self.number_of_pages is None:
+            return self.has_next or self.has_previous
+        return self.number_of_pages > 1 or bool(self.has_next or self.has_previous)
 
     def __html__(self):
         assert self._is_bound, NOT_BOUND_MESSAGE
@@ -1322,7 +1868,7 @@ def __html__(self):
             if self.page_size is None:
                 return ''
 
-            if self.number_of_pages <= 1:
+            if not self.is_paginated():
                 return ''
 
         return render_template(
@@ -1339,6 +1885,18 @@ class TableAutoConfig(AutoConfig):
     rows = Refinable()
 
 
+DEFAULT_CSV_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    """
+    File-like object that returns what is written to it, used to get lines out of `csv.writer`.
+    """
+
+    def write(self, value):
+        return value
+
+
 def endpoint__csv(table, **_):
     columns = [c for c in values(table.columns) if c.extra_evaluated.get('report_name')]
     csv_safe_column_indexes = {i for i, c in enumerate(values(table.columns)) if 'csv_whitelist' in c.extra}
@@ -1347,6 +1905,7 @@ def endpoint__csv(table, **_):
         'report_name' in table.extra_evaluated
     ), 'To get CSV output you must specify extra_evaluated__report_name on the table'
     filename = table.extra_evaluated.report_name + '.csv'
+    chunk_size = table.extra_evaluated.get('report_chunk_size', DEFAULT_CSV_CHUNK_SIZE)
 
     header = [c.extra_evaluated.report_name for c in columns]
 
@@ -1370,25 +1929,26 @@ def safe_csv_value(value):
             return value
 
     def cell_value(cells, bound_column):
-        value = Cell(cells, bound_column).refine_done(parent=cells).value
-        return bound_column.extra_evaluated.get('report_value', value)
+        if 'report_value' in bound_column.extra_evaluated:
+            return bound_column.extra_evaluated.report_value
+        return table.compiled_cell(bound_column).value(cells)
 
     def rows():
-        for cells in table.cells_for_rows(paginate=False):
+        for cells in table.cells_for_rows(paginate=False, chunk_size=chunk_size):
             yield [cell_value(cells, bound_column) for bound_column in columns]
 
-    def write_csv_row(writer, row):
+    def csv_row(writer, row):
         row_strings = [smart_text2(value) for value in row]
         safe_row = [v if i in csv_safe_column_indexes else safe_csv_value(v) for i, v in enumerate(row_strings)]
-        writer.writerow(safe_row)
+        return writer.writerow(safe_row)
 
-    f = StringIO()
-    writer = csv.writer(f)
-    writer.writerow(header)
-    for row in rows():
-        write_csv_row(writer, row)
+    def lines():
+        writer = csv.writer(_Echo())
+        yield writer.writerow(header)
+        for row in rows():
+            yield csv_row(writer, row)
 
-    response = FileResponse(f.getvalue(), 'text/csv')
+    response = StreamingHttpResponse(lines(), content_type='text/csv')
 
     # RFC 2183, RFC 2184
     response['Content-Disposition'] = smart_str(
@@ -1406,6 +1966,162 @@ def __html__(self):
         return mark_safe('\n'.join([cells.__html__() for cells in self.table.cells_for_rows()]))
 
 
+_row_parameters = {'row', 'cells', 'bound_cell'}
+
+
+def _reads_row(f):
+    """
+    Is the callable `f` passed the row when it's evaluated for a row or cell?
+    """
+    if not callable(f):
+        return False
+    signature = get_signature(f)
+    if signature is None:
+        return True
+    required, optional, _ = signature.split('|')
+    return not _row_parameters.isdisjoint(f'{required},{optional}'.split(','))
+
+
+def _attrs_read_row(attrs):
+    if not attrs:
+        return False
+    for value in values(attrs):
+        if isinstance(value, dict):
+            if any(_reads_row(x) for x in values(value)):
+                return True
+        elif _reads_row(value) and value is not default_row__attrs__data_pk:
+            return True
+    return False
+
+
+def _row_config_reads_row(row):
+    return bool(
+        row.template
+        or _reads_row(row.tag)
+        or _attrs_read_row(row.attrs)
+        or any(_reads_row(x) for x in values(row.extra_evaluated or {}))
+    )
+
+
+def _column_projection(column):
+    """
+    The attr paths the cells of a column read from the row, or `None` if
+    they need the whole row.
+    """
+    if column.projection is False:
+        return None
+    paths = [column.attr] if column.attr else []
+    if column.projection is not None:
+        return paths + list(column.projection)
+
+    config = column.table.compiled_cell(column).config
+    if config.template:
+        return None
+    if config.value is not default_cell__value and _reads_row(config.value):
+        return None
+    if config.format is not default_cell_formatter and _reads_row(config.format):
+        return None
+    if any(_reads_row(config.get(k)) for k in ('url', 'url_title', 'tag')):
+        return None
+    if _attrs_read_row(config.get('attrs')) or _attrs_read_row((config.get('contents') or {}).get('attrs')):
+        return None
+    return paths
+
+
+def _related_paths(model, attr):
+    """
+    The relations the row is traversed through to read a dotted `attr`, as a
+    path for `select_related` and one for `prefetch_related`. The path for
+    `select_related` follows the foreign keys and one to one fields, and a
+    many valued relation at the end of `attr` is prefetched.
+    """
+    segments = attr.split(LOOKUP_SEP)
+    if len(segments) < 2:
+        return None, None
+
+    select_segments = []
+    for i, segment in enumerate(segments):
+        try:
+            field = get_field(model, segment)
+        except FieldDoesNotExist:
+            # attr uses the accessor name of reverse relations, like `foo_set`
+            field = {x.get_accessor_name(): x for x in model._meta.related_objects}.get(segment)
+        if field is None or not field.is_relation or field.related_model is None:
+            # A property, a method or a plain field
+            break
+        if field.many_to_many or field.one_to_many:
+            if i == len(segments) - 1:
+                return LOOKUP_SEP.join(select_segments) or None, attr
+            break
+        select_segments.append(segment)
+        model = field.related_model
+
+    return LOOKUP_SEP.join(select_segments) or None, None
+
+
+def _projection_field_names(model, paths):
+    """
+    The field names to pass to `QuerySet.only()` to be able to read `paths`
+    from the rows, or `None` if that can't be done.
+    """
+    field_names = {model._meta.pk.name}
+    for path in paths:
+        name = path.split(LOOKUP_SEP)[0]
+        if name == 'pk':
+            continue
+        try:
+            field = get_field(model, name)
+        except FieldDoesNotExist:
+            # A property or method, we can't know what it reads
+            return None
+        if field.concrete:
+            # For a foreign key the related object is loaded separately, or in full by select_related
+            field_names.add(field.name)
+        elif not (field.is_relation and (field.many_to_many or field.one_to_many or field.one_to_one)):
+            # E.g. GenericForeignKey
+            return None
+        # Reverse relations and many to many fields only need the pk
+    return sorted(field_names)
+
+
+async def _aqueryset_call(queryset, name, **kwargs):
+    # The async QuerySet methods (acount, aaggregate, ...) are new in Django 4.1
+    if django.VERSION >= (4, 1):
+        return await getattr(queryset, f'a{name}')(**kwargs)
+    from asgiref.sync import sync_to_async
+    return await sync_to_async(getattr(queryset, name))(**kwargs)
+
+
+async def _afill_result_cache(queryset):
+    if django.VERSION >= (4, 1):
+        async for _ in queryset:
+            pass
+    else:
+        from asgiref.sync import sync_to_async
+        await sync_to_async(len)(queryset)
+
+
+async def _achunks(queryset, chunk_size):
+    if django.VERSION >= (4, 1):
+        chunk = []
+        async for row in queryset.aiterator(chunk_size=chunk_size):
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+        return
+
+    from asgiref.sync import sync_to_async
+    rows = queryset.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = await sync_to_async(lambda: list(islice(rows, chunk_size)))()
+        if not chunk:
+            return
+        yield chunk
+
+
 @declarative(Column, '_columns_dict', add_init_kwargs=False)
 @with_meta
 class Table(Part, Tag):
@@ -1440,11 +2156,13 @@ class Meta:
     row: RowConfig = EvaluatedRefinable()
     cell: CellConfig = EvaluatedRefinable()
     header = Refinable()
+    footer: FooterConfig = Refinable()
     model: Type[Model] = Refinable()  # model is evaluated, but in a special way so gets no EvaluatedRefinable type
     rows = Refinable()  # rows is evaluated, but in a special way so gets no EvaluatedRefinable type
     actions: Dict[str, Action] = RefinableMembers()
     parts: Namespace = RefinableMembers()
     bulk: Optional[Form] = EvaluatedRefinable()
+    bulk_per_object: bool = EvaluatedRefinable()
     bulk_container: Fragment = Refinable()
     superheader: Namespace = Refinable()
     paginator: Paginator = Refinable()
@@ -1454,6 +2172,7 @@ class Meta:
     tbody: Fragment = EvaluatedRefinable()
     container: Fragment = EvaluatedRefinable()
     outer: Fragment = EvaluatedRefinable()
+    projection: bool = EvaluatedRefinable()
 
     member_class = Refinable()
     form_class: Type[Form] = Refinable()
@@ -1519,11 +2238,17 @@ def preprocess_row(table, row, **_):
     @staticmethod
     @refinable
     def post_bulk_edit(table, queryset, updates, **_):
+        """
+        Called after a bulk edit. `pks` is a lazy queryset of the pks of the
+        edited rows. It is evaluated after the update, so if the update changes
+        which rows the table filter matches, so does `pks`.
+        """
         pass
 
     @with_defaults(
         bulk_filter={},
         bulk_exclude={},
+        bulk_per_object=False,
         sortable=True,
         default_sort_order=None,
         template='iommi/table/table.html',
@@ -1535,10 +2260,12 @@ def post_bulk_edit(table, queryset, updates, **_):
         container__call_target=Fragment,
         outer__call_target=Fragment,
         row__tag='tr',
-        row__attrs={'data-pk': lambda row, **_: getattr(row, 'pk', None)},
+        row__attrs={'data-pk': default_row__attrs__data_pk},
         row__template=None,
         cell__tag='td',
         header__template='iommi/table/table_header_rows.html',
+        footer__template='iommi/table/table_footer_rows.html',
+        footer__per_page=False,
         h_tag__call_target=Header,
         actions_template='iommi/form/actions.html',
         actions_below=False,
@@ -1554,6 +2281,7 @@ def post_bulk_edit(table, queryset, updates, **_):
         # style
         query__form__actions__submit__call_target=Action.button,
         title=MISSING,
+        projection=False,
     )
     def __init__(
         self,
@@ -1567,7 +2295,10 @@ def __init__(
         :param row__template: name of template (or `Template` object) to use for rendering the row
         :param bulk_filter: filters to apply to the `QuerySet` before performing the bulk operation
         :param bulk_exclude: exclude filters to apply to the `QuerySet` before performing the bulk operation
+        :param bulk_per_object: set this to `True` to bulk edit many to many fields by calling `set()` and `save()` on each object, like earlier versions of iommi did. By default the rows of the through table are replaced directly, so `save()` isn't called and `m2m_changed` isn't sent.
         :param sortable: set this to `False` to turn off sorting for all columns
+        :param footer__per_page: set this to `True` to also show the aggregates of the rows on the current page, above the aggregates of all rows.
+        :param projection: set this to `True` to only fetch the database columns the table renders, with `QuerySet.only()`. This is skipped if a column or the row configuration needs the whole row, see `Column.projection`. Anything else that reads the rows, like `preprocess_row`, `preprocess_rows`, a custom `template` or code that uses `table.rows`, must only read the fetched fields, since every deferred field it reads is loaded with a query of its own.
         """
         super(Table, self).__init__(**kwargs)
 
@@ -1614,12 +2345,21 @@ def on_refine_done(self):
 
         self.initial_rows = self.rows
         self.header = HeaderConfig(_name='header', **self.header).refine_done(parent=self)
+        self.footer = FooterConfig(_name='footer', **self.footer).refine_done(parent=self)
         self.row = RowConfig(**self.row).refine_done(parent=self)
 
         # In bind initial_rows will be used to set these 3 (in that order)
         self.sorted_rows = None
         self.sorted_and_filtered_rows = None
         self.visible_rows = None
+        # Set by prefetch_queries or aprefetch, for the paginator
+        self._prefetched_count = None
+        # Set by _apply_projection
+        self._projection = None
+        # Set by get_aggregates, or by aprefetch
+        self._aggregates = None
+        # Set by _add_select_and_prefetch_related, the relations it follows for dotted attrs, with the columns that need them
+        self._automatic_related = None
 
         refine_done_members(self, name='actions', members_from_namespace=self.actions, cls=self.get_meta().action_class, members_cls=Actions)
         refine_done_members(self, name='columns', members_from_namespace=self.columns, members_from_declared=self.get_declared('_columns_dict'), members_from_auto=columns_from_auto, cls=self.get_meta().member_class, extra_member_defaults=extra_column_defaults,)
@@ -1648,7 +2388,8 @@ def add_hidden_all_pks_field(declared_bulk_fields):
             )
 
         form_class = self.get_meta().form_class
-        if self.model:
+        # Tables without a model can be filtered in memory, but only get a query if a column asks for a filter
+        if self.model or any(getattr(column.filter, 'include', None) for column in values(self.iommi_namespace.columns)):
             # Query
             filters = Struct()
 
@@ -1694,6 +2435,7 @@ def add_hidden_all_pks_field(declared_bulk_fields):
             declared_filters = self.query.iommi_namespace.filters
             self.query = self.query.refine(Prio.table_defaults, filters=declared_filters)
 
+        if self.model:
             # Bulk
             field_class = self.get_meta().form_class.get_meta().member_class
 
@@ -1782,6 +2524,7 @@ def add_hidden_all_pks_field(declared_bulk_fields):
         cell__tag=None,
         row__tag='div',
         header__template=None,
+        footer__template=None,
     )
     def div(cls, **kwargs):
         return cls(**kwargs)
@@ -1803,6 +2546,7 @@ def on_bind(self) -> None:
         self.container = self.container(_name='container').bind(parent=self)
         self.outer = self.outer(_name='outer').bind(parent=self)
         self.header = self.header.bind(parent=self)
+        self.footer = self.footer.bind(parent=self)
 
         # needs to be done first because _bind_headers depends on it
         evaluate_member(self, 'sortable', **self.iommi_evaluate_parameters())
@@ -1815,23 +2559,65 @@ def on_bind(self) -> None:
             self.initial_rows = self.initial_rows.all()
             self.rows = self.initial_rows
 
-        self._prepare_sorting()
+        self._compiled_cell_by_name = {}
 
+        self._prepare_sorting()
         self._bind_query()
-        self._bind_bulk_form()
-        self._bind_headers()
 
+        bind_steps = [
+            self._apply_query,
+            self._bind_bulk_form,
+            self._bind_headers,
+            self._remove_excluded_members,
+            self._add_select_and_prefetch_related,
+            self._apply_projection,
+        ]
+        partial_bind_path = get_partial_bind_path(self)
+        if partial_bind_path is None or partial_bind_path[0] == 'endpoints':
+            # The endpoints of the table itself (tbody, csv) need all of it
+            self._deferred_bind_steps = []
+        else:
+            # When dispatching to something inside the table only do the bind
+            # steps needed to reach it. The rest is done by _finish_bind if the
+            # dispatch doesn't produce the response and the table is rendered
+            # after all.
+            needed_steps = {
+                'query': [self._remove_excluded_members],
+                'bulk': [self._apply_query, self._bind_bulk_form, self._remove_excluded_members],
+            }.get(partial_bind_path[0], [self._apply_query, self._remove_excluded_members])
+            # The members of excluded columns are removed again at the end, from the parts bound by then
+            self._deferred_bind_steps = [x for x in bind_steps if x not in needed_steps] + [self._remove_excluded_members]
+            bind_steps = needed_steps
+            self.iommi_root()._iommi_deferred_binds.append(self._finish_bind)
+
+        for bind_step in bind_steps:
+            bind_step()
+
+        self.bulk_container = self.bulk_container.bind(parent=self)
+
+    def _finish_bind(self):
+        deferred_bind_steps, self._deferred_bind_steps = self._deferred_bind_steps, []
+        for bind_step in deferred_bind_steps:
+            bind_step()
+
+    def _remove_excluded_members(self):
         # If the column is not included, the down stream query filters and bulk fields should also be gone
         for name, column in items(self.iommi_namespace.columns):
             if name not in keys(self.columns):
                 if self.query and name in self.query.filters:
                     del self.query.filters[name]
-                    if self.query.form and name in self.query.form.fields:
-                        del self.query.form.fields[name]
-                if self.bulk and name in self.bulk.fields:
+                    if self.query.form:
+                        try:
+                            # Don't use `in`, the fields might not be bound yet
+                            del self.query.form.fields[name]
+                        except KeyError:
+                            pass
+                if self.bulk and self.bulk._is_bound and name in self.bulk.fields:
                     del self.bulk.fields[name]
 
-        if isinstance(self.sorted_and_filtered_rows, QuerySet):
+    def _add_select_and_prefetch_related(self):
+        rows = self.sorted_and_filtered_rows
+        if isinstance(rows, QuerySet):
             prefetch = [
                 x.attr
                 for x in values(self.columns)
@@ -1842,6 +2628,35 @@ def on_bind(self) -> None:
                 for x in values(self.columns)
                 if x.data_retrieval_method == DataRetrievalMethods.select and x.attr
             ]
+
+            # Columns with an attr like `album__artist__name` would otherwise do a query per row for each relation
+            automatic = Struct(select_related={}, prefetch_related={})
+            for column in values(self.columns):
+                if column.data_retrieval_method != DataRetrievalMethods.attribute_access or not isinstance(column.attr, str):
+                    continue
+                select_path, prefetch_path = _related_paths(rows.model, column.attr)
+                if select_path and select_path not in select:
+                    automatic.select_related.setdefault(select_path, []).append(column._name)
+                if prefetch_path and prefetch_path not in prefetch:
+                    automatic.prefetch_related.setdefault(prefetch_path, []).append(column._name)
+
+            if rows.query.select_related is True:
+                # Already following all foreign keys
+                automatic.select_related = {}
+            automatic.prefetch_related = {
+                k: v for k, v in items(automatic.prefetch_related) if k not in rows._prefetch_related_lookups
+            }
+            prefetch += list(automatic.prefetch_related)
+            select += list(automatic.select_related)
+            self._automatic_related = automatic
+            if (automatic.select_related or automatic.prefetch_related) and log.isEnabledFor(logging.DEBUG):
+                log.debug(
+                    'Table %s added select_related %s and prefetch_related %s for the attr of columns',
+                    self.iommi_path,
+                    automatic.select_related,
+                    automatic.prefetch_related,
+                )
+
             if prefetch:
                 self.sorted_and_filtered_rows = self.sorted_and_filtered_rows.prefetch_related(*prefetch)
                 self.rows = self.sorted_and_filtered_rows
@@ -1849,7 +2664,53 @@ def on_bind(self) -> None:
                 self.sorted_and_filtered_rows = self.sorted_and_filtered_rows.select_related(*select)
                 self.rows = self.sorted_and_filtered_rows
 
-        self.bulk_container = self.bulk_container.bind(parent=self)
+    def _apply_projection(self):
+        rows = self.sorted_and_filtered_rows
+        if not self.projection or not isinstance(rows, QuerySet):
+            return
+        if (
+            rows._fields is not None
+            or rows._iterable_class is not ModelIterable
+            or rows.query.combinator
+            or rows.query.deferred_loading != (frozenset(), True)
+            or rows.query.select_related is True
+        ):
+            # values() querysets, unions and querysets that already defer fields are left as they are
+            return
+
+        paths = set()
+        for column in values(self.columns):
+            column_paths = _column_projection(column)
+            if column_paths is None:
+                return
+            paths.update(column_paths)
+
+        if _row_config_reads_row(self.row):
+            return
+
+        # Relations that are followed with select_related or prefetch_related must be loaded
+        paths.update(rows.query.select_related or {})
+        paths.update(x if isinstance(x, str) else x.prefetch_through for x in rows._prefetch_related_lookups)
+
+        field_names = _projection_field_names(rows.model, paths)
+        if field_names is None:
+            return
+
+        self._projection = field_names
+        self.sorted_and_filtered_rows = rows.only(*field_names)
+        self.rows = self.sorted_and_filtered_rows
+
+    def compiled_cell(self, column):
+        """
+        Return the `CompiledCell` for a column. The cell configuration is
+        merged and classified the first time a cell is rendered for the
+        column, and reused for every following row.
+        """
+        compiled = self._compiled_cell_by_name.get(column._name)
+        if compiled is None or compiled.column is not column:
+            compiled = CompiledCell(column)
+            self._compiled_cell_by_name[column._name] = compiled
+        return compiled
 
     def get_visible_rows(self):
         self.visible_rows = self.parts.page.rows
@@ -1857,24 +2718,28 @@ def get_visible_rows(self):
 
     def _bind_query(self):
         """
-        Bind the query form and apply it.
+        Bind the query form.
         """
         self.sorted_and_filtered_rows = self.sorted_rows
         self.rows = self.sorted_and_filtered_rows
 
-        if self.query is None:
-            return
-
-        self.query = self.query.bind(parent=self)
-        self._bound_members.query = self.query
+        if self.query is not None:
+            self.query = self.query.bind(parent=self)
+            self._bound_members.query = self.query
 
+    def _apply_query(self):
+        """
+        Filter the rows with the query, and sort them if they are a list.
+        """
         if self.query is not None:
             self.sorted_and_filtered_rows = self.query.filter(
                 query=self.query, rows=self.sorted_rows, **self.iommi_evaluate_parameters()
             )
             self.rows = self.sorted_and_filtered_rows
-        else:
-            self.sorted_and_filtered_rows = self.sorted_rows
+
+        if self._list_ordering is not None:
+            order_field, is_desc = self._list_ordering
+            self.sorted_and_filtered_rows = ordered_by_on_list(self.sorted_and_filtered_rows, order_field, is_desc)
             self.rows = self.sorted_and_filtered_rows
 
     def _bind_bulk_form(self):
@@ -1888,6 +2753,69 @@ def _bind_bulk_form(self):
             else:
                 self.bulk = None
 
+    def _aggregated_columns(self):
+        return [x for x in values(self.columns) if x.aggregate]
+
+    def get_aggregates(self):
+        """
+        Return a dict from column name to the aggregate of the column, for
+        all the sorted and filtered rows. For a `QuerySet` they are all
+        done in one `aggregate()` query.
+        """
+        assert self._is_bound, NOT_BOUND_MESSAGE
+        if self._aggregates is None:
+            columns = self._aggregated_columns()
+            rows = self.sorted_and_filtered_rows
+            if not columns:
+                self._aggregates = {}
+            elif isinstance(rows, QuerySet):
+                self._aggregates = _aggregates_from_result(rows.aggregate(**_aggregate_expressions(columns)), columns)
+            else:
+                self._aggregates = _aggregate_rows(rows, columns)
+        return self._aggregates
+
+    def get_page_aggregates(self):
+        """
+        Return a dict from column name to the aggregate of the column, for
+        the rows on the current page. They are computed from the rows that
+        are already fetched to render the page.
+        """
+        assert self._is_bound, NOT_BOUND_MESSAGE
+        return _aggregate_rows(self.get_visible_rows(), self._aggregated_columns())
+
+    # property for jinja2 compatibility
+    @property
+    def footer_rows(self):
+        """
+        The rows of the footer: the aggregates of the current page if
+        `footer__per_page` is set, and the aggregates of all rows.
+        """
+        assert self._is_bound, NOT_BOUND_MESSAGE
+        if not self._aggregated_columns():
+            return []
+
+        columns = [x for x in values(self.columns) if x.render_column]
+
+        def footer_row(name, aggregates):
+            return Struct(
+                name=name,
+                cells=[
+                    Struct(
+                        column=column,
+                        value=default_cell_formatter(table=self, column=column, row=None, value=aggregates[column._name])
+                        if column.aggregate
+                        else '',
+                    )
+                    for column in columns
+                ],
+            )
+
+        result = []
+        if self.footer.per_page:
+            result.append(footer_row('page', self.get_page_aggregates()))
+        result.append(footer_row('total', self.get_aggregates()))
+        return result
+
     # property for jinja2 compatibility
     @property
     def render_actions(self):
@@ -1905,48 +2833,62 @@ def render_actions(self):
         )
 
     def _prepare_auto_rowspan(self):
-        auto_rowspan_columns = [column for column in values(self.columns) if column.auto_rowspan]
-        if auto_rowspan_columns:
-            self.visible_rows = list(self.get_visible_rows())
-            no_value_set = object()
-            for column in auto_rowspan_columns:
-                if column.cell.attrs.get('rowspan', no_value_set) is not no_value_set:
-                    continue
-
-                rowspan_by_row = (
-                    {}
-                )  # cells for rows in this dict are displayed, if they're not in here, they get style="display: none"
-                prev_value = no_value_set
-                prev_row = no_value_set
-                for cells in self.cells_for_rows():
-                    value = Cell(cells, column).refine_done(parent=self).value
-                    if prev_value != value:
-                        rowspan_by_row[id(cells.row)] = 1
-                        prev_value = value
-                        prev_row = cells.row
-                    else:
-                        rowspan_by_row[id(prev_row)] += 1
-
-                def rowspan(row, **_):
-                    return rowspan_by_row[id(row)] if id(row) in rowspan_by_row else None
-
-                def auto_rowspan_style(row, **_):
-                    return 'none' if id(row) not in rowspan_by_row else ''
+        no_value_set = object()
+        auto_rowspan_columns = [
+            column
+            for column in values(self.columns)
+            if column.auto_rowspan and column.cell.attrs.get('rowspan', no_value_set) is no_value_set
+        ]
+        if not auto_rowspan_columns:
+            return
 
-                column.cell.attrs['rowspan'] = rowspan
-                if 'style' not in column.cell.attrs:
-                    column.cell.attrs['style'] = {}
-                column.cell.attrs['style']['display'] = auto_rowspan_style
+        self.visible_rows = list(self.get_visible_rows())
+
+        # One pass over the rows for all the columns, only evaluating the cell values.
+        # rowspans[row_index] is the number of rows the cell spans, or 0 if the cell
+        # is hidden because the cell of a row above spans over it.
+        compiled_cells = [self.compiled_cell(column) for column in auto_rowspan_columns]
+        rowspans_by_column = [array('L') for _ in auto_rowspan_columns]
+        prev_values = [no_value_set] * len(auto_rowspan_columns)
+        prev_indexes = [0] * len(auto_rowspan_columns)
+        for cells in self.cells_for_rows():
+            for i, compiled_cell in enumerate(compiled_cells):
+                value = compiled_cell.value(cells)
+                rowspans = rowspans_by_column[i]
+                if prev_values[i] != value:
+                    prev_values[i] = value
+                    prev_indexes[i] = len(rowspans)
+                    rowspans.append(1)
+                else:
+                    rowspans[prev_indexes[i]] += 1
+                    rowspans.append(0)
+
+        for column, rowspans in zip(auto_rowspan_columns, rowspans_by_column):
+            def rowspan(cells, rowspans=rowspans, **_):
+                if 0 <= cells.row_index < len(rowspans):
+                    return rowspans[cells.row_index] or None
+                return None
+
+            def auto_rowspan_style(cells, rowspans=rowspans, **_):
+                if 0 <= cells.row_index < len(rowspans) and rowspans[cells.row_index]:
+                    return ''
+                return 'none'
+
+            column.cell.attrs['rowspan'] = rowspan
+            if 'style' not in column.cell.attrs:
+                column.cell.attrs['style'] = {}
+            column.cell.attrs['style']['display'] = auto_rowspan_style
+            # The cell attrs are now dynamic, so the column needs to be compiled again
+            self._compiled_cell_by_name.pop(column._name, None)
 
     def _prepare_sorting(self):
         """Sort all the rows.
 
         self.sorted_rows = sorted(self.initial_rows)
         """
-        # TODO: Sorting less values is faster then sorting more values, so we should
-        # filter first and then sort.
         self.sorted_rows = self.initial_rows
         self.rows = self.sorted_rows
+        self._list_ordering = None
         request = self.get_request()
         if request is None:
             return
@@ -1964,8 +2906,13 @@ def _prepare_sorting(self):
 
             if sort_column.sortable:
                 if isinstance(self.initial_rows, list):
-                    self.sorted_rows = ordered_by_on_list(self.initial_rows, order_args[0], is_desc)
-                    self.rows = self.sorted_rows
+                    if self.query is not None:
+                        # Sorting less values is faster than sorting more values, so
+                        # _bind_query sorts the list after it has been filtered
+                        self._list_ordering = (order_args[0], is_desc)
+                    else:
+                        self.sorted_rows = ordered_by_on_list(self.initial_rows, order_args[0], is_desc)
+                        self.rows = self.sorted_rows
                 else:
                     order_args = ["%s%s" % (is_desc and '-' or '', x) for x in order_args]
                     self.sorted_rows = self.initial_rows.order_by(*order_args)
@@ -2021,18 +2968,126 @@ def _bind_headers(self):
     def own_evaluate_parameters(self):
         return dict(table=self)
 
-    def cells_for_rows(self, paginate=True):
-        """Yield a Cells instance for each visible row on the screen."""
+    def cells_for_rows(self, paginate=True, chunk_size=None):
+        """Yield a Cells instance for each visible row on the screen.
+
+        If `chunk_size` is given a `QuerySet` is streamed from the database in
+        chunks of that size instead of being loaded into the result cache.
+        """
         assert self._is_bound, NOT_BOUND_MESSAGE
         if paginate:
             rows = self.get_visible_rows()
         else:
             rows = self.sorted_and_filtered_rows
         preprocessed_rows = self.preprocess_rows(rows=rows, **self.iommi_evaluate_parameters())
+        if chunk_size is not None and isinstance(preprocessed_rows, QuerySet):
+            preprocessed_rows = preprocessed_rows.iterator(chunk_size=chunk_size)
         for i, row in enumerate(preprocessed_rows):
-            row = self.preprocess_row(table=self, row=row)
-            assert row is not None, 'preprocess_row must return the row'
-            yield self.cells_class(row=row, row_index=i, **self.row.as_dict()).bind(parent=self)
+            yield self._cells_for_row(row, i)
+
+    def _cells_for_row(self, row, row_index):
+        row = self.preprocess_row(table=self, row=row)
+        assert row is not None, 'preprocess_row must return the row'
+        return self.cells_class(row=row, row_index=row_index, **self.row.as_dict()).bind(parent=self)
+
+    async def acells_for_rows(self, paginate=True, chunk_size=None):
+        """Async version of `cells_for_rows`.
+
+        A `QuerySet` is fetched with the async ORM: in chunks of `chunk_size`
+        if it is given, otherwise into its result cache. `preprocess_rows`,
+        `preprocess_row` and binding the cells run in a worker thread, so they
+        can use the database.
+        """
+        from asgiref.sync import sync_to_async
+        assert self._is_bound, NOT_BOUND_MESSAGE
+
+        def preprocessed_rows():
+            if paginate:
+                rows = self.get_visible_rows()
+            else:
+                rows = self.sorted_and_filtered_rows
+            rows = self.preprocess_rows(rows=rows, **self.iommi_evaluate_parameters())
+            if not isinstance(rows, QuerySet):
+                rows = list(rows)
+            return rows
+
+        def cells_for_chunk(chunk, start):
+            return [self._cells_for_row(row, i) for i, row in enumerate(chunk, start=start)]
+
+        rows = await sync_to_async(preprocessed_rows)()
+        if isinstance(rows, QuerySet):
+            if chunk_size is None:
+                await _afill_result_cache(rows)
+            else:
+                i = 0
+                async for chunk in _achunks(rows, chunk_size):
+                    for cells in await sync_to_async(cells_for_chunk)(chunk, i):
+                        yield cells
+                    i += len(chunk)
+                return
+
+        for cells in await sync_to_async(cells_for_chunk)(rows, 0):
+            yield cells
+
+    def prefetch_queries(self):
+        """
+        Count the rows, compute the aggregates for the footer and fetch the
+        rows of the current page.
+        """
+        assert self._is_bound, NOT_BOUND_MESSAGE
+        rows = self.sorted_and_filtered_rows
+        if isinstance(rows, QuerySet):
+            paginator = self.iommi_namespace.parts.get('page')
+            if (
+                paginator is not None
+                and self.page_size is not None
+                and not paginator.keyset
+                and paginator.count is paginator__count
+                and self._prefetched_count is None
+            ):
+                self._prefetched_count = yield rows.count
+
+            columns = self._aggregated_columns()
+            if columns and self._aggregates is None:
+                result = yield partial(rows.aggregate, **_aggregate_expressions(columns))
+                self._aggregates = _aggregates_from_result(result, columns)
+
+        # Binding the paginator slices the rows. Evaluating the slice fills its
+        # result cache, so rendering the table reuses the fetched rows.
+        page_rows = self.get_visible_rows()
+        if isinstance(page_rows, QuerySet):
+            yield partial(len, page_rows)
+        self.get_aggregates()
+
+    async def aprefetch(self):
+        """
+        Count the rows, fetch the rows of the current page and compute the
+        aggregates for the footer with the async ORM. Only the default
+        `paginator__count` is done async, other count strategies run in a
+        worker thread.
+        """
+        from asgiref.sync import sync_to_async
+        assert self._is_bound, NOT_BOUND_MESSAGE
+        rows = self.sorted_and_filtered_rows
+        if not isinstance(rows, QuerySet):
+            return
+
+        columns = self._aggregated_columns()
+        if columns and self._aggregates is None:
+            result = await _aqueryset_call(rows, 'aggregate', **_aggregate_expressions(columns))
+            self._aggregates = _aggregates_from_result(result, columns)
+
+        paginator = self.iommi_namespace.parts.get('page')
+        if paginator is None:
+            return
+        if self.page_size is not None and not paginator.keyset and paginator.count is paginator__count:
+            self._prefetched_count = await _aqueryset_call(rows, 'count')
+
+        # Binding the paginator slices the rows. Iterating the slice fills its
+        # result cache, so rendering the table reuses the fetched rows.
+        page_rows = await sync_to_async(self.get_visible_rows)()
+        if isinstance(page_rows, QuerySet):
+            await _afill_result_cache(page_rows)
 
     @classmethod
     @dispatch()
@@ -2072,11 +3127,15 @@ def selection(self, prefix='pk_'):
         Unlike bulk_queryset neither bulk_filter nor bulk_exclude are applied.
         """
         identifiers = self._selection_identifiers(prefix=prefix)
+        rows = self.sorted_and_filtered_rows
+        if self._projection is not None:
+            # Post handlers get full rows
+            rows = rows.defer(None)
         if identifiers == 'all':
-            return self.sorted_and_filtered_rows
+            return rows
         else:
-            if isinstance(self.sorted_and_filtered_rows, QuerySet):
-                return self.sorted_and_filtered_rows.filter(pk__in=identifiers)
+            if isinstance(rows, QuerySet):
+                return rows.filter(pk__in=identifiers)
             else:
                 identifiers = frozenset([int(i) for i in identifiers])
                 return [row for ndx, row in enumerate(self.get_visible_rows()) if ndx in identifiers]
@@ -2099,6 +3158,7 @@ def __html__(self, *, template=None, render=None):
 
         request = self.get_request()
 
+        self._finish_bind()
         self._prepare_auto_rowspan()
 
         assert self.get_visible_rows() is not None
@@ -2113,3 +3173,6 @@ def __html__(self, *, template=None, render=None):
 
     def as_view(self):
         return build_as_view_wrapper(self)
+
+    def as_async_view(self):
+        return build_as_async_view_wrapper(self)
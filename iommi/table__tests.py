@@ -1,3 +1,4 @@
+import inspect
 import json
 from collections import defaultdict
 from datetime import (
@@ -8,6 +9,8 @@
 
 import django
 import pytest
+from django.core.cache import cache
+from django.db import connection
 from django.db.models import (
     F,
     QuerySet,
@@ -42,6 +45,7 @@
     Form,
 )
 from iommi.from_model import register_search_fields
+from iommi.list_query import IndexedRows
 from iommi.query import (
     Filter,
     Query,
@@ -59,8 +63,15 @@
 )
 from iommi.table import (
     bulk_delete__post_handler,
+    paginator__cached_count,
+    paginator__capped_count,
+    paginator__estimated_count,
+    _related_paths,
+    Cell,
+    Cells,
     Column,
     datetime_formatter,
+    keyset_ordering,
     ordered_by_on_list,
     register_cell_formatter,
     Struct,
@@ -918,6 +929,194 @@ def post_bulk_edit(m2m_updates, **_):
     assert list(baz.foo.all()) == [foo2]
 
 
+@pytest.mark.django_db
+def test_bulk_edit_m2m_in_batches(monkeypatch):
+    import iommi.table
+
+    monkeypatch.setattr(iommi.table, 'BULK_EDIT_BATCH_SIZE', 2)
+
+    foo1 = TFoo.objects.create(a=1, b="")
+    foo2 = TFoo.objects.create(a=2, b="")
+    foo3 = TFoo.objects.create(a=3, b="")
+
+    bazs = [TBaz.objects.create() for _ in range(5)]
+    for baz in bazs:
+        baz.foo.set([foo1, foo2])
+
+    pk_sources = []
+
+    class TestTable(Table):
+        class Meta:
+            rows = TBaz.objects.all()
+
+            @staticmethod
+            def post_bulk_edit(pks, **_):
+                pk_sources.append(pks)
+
+        foo = Column.from_model(
+            model=TBaz,
+            model_field_name='foo',
+            bulk__include=True,
+        )
+
+    through_queries = []
+
+    def capture_through_queries(execute, sql, params, many, context):
+        if 'tests_tbaz_foo' in sql:
+            through_queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(capture_through_queries):
+        response = TestTable().bind(
+            request=req('post', **{
+                '_all_pks_': '1',
+                'bulk/foo': [str(foo2.pk), str(foo3.pk)],
+                '-bulk/submit': '',
+            }),
+        ).render_to_response()
+    assert response.status_code == 302
+
+    # The number of queries grows with the number of batches, not the number of rows
+    assert len(through_queries) == 3 * 2
+
+    for baz in bazs:
+        assert list(baz.foo.all()) == [foo2, foo3]
+
+    pks, = pk_sources
+    assert sorted(pks) == [x.pk for x in bazs]
+
+
+@pytest.mark.django_db
+def test_bulk_edit_m2m_per_object():
+    from django.db.models.signals import m2m_changed
+
+    foo1 = TFoo.objects.create(a=1, b="")
+    foo2 = TFoo.objects.create(a=2, b="")
+
+    bazs = [TBaz.objects.create() for _ in range(2)]
+    for baz in bazs:
+        baz.foo.set([foo1])
+
+    class TestTable(Table):
+        class Meta:
+            rows = TBaz.objects.all()
+            bulk_per_object = True
+
+        foo = Column.from_model(
+            model=TBaz,
+            model_field_name='foo',
+            bulk__include=True,
+        )
+
+    changed = []
+
+    def on_m2m_changed(instance, action, **_):
+        changed.append((instance.pk, action))
+
+    m2m_changed.connect(on_m2m_changed, sender=TBaz.foo.through)
+    try:
+        response = TestTable().bind(
+            request=req('post', **{
+                '_all_pks_': '1',
+                'bulk/foo': str(foo2.pk),
+                '-bulk/submit': '',
+            }),
+        ).render_to_response()
+    finally:
+        m2m_changed.disconnect(on_m2m_changed, sender=TBaz.foo.through)
+    assert response.status_code == 302
+
+    for baz in bazs:
+        assert list(baz.foo.all()) == [foo2]
+        assert (baz.pk, 'post_add') in changed
+
+
+@pytest.mark.django_db
+def test_bulk_edit_m2m_before_django_2_2(monkeypatch):
+    monkeypatch.setattr(django, 'VERSION', (2, 1, 0, 'final', 0))
+
+    foo1 = TFoo.objects.create(a=1, b="")
+    foo2 = TFoo.objects.create(a=2, b="")
+
+    baz = TBaz.objects.create()
+    baz.foo.set([foo1])
+
+    from django.db.models.signals import m2m_changed
+
+    class TestTable(Table):
+        class Meta:
+            rows = TBaz.objects.all()
+
+        foo = Column.from_model(
+            model=TBaz,
+            model_field_name='foo',
+            bulk__include=True,
+        )
+
+    changed = []
+
+    def on_m2m_changed(instance, action, **_):
+        changed.append((instance.pk, action))
+
+    # bulk_create(ignore_conflicts=True) is new in Django 2.2, so set() is used instead
+    m2m_changed.connect(on_m2m_changed, sender=TBaz.foo.through)
+    try:
+        response = TestTable().bind(
+            request=req('post', **{
+                '_all_pks_': '1',
+                'bulk/foo': str(foo2.pk),
+                '-bulk/submit': '',
+            }),
+        ).render_to_response()
+    finally:
+        m2m_changed.disconnect(on_m2m_changed, sender=TBaz.foo.through)
+    assert response.status_code == 302
+    assert list(baz.foo.all()) == [foo2]
+    assert (baz.pk, 'post_add') in changed
+
+
+@pytest.mark.django_db
+def test_bulk_edit_pks_are_lazy():
+    foos = [TFoo.objects.create(a=1, b="") for _ in range(2)]
+    TFoo.objects.create(a=2, b="x")
+
+    pk_sources = []
+
+    class TestTable(Table):
+        class Meta:
+            rows = TFoo.objects.filter(b="")
+
+            @staticmethod
+            def post_bulk_edit(pks, **_):
+                pk_sources.append(pks)
+
+        a = Column.integer(bulk__include=True)
+
+    queries = []
+
+    def capture(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(capture):
+        response = TestTable().bind(
+            request=req('post', **{
+                '_all_pks_': '1',
+                'bulk/a': '3',
+                '-bulk/submit': '',
+            }),
+        ).render_to_response()
+    assert response.status_code == 302
+
+    # Only the UPDATE, the pks are not fetched
+    assert not [x for x in queries if x.startswith('SELECT')]
+
+    pks, = pk_sources
+    assert isinstance(pks, QuerySet)
+    assert sorted(pks) == [x.pk for x in foos]
+    assert [x.a for x in TFoo.objects.order_by('pk')] == [3, 3, 2]
+
+
 @pytest.mark.django_db
 def test_bulk_edit_custom_response():
     class TestTable(Table):
@@ -1251,6 +1450,47 @@ class Meta:
     )
 
 
+@pytest.mark.parametrize('rows_class', [list, IndexedRows])
+def test_query_filtering_on_list(rows_class):
+    read_a_of_pks = []
+
+    class Row:
+        def __init__(self, pk, a, b):
+            self.pk = pk
+            self._a = a
+            self.b = b
+
+        @property
+        def a(self):
+            read_a_of_pks.append(self.pk)
+            return self._a
+
+    rows = rows_class([
+        Row(pk=1, a=1, b='foo'),
+        Row(pk=2, a=2, b='foo'),
+        Row(pk=3, a=3, b='bar'),
+        Row(pk=4, a=4, b='bar'),
+    ])
+
+    table = Table(
+        rows=rows,
+        columns__a=Column.integer(filter__include=True),
+        columns__b=Column(filter__include=True),
+    ).refine_done()
+
+    t = table.bind(request=req('get', b='bar'))
+    assert [x.pk for x in t.sorted_and_filtered_rows] == [3, 4]
+
+    t = table.bind(request=req('get', **{'-query/query': 'a>=2 and b!=foo or a=1'}))
+    assert [x.pk for x in t.sorted_and_filtered_rows] == [1, 3, 4]
+
+    # Only the rows that are left after filtering get sorted
+    read_a_of_pks.clear()
+    t = table.bind(request=req('get', order='-a', **{'-query/query': 'b=bar'}))
+    assert [x.pk for x in t.sorted_and_filtered_rows] == [4, 3]
+    assert sorted(read_a_of_pks) == [3, 4]
+
+
 @pytest.mark.django_db
 def test_query_filtering():
     assert TFoo.objects.all().count() == 0
@@ -1633,6 +1873,78 @@ class TestTable(NoSortTable):
     )
 
 
+def test_compiled_cells_only_evaluate_callables():
+    calls = defaultdict(int)
+
+    def value(row, **_):
+        calls['value'] += 1
+        return row.foo
+
+    def url(row, **_):
+        calls['url'] += 1
+        return f'/{row.bar}/'
+
+    table = Table(
+        columns__foo=Column(cell__value=value, cell__url=url, cell__attrs__class__static=True),
+        columns__bar=Column(cell__attrs__title=lambda value, **_: f'title {value}'),
+        rows=[Struct(foo='a', bar=1), Struct(foo='b', bar=2), Struct(foo='c', bar=3)],
+    ).bind(request=req('get'))
+
+    all_cells = [list(cells) for cells in table.cells_for_rows()]
+    rendered = [[(cell.value, cell.url, cell.attrs, cell.tag) for cell in cells] for cells in all_cells]
+    assert [[(value, url, str(attrs), tag) for value, url, attrs, tag in row] for row in rendered] == [
+        [('a', '/1/', ' class="static"', 'td'), (1, None, ' title="title 1"', 'td')],
+        [('b', '/2/', ' class="static"', 'td'), (2, None, ' title="title 2"', 'td')],
+        [('c', '/3/', ' class="static"', 'td'), (3, None, ' title="title 3"', 'td')],
+    ]
+    assert calls == dict(value=3, url=3)
+    # Only the first row goes through the full Cell construction
+    assert [cells[0]._compiled is not None for cells in all_cells] == [False, True, True]
+
+    # Static attrs are evaluated once, but every cell has its own copy
+    first, second, third = [cells[0] for cells in all_cells]
+    assert second.attrs is not third.attrs
+    second.attrs['class']['changed'] = True
+    second.attrs['data-changed'] = '1'
+    assert str(second.attrs) == ' class="changed static" data-changed="1"'
+    assert str(first.attrs) == ' class="static"'
+    assert str(third.attrs) == ' class="static"'
+    assert str(table.cells_for_rows().__next__()['foo'].attrs) == ' class="static"'
+
+
+def test_compiled_cells_with_custom_cell_class():
+    inits = defaultdict(int)
+
+    class CountingCell(Cell):
+        def __init__(self, cells, column):
+            inits[column._name] += 1
+            super(CountingCell, self).__init__(cells=cells, column=column)
+
+    class CountingCells(Cells):
+        class Meta:
+            cell_class = CountingCell
+
+    table = Table(
+        cells_class=CountingCells,
+        columns__foo=Column(cell__attrs__class__static=True),
+        columns__bar=Column(),
+        rows=[Struct(foo='a', bar=1), Struct(foo='b', bar=2), Struct(foo='c', bar=3)],
+    ).bind(request=req('get'))
+
+    assert [[cell.value for cell in cells] for cells in table.cells_for_rows()] == [['a', 1], ['b', 2], ['c', 3]]
+    # A custom cell class is constructed for every row
+    assert inits == dict(foo=3, bar=3)
+
+
+def test_compiled_cells_getitem():
+    table = Table(
+        columns__foo=Column(),
+        rows=[Struct(foo='a'), Struct(foo='b')],
+    ).bind(request=req('get'))
+    assert [cells['foo'].value for cells in table.cells_for_rows()] == ['a', 'b']
+    assert [cells['foo'].value for cells in table.cells_for_rows()] == ['a', 'b']
+
+
 def test_auto_rowspan_and_render_twice(NoSortTable):
     class TestTable(NoSortTable):
         foo = Column(auto_rowspan=True)
@@ -1671,6 +1983,54 @@ class TestTable(NoSortTable):
     verify_table_html(table=t, expected_html=expected)
 
 
+def test_auto_rowspan_multiple_columns_in_one_pass(NoSortTable):
+    evaluated = defaultdict(int)
+
+    def value(row, column, **_):
+        evaluated[column._name] += 1
+        return getattr(row, column._name)
+
+    class TestTable(NoSortTable):
+        foo = Column(auto_rowspan=True, cell__value=value)
+        bar = Column(auto_rowspan=True, cell__value=value)
+
+    rows = [
+        Struct(foo=1, bar='a'),
+        Struct(foo=1, bar='a'),
+        Struct(foo=1, bar='b'),
+        Struct(foo=2, bar='b'),
+    ]
+
+    verify_table_html(
+        table=TestTable(rows=rows),
+        find=dict(name='tbody'),
+        # language=html
+        expected_html="""
+            <tbody>
+                <tr>
+                    <td rowspan="3"> 1 </td>
+                    <td rowspan="2"> a </td>
+                </tr>
+                <tr>
+                    <td style="display: none"> 1 </td>
+                    <td style="display: none"> a </td>
+                </tr>
+                <tr>
+                    <td style="display: none"> 1 </td>
+                    <td rowspan="2"> b </td>
+                </tr>
+                <tr>
+                    <td rowspan="1"> 2 </td>
+                    <td style="display: none"> b </td>
+                </tr>
+            </tbody>
+        """,
+    )
+
+    # Once for the rowspans and once for rendering
+    assert evaluated == dict(foo=2 * len(rows), bar=2 * len(rows))
+
+
 def test_auto_rowspan_fail_on_override():
     with pytest.raises(AssertionError) as e:
         Table(
@@ -2405,6 +2765,64 @@ def get_response(request):
     }
 
 
+@pytest.mark.django_db
+def test_ajax_dispatch_binds_partially():
+    TFoo.objects.create(a=1, b='A')
+    TBar.objects.create(foo=TFoo.objects.get(), c=True)
+
+    table = Table(
+        auto__model=TBar,
+        columns__foo__filter=dict(include=True, field__include=True),
+        columns__c__filter__include=True,
+        columns__c__bulk__include=True,
+    ).bind(request=req('get', **{'/query/form/fields/foo/endpoints/choices': ''}))
+
+    assert table.header_levels is None
+    assert table.bulk is not None and not table.bulk._is_bound
+    assert table.query.form._is_partially_bound
+    assert list(table.query.form.all_fields.keys()) == ['foo']
+
+    response = table.render_to_response()
+    assert json.loads(response.content)['results'] == [{'id': 1, 'text': 'Foo(1, A)'}]
+    assert list(table.query.form.all_fields.keys()) == ['foo']
+
+    # If the table is rendered after all, the rest of the bind is done first
+    assert '<th class="first_column subheader">' in table.__html__()
+    assert table.bulk._is_bound
+
+
+@pytest.mark.django_db
+def test_partially_bound_table_is_finished_when_dispatch_has_no_response():
+    TFoo.objects.create(a=1, b='A')
+    TBar.objects.create(foo=TFoo.objects.get(), c=True)
+
+    page = Page(
+        parts__table=Table(
+            auto__model=TBar,
+            columns__c=dict(bulk__include=True, aggregate='count'),
+        ),
+    ).bind(request=req('post', **{'-bulk/submit': '', 'bulk/c': 'not a boolean'}))
+    table = page.parts.table
+    assert table.header_levels is None
+    assert table._deferred_bind_steps
+
+    # The bulk form is invalid, so the post handler returns nothing and the page is rendered
+    assert page.perform_dispatch() is None
+    assert table.header_levels is not None
+    assert table._deferred_bind_steps == []
+    assert page._iommi_deferred_binds == []
+    assert table.get_aggregates() == dict(c=1)
+
+
+@pytest.mark.django_db
+def test_ajax_dispatch_to_table_endpoint_binds_fully():
+    table = Table(
+        auto__model=TBar,
+        columns__c__filter__include=True,
+    ).bind(request=req('get', **{'/endpoints/tbody': ''}))
+    assert table.header_levels is not None
+
+
 @pytest.mark.django_db
 @override_settings(DEBUG=True)
 def test_endpoint_path_of_nested_part():
@@ -2662,6 +3080,32 @@ def test_csv_pagination():
     )
 
 
+@pytest.mark.django_db
+def test_csv_streaming():
+    for i in range(5):
+        CSVExportTestModel.objects.create(a=i, b='a', c=1.0)
+    t = Table(
+        auto__model=CSVExportTestModel,
+        columns__a__extra_evaluated__report_name='A',
+        columns__b__extra_evaluated__report_name='B',
+        columns__b__extra_evaluated__report_value='constant',
+        columns__b__cell__value=lambda **_: 1 / 0,
+        extra_evaluated__report_name='foo',
+        extra_evaluated__report_chunk_size=2,
+    ).bind(request=req('get', **{'/csv': ''}))
+    response = t.render_to_response()
+    assert response.streaming
+    assert next(response.streaming_content).decode() == 'A,B\r\n'
+    assert b''.join(response.streaming_content).decode().replace('\r\n', '\n') == """\
+0,constant
+1,constant
+2,constant
+3,constant
+4,constant
+"""
+    assert t.sorted_and_filtered_rows._result_cache is None
+
+
 @pytest.mark.django_db
 def test_query_from_indexes():
     t = Table(
@@ -2751,6 +3195,247 @@ def test_paginator_clamping():
     assert t.bind(request=req('get', page='11')).paginator.page == 10
 
 
+@pytest.mark.django_db
+def test_paginator_capped_count():
+    for a in range(5):
+        TFoo.objects.create(a=a, b='x')
+
+    def bind(max_count):
+        return Table(
+            auto__model=TFoo,
+            page_size=1,
+            parts__page__count=paginator__capped_count,
+            parts__page__max_count=max_count,
+        ).bind(request=req('get')).paginator
+
+    paginator = bind(max_count=3)
+    assert paginator.count == 3
+    assert paginator.count_is_capped is True
+    assert paginator.context['hits_capped'] is True
+    assert paginator.number_of_pages == 3
+
+    paginator = bind(max_count=5)
+    assert paginator.count == 5
+    assert paginator.count_is_capped is False
+
+
+@pytest.mark.django_db
+def test_paginator_capped_count_can_page_past_the_cap():
+    for a in range(5):
+        TFoo.objects.create(a=a, b='x')
+
+    def bind(page):
+        return Table(
+            auto__model=TFoo,
+            rows=TFoo.objects.order_by('a'),
+            page_size=1,
+            parts__page__count=paginator__capped_count,
+            parts__page__max_count=3,
+        ).bind(request=req('get', page=page)).paginator
+
+    paginator = bind(page=3)
+    assert [x.a for x in paginator.rows] == [2]
+    assert paginator.context['has_next'] is True
+    assert paginator.context['show_last'] is False
+    html = paginator.__html__()
+    assert '<span aria-label="Number of rows">3+</span>' in html
+    assert 'Last Page' not in html
+
+    paginator = bind(page=4)
+    assert paginator.page == 4
+    assert [x.a for x in paginator.rows] == [3]
+    assert paginator.context['has_next'] is True
+    assert paginator.context['page_numbers'] == [1, 2, 3, 4]
+
+    paginator = bind(page=5)
+    assert [x.a for x in paginator.rows] == [4]
+    assert paginator.context['has_next'] is False
+
+
+@pytest.mark.django_db
+def test_paginator_estimated_count_falls_back_to_exact_count():
+    for a in range(5):
+        TFoo.objects.create(a=a, b='x')
+
+    paginator = Table(
+        auto__model=TFoo,
+        page_size=1,
+        parts__page__count=paginator__estimated_count,
+    ).bind(request=req('get')).paginator
+    assert paginator.count == 5
+    assert paginator.count_is_estimated is False
+
+
+@pytest.mark.django_db
+def test_paginator_cached_count():
+    cache.clear()
+    TFoo.objects.create(a=1, b='x')
+    TFoo.objects.create(a=2, b='x')
+
+    def bind(**params):
+        return Table(
+            auto__model=TFoo,
+            page_size=1,
+            parts__page__count=paginator__cached_count,
+            columns__a__filter__include=True,
+        ).bind(request=req('get', **params)).paginator
+
+    assert bind().count == 2
+    TFoo.objects.create(a=3, b='x')
+
+    executed = []
+
+    def capture(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(capture):
+        assert bind().count == 2
+    assert executed == []
+
+    # A different query is counted separately
+    assert bind(a='3').count == 1
+
+    cache.clear()
+    assert bind().count == 3
+
+
+@pytest.mark.django_db
+def test_paginator_keyset():
+    for a in [3, 1, 2, 2, 5, 4]:
+        TFoo.objects.create(a=a, b='x')
+
+    def bind(**params):
+        return Table(
+            auto__model=TFoo,
+            parts__page__keyset=True,
+            page_size=2,
+        ).bind(request=req('get', order='-a', **params))
+
+    executed = []
+
+    def capture(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(capture):
+        t = bind()
+        t.__html__()
+    # Only the rows of the page, and one more to see if there is a next page
+    assert len(executed) == 1
+    assert 'COUNT' not in executed[0]
+    assert [(x.a, x.pk) for x in t.get_visible_rows()] == [(5, 5), (4, 6)]
+    assert t.paginator.is_paginated()
+    assert t.paginator.has_previous is False
+    assert t.paginator.context['previous'] is None
+    next_cursor = t.paginator.context['next']
+    assert f'page={next_cursor}' in t.__html__()
+
+    t = bind(page=next_cursor)
+    assert [(x.a, x.pk) for x in t.get_visible_rows()] == [(3, 1), (2, 3)]
+    assert t.paginator.has_previous is True
+    assert t.paginator.has_next is True
+    # The first page has no cursor
+    assert '<a href="?order=-a&amp;" aria-label="First Page">' in t.__html__()
+
+    t = bind(page=t.paginator.context['next'])
+    assert [(x.a, x.pk) for x in t.get_visible_rows()] == [(2, 4), (1, 2)]
+    assert t.paginator.has_next is False
+
+    t = bind(page=t.paginator.context['previous'])
+    assert [(x.a, x.pk) for x in t.get_visible_rows()] == [(3, 1), (2, 3)]
+    assert t.paginator.has_next is True
+    assert t.paginator.has_previous is True
+
+    t = bind(page=t.paginator.context['previous'])
+    assert [(x.a, x.pk) for x in t.get_visible_rows()] == [(5, 5), (4, 6)]
+    assert t.paginator.has_previous is False
+
+    # An invalid cursor gives the first page
+    assert [x.a for x in bind(page='1').get_visible_rows()] == [5, 4]
+    assert [x.a for x in bind(page='garbage').get_visible_rows()] == [5, 4]
+
+
+@pytest.mark.django_db
+def test_keyset_ordering(monkeypatch):
+    assert keyset_ordering(TFoo.objects.all()) == ['pk']
+    assert keyset_ordering(TFoo.objects.order_by('-a', 'b')) == ['-a', 'b', 'pk']
+    assert keyset_ordering(TFoo.objects.annotate(c=F('a')).order_by('c')) == ['c', 'pk']
+    assert keyset_ordering(TBar.objects.order_by('foo_id')) == ['foo_id', 'pk']
+    assert keyset_ordering(TBar.objects.order_by('-foo__a')) == ['-foo__a', 'pk']
+
+    # A foreign key is ordered on the ordering of the related model
+    assert keyset_ordering(TBar.objects.order_by('-foo')) == ['-foo__pk', 'pk']
+    assert keyset_ordering(TBar2.objects.order_by('bar__foo')) == ['bar__foo__pk', 'pk']
+    monkeypatch.setattr(TFoo._meta, 'ordering', ['-a', 'b'])
+    assert keyset_ordering(TBar.objects.order_by('-foo')) == ['foo__a', '-foo__b', 'pk']
+
+    # Orderings that can't be used for keyset pagination
+    assert keyset_ordering(TFoo.objects.order_by(F('a').desc())) is None
+    assert keyset_ordering(TFoo.objects.order_by('?')) is None
+    assert keyset_ordering(TFoo.objects.order_by('tbar__c')) is None
+    assert keyset_ordering(TFoo.objects.order_by('b__lower')) is None
+
+
+@pytest.mark.django_db
+def test_paginator_keyset_on_foreign_key(monkeypatch):
+    monkeypatch.setattr(TFoo._meta, 'ordering', ['-a'])
+    for a in [1, 3, 2]:
+        foo = TFoo.objects.create(a=a, b='x')
+        TBar.objects.create(foo=foo, c=True)
+        TBar.objects.create(foo=foo, c=False)
+
+    def bind(**params):
+        return Table(
+            auto__rows=TBar.objects.order_by('foo'),
+            parts__page__keyset=True,
+            page_size=2,
+        ).bind(request=req('get', **params))
+
+    seen = []
+    t = bind()
+    while True:
+        seen += [(x.foo.a, x.pk) for x in t.get_visible_rows()]
+        if not t.paginator.has_next:
+            break
+        t = bind(page=t.paginator.context['next'])
+    assert seen == [(3, 3), (3, 4), (2, 5), (2, 6), (1, 1), (1, 2)]
+
+
+@pytest.mark.django_db
+def test_paginator_keyset_falls_back_to_page_numbers():
+    for a in range(5):
+        TFoo.objects.create(a=a, b='x')
+
+    t = Table(
+        auto__rows=TFoo.objects.order_by(F('a').desc()),
+        parts__page__keyset=True,
+        page_size=2,
+    ).bind(request=req('get', page='2'))
+    assert [x.a for x in t.get_visible_rows()] == [2, 1]
+    assert t.paginator.number_of_pages == 3
+    assert 'aria-label="Page 3"' in t.__html__()
+
+    # A cursor from keyset pagination gives the first page
+    t = Table(
+        auto__rows=TFoo.objects.order_by(F('a').desc()),
+        parts__page__keyset=True,
+        page_size=2,
+    ).bind(request=req('get', page='WyJuZXh0IixbMV1d'))
+    assert [x.a for x in t.get_visible_rows()] == [4, 3]
+
+
+@pytest.mark.django_db
+def test_paginator_keyset_empty():
+    t = Table(
+        auto__model=TFoo,
+        parts__page__keyset=True,
+        empty_message='Nothing here',
+    ).bind(request=req('get'))
+    assert 'Nothing here' in t.__html__()
+    assert t.paginator.is_paginated() is False
+
+
 @pytest.mark.django_db
 def test_reinvoke():
     class MyTable(Table):
@@ -3770,3 +4455,342 @@ class TestTable(Table):
         </nav>
         """,
     )
+
+
+@pytest.mark.skipif(not django.VERSION[:2] >= (3, 1), reason='Requires django 3.1+')
+@pytest.mark.django_db
+def test_async_view():
+    for x in range(5):
+        TFoo(a=x, b="foo").save()
+
+    view = Page(
+        parts__table=Table(
+            auto__model=TFoo,
+            columns__b__include=False,
+            page_size=2,
+        ),
+    ).as_async_view()
+    assert inspect.iscoroutinefunction(view)
+
+    from asgiref.sync import async_to_sync
+
+    executed = []
+
+    def capture(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(capture):
+        response = async_to_sync(view)(req('get', page=2))
+
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert '<td class="rj">2</td>' in content
+    assert '<td class="rj">3</td>' in content
+    assert '<td class="rj">4</td>' not in content
+    assert 'aria-label="Page 3"' in content
+
+    # The count and the page, both done by aprefetch and reused when rendering
+    assert len(executed) == 2
+    assert 'COUNT(' in executed[0]
+
+
+@pytest.mark.skipif(not django.VERSION[:2] >= (3, 1), reason='Requires django 3.1+')
+@pytest.mark.django_db
+def test_async_view_dispatch():
+    TFoo(a=1, b="foo").save()
+
+    from asgiref.sync import async_to_sync
+
+    view = Table(auto__model=TFoo).as_async_view()
+    response = async_to_sync(view)(req('get', **{'/endpoints/tbody': ''}))
+    assert '<td class="rj">1</td>' in json.loads(response.content)['html']
+
+
+@pytest.mark.skipif(not django.VERSION[:2] >= (3, 1), reason='Requires django 3.1+')
+@pytest.mark.django_db
+def test_acells_for_rows():
+    for x in range(3):
+        TFoo(a=x, b="foo").save()
+
+    from asgiref.sync import async_to_sync
+
+    # preprocess_row runs in a worker thread, so it can use the database
+    table = Table(
+        auto__model=TFoo,
+        page_size=2,
+        preprocess_row=lambda row, **_: TFoo.objects.get(pk=row.pk),
+    ).bind(request=req('get'))
+
+    async def collect(**kwargs):
+        return [cells.row.a async for cells in table.acells_for_rows(**kwargs)]
+
+    assert async_to_sync(collect)() == [0, 1]
+    assert async_to_sync(collect)(paginate=False, chunk_size=2) == [0, 1, 2]
+
+    table = Table(rows=[Struct(a=7)], columns__a=Column()).bind(request=req('get'))
+    assert async_to_sync(collect)() == [7]
+
+
+@pytest.mark.skipif(not django.VERSION[:2] >= (3, 1), reason='Requires django 3.1+')
+@pytest.mark.django_db
+def test_async_before_django_4_1(monkeypatch):
+    from asgiref.sync import async_to_sync
+
+    # The async QuerySet methods are new in Django 4.1, before that the sync ones run in a worker thread
+    monkeypatch.setattr(django, 'VERSION', (4, 0, 0, 'final', 0))
+    for name in ['acount', 'aaggregate', 'aiterator', '__aiter__']:
+        monkeypatch.delattr(QuerySet, name, raising=False)
+
+    for x in range(3):
+        TFoo(a=x, b="foo").save()
+
+    table = Table(auto__model=TFoo, page_size=2).bind(request=req('get'))
+
+    async def collect(**kwargs):
+        return [cells.row.a async for cells in table.acells_for_rows(**kwargs)]
+
+    assert async_to_sync(collect)() == [0, 1]
+    assert async_to_sync(collect)(paginate=False, chunk_size=2) == [0, 1, 2]
+
+    view = Table(auto__model=TFoo, columns__b__include=False, page_size=2).as_async_view()
+    response = async_to_sync(view)(req('get', page=2))
+    assert '<td class="rj">2</td>' in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_projection():
+    TFoo.objects.create(a=1, b='foo')
+
+    table = Table(auto__model=TFoo, columns__b__include=False, projection=True).bind(request=req('get'))
+    assert table._projection == ['a', 'id']
+    assert '<td class="rj">1</td>' in table.__html__()
+    assert table.visible_rows[0].get_deferred_fields() == {'b'}
+
+    # Post handlers get full rows
+    table = Table(auto__model=TFoo, columns__b__include=False, projection=True).bind(request=req('post', _all_pks_='1'))
+    assert table.selection()[0].get_deferred_fields() == set()
+
+    # Foreign keys followed with select_related are loaded in full
+    TBar.objects.create(foo=TFoo.objects.get(), c=True)
+    table = Table(auto__model=TBar, columns__c__include=False, projection=True).bind(request=req('get'))
+    assert table._projection == ['foo', 'id']
+    assert 'Foo(1, foo)' in table.__html__()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('kwargs, expected', [
+    (dict(), ['a', 'id']),
+    (dict(columns__a__cell__format=lambda value, **_: value), ['a', 'id']),
+    (dict(columns__a__cell__format=lambda row, **_: row.b), None),
+    (dict(columns__a__cell__format=lambda row, **_: row.b, columns__a__projection=['b']), ['a', 'b', 'id']),
+    (dict(columns__a__cell__url=lambda row, **_: row.get_absolute_url()), None),
+    (dict(columns__a__cell__attrs__title=lambda row, **_: row.b), None),
+    (dict(columns__a__cell__template='iommi/table/cell.html'), None),
+    (dict(columns__a__projection=False), None),
+    (dict(columns__select__include=True), ['a', 'id']),
+    (dict(columns__select__include=True, columns__select__checked=lambda row, **_: row.b), None),
+    (dict(columns__e=Column(cell__value=lambda row, **_: row.b)), None),
+    (dict(columns__e=Column(attr='get_absolute_url')), None),
+    (dict(row__attrs__title=lambda row, **_: row.b), None),
+    (dict(row__template='iommi/table/row.html'), None),
+])
+def test_projection_is_skipped_when_the_row_is_needed(kwargs, expected):
+    table = Table(auto__model=TFoo, columns__b__include=False, projection=True, **kwargs).bind(request=req('get'))
+    assert table._projection == expected
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('kwargs', [
+    pytest.param(dict(preprocess_row=lambda row, **_: row.b and row), id='preprocess_row'),
+    pytest.param(dict(preprocess_rows=lambda rows, **_: [x for x in rows if x.b]), id='preprocess_rows'),
+    pytest.param(dict(template=Template('{% for row in table.rows %}{{ row.b }}{% endfor %}')), id='template'),
+])
+def test_projection_is_off_by_default(kwargs):
+    for x in range(5):
+        TFoo.objects.create(a=x, b='foo')
+
+    table = Table(auto__model=TFoo, columns__b__include=False, **kwargs).bind(request=req('get'))
+    assert table._projection is None
+
+    executed = []
+
+    def capture(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(capture):
+        table.__html__()
+
+    # The count and the rows, the fields the table doesn't render are not loaded one row at a time
+    assert len(executed) == 2
+
+
+def test_related_paths():
+    assert _related_paths(TBar, 'c') == (None, None)
+    assert _related_paths(TBar, 'foo') == (None, None)
+    assert _related_paths(TBar, 'foo__a') == ('foo', None)
+    assert _related_paths(TBar, 'foo__tbar_set') == ('foo', 'foo__tbar_set')
+    assert _related_paths(TBar, 'foo__tbar_set__c') == ('foo', None)
+    assert _related_paths(TBar, 'foo__not_a_field__a') == ('foo', None)
+    assert _related_paths(TBar2, 'bar__foo') == ('bar__foo', None)
+    assert _related_paths(TBar2, 'bar__foo__a') == ('bar__foo', None)
+
+
+@pytest.mark.django_db
+def test_select_related_for_dotted_attr(caplog):
+    for x in range(3):
+        TBar2.objects.create(bar=TBar.objects.create(foo=TFoo.objects.create(a=x, b='foo'), c=True))
+
+    with caplog.at_level('DEBUG', logger='iommi'):
+        table = Table(
+            auto__model=TBar2,
+            columns__a=Column(attr='bar__foo__a'),
+            columns__foos=Column(attr='bar__foo__tbar_set', cell__format=lambda value, **_: value.count()),
+        ).bind(request=req('get'))
+    assert "added select_related {'bar__foo': ['a', 'foos']}" in caplog.text
+
+    assert table._automatic_related == Struct(
+        select_related={'bar__foo': ['a', 'foos']},
+        prefetch_related={'bar__foo__tbar_set': ['foos']},
+    )
+
+    executed = []
+
+    def capture(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(capture):
+        html = table.__html__()
+
+    assert '<td>2</td>' in html
+    # The count, the rows with the joined foreign keys, and the prefetch
+    assert len(executed) == 3
+
+
+@pytest.mark.django_db
+def test_aggregate_footer():
+    for x in range(1, 5):
+        TFoo.objects.create(a=x, b='foo')
+
+    table = Table(
+        auto__model=TFoo,
+        columns__a__aggregate='sum',
+        columns__b__aggregate='count',
+        columns__avg=Column(attr='a', aggregate='avg'),
+        columns__max=Column(attr='a', aggregate='max', render_column=False),
+        page_size=2,
+        footer__per_page=True,
+    ).bind(request=req('get'))
+
+    executed = []
+
+    def capture(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(capture):
+        html = table.__html__()
+
+    # The count, the rows of the page and the aggregates
+    assert len(executed) == 3
+    assert 'SUM(' in executed[2] and 'AVG(' in executed[2]
+    assert '<tfoot>' in html
+
+    assert table.get_aggregates() == dict(a=10, b=4, avg=2.5, max=4)
+    assert table.get_page_aggregates() == dict(a=3, b=2, avg=1.5, max=2)
+
+    verify_table_html(
+        table=table,
+        find=dict(name='tfoot'),
+        expected_html="""
+            <tfoot>
+                <tr data-aggregate="page">
+                    <td> 3 </td>
+                    <td> 2 </td>
+                    <td> 1.5 </td>
+                </tr>
+                <tr data-aggregate="total">
+                    <td> 10 </td>
+                    <td> 4 </td>
+                    <td> 2.5 </td>
+                </tr>
+            </tfoot>
+        """,
+    )
+
+
+@pytest.mark.django_db
+def test_aggregate_footer_is_not_rendered_without_aggregates():
+    TFoo.objects.create(a=1, b='foo')
+    table = Table(auto__model=TFoo).bind(request=req('get'))
+    assert table.footer_rows == []
+    assert '<tfoot>' not in table.__html__()
+
+
+def test_aggregate_footer_on_list():
+    table = Table(
+        rows=[Struct(a=1, b='x'), Struct(a=None, b='y'), Struct(a=5, b=None)],
+        columns__a=Column(aggregate='sum'),
+        columns__b=Column(aggregate='min'),
+        columns__avg=Column(attr='a', aggregate='avg'),
+        columns__count=Column(attr=None, aggregate='count'),
+        columns__nothing=Column(attr='b', aggregate='max', cell__value=lambda row, **_: None),
+    ).bind(request=req('get'))
+    assert table.get_aggregates() == dict(a=6, b='x', avg=3, count=3, nothing='y')
+
+    table = Table(rows=[], columns__a=Column(aggregate='sum'), columns__count=Column(attr=None, aggregate='count')).bind(request=req('get'))
+    assert table.get_aggregates() == dict(a=None, count=0)
+    assert [x.value for x in table.footer_rows[0].cells] == ['', '0']
+
+
+def test_aggregate_validation():
+    with pytest.raises(AssertionError, match="Unknown aggregate 'median' on column a"):
+        Table(rows=[], columns__a=Column(aggregate='median')).bind(request=req('get'))
+
+    with pytest.raises(AssertionError, match='The aggregate of column a needs an attr'):
+        Table(rows=[], columns__a=Column(attr=None, aggregate='sum')).bind(request=req('get'))
+
+
+@pytest.mark.django_db
+def test_aggregate_validation_on_queryset(monkeypatch):
+    monkeypatch.setattr(TFoo, 'double_a', property(lambda self: self.a * 2), raising=False)
+
+    with pytest.raises(AssertionError, match="attr must be a field of TFoo, not a property or method. TFoo has no field with path 'double_a'"):
+        Table(auto__model=TFoo, columns__double_a=Column(aggregate='sum')).bind(request=req('get')).columns.double_a
+
+    with pytest.raises(AssertionError, match="TBar has no field with path 'foo__nope'"):
+        Table(auto__model=TBar, columns__nope=Column(attr='foo__nope', aggregate='max')).bind(request=req('get')).columns.nope
+
+    TFoo.objects.create(a=1, b='foo')
+    TFoo.objects.create(a=2, b='foo')
+    table = Table(
+        auto__model=TFoo,
+        rows=TFoo.objects.annotate(double_a=F('a') * 2),
+        columns__double_a=Column(aggregate='sum'),
+        columns__count=Column(attr=None, aggregate='count'),
+    ).bind(request=req('get'))
+    assert table.get_aggregates() == dict(double_a=6, count=2)
+
+
+@pytest.mark.skipif(not django.VERSION[:2] >= (3, 1), reason='Requires django 3.1+')
+@pytest.mark.django_db
+def test_aggregates_are_prefetched(monkeypatch):
+    from asgiref.sync import async_to_sync
+
+    TFoo.objects.create(a=3, b='foo')
+    table = Table(auto__model=TFoo, columns__a__aggregate='max').bind(request=req('get'))
+    async_to_sync(table.aprefetch)()
+    assert table._aggregates == dict(a=3)
+
+    table = Table(auto__model=TFoo, columns__a__aggregate='max').bind(request=req('get'))
+    table.prefetch()
+    assert table._aggregates == dict(a=3)
+
+    # QuerySet.aaggregate is new in Django 4.1, before that aggregate runs in a worker thread
+    monkeypatch.setattr(django, 'VERSION', (4, 0, 0, 'final', 0))
+    monkeypatch.delattr(QuerySet, 'aaggregate', raising=False)
+    table = Table(auto__model=TFoo, columns__a__aggregate='max').bind(request=req('get'))
+    async_to_sync(table.aprefetch)()
+    assert table._aggregates == dict(a=3)
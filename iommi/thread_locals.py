@@ -1,11 +1,13 @@
-import threading
+from contextvars import ContextVar
 
-_thread_locals = threading.local()
+# A context variable instead of a thread local, so the current request is
+# also right in async views, where many requests share one thread.
+_current_request = ContextVar('iommi_current_request', default=None)
 
 
 def get_current_request():
-    return getattr(_thread_locals, 'request', None)
+    return _current_request.get()
 
 
 def set_current_request(request):
-    _thread_locals.request = request
+    _current_request.set(request)
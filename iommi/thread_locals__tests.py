@@ -1,15 +1,31 @@
+from contextvars import copy_context
+
 from iommi.thread_locals import (
-    _thread_locals,
     get_current_request,
     set_current_request,
 )
 
 
 def test_threadlocals():
-    _thread_locals.__dict__.clear()
+    set_current_request(None)
 
     assert get_current_request() is None
 
     sentinel = object()
     set_current_request(sentinel)
     assert get_current_request() == sentinel
+
+    set_current_request(None)
+
+
+def test_current_request_is_per_context():
+    sentinel = object()
+
+    def in_other_context():
+        assert get_current_request() is None
+        set_current_request(sentinel)
+        return get_current_request()
+
+    set_current_request(None)
+    assert copy_context().run(in_other_context) is sentinel
+    assert get_current_request() is None
@@ -2,7 +2,6 @@
 from typing import (
     Any,
     Dict,
-    List,
 )
 
 from iommi.struct import Struct
@@ -101,14 +100,24 @@ def iommi_path(self) -> str:
         if hasattr(self, '_iommi_path_override'):
             return self._iommi_path_override
 
+        path = self.__dict__.get('_iommi_path')
+        if path is not None:
+            return path
+
         long_path = build_long_path(self)
         path_by_long_path = get_path_by_long_path(self)
         path = path_by_long_path.get(long_path)
+        if path is None and rebuild_shared_path_index(self.iommi_root()):
+            path_by_long_path = get_path_by_long_path(self)
+            path = path_by_long_path.get(long_path)
         if path is None:
             candidates = '\n'.join(path_by_long_path.keys())
             raise PathNotFoundException(
                 f"Path not found(!) (Searched for '{long_path}' among the following:\n{candidates}"
             )
+        if self._is_bound:
+            # The place of a bound node in the tree doesn't change
+            self._iommi_path = path
         return path
 
     @property
@@ -126,7 +135,7 @@ def apply_style(self, iommi_style: Style, is_root=True):
 
         if refinements:
             for refinement in refinements:
-                result = result.refine(Prio.style, **Namespace(refinement))
+                result = result.refine(Prio.style, **refinement)
         else:
             result = result.refine(Prio.style)
 
@@ -153,16 +162,18 @@ def bind(self, *, parent=None, request=None):
             if result._name is None:
                 result._name = 'root'
             result._iommi_collected_assets = {}
+            result._iommi_deferred_binds = []
 
         result._parent = parent
         result._bound_members = Struct()
         result._is_bound = True
 
-        evaluate_parameters = {
-            **(parent.iommi_evaluate_parameters() if parent is not None else {}),
-            **result.own_evaluate_parameters(),
-            'traversable': result,
-        }
+        bind_plan = get_bind_plan(type(result))
+
+        evaluate_parameters = {**(parent.iommi_evaluate_parameters() if parent is not None else {})}
+        if bind_plan.has_own_evaluate_parameters:
+            evaluate_parameters.update(result.own_evaluate_parameters())
+        evaluate_parameters['traversable'] = result
         if parent is None:
             evaluate_parameters['request'] = request
             if hasattr(request, 'iommi_view_params'):
@@ -185,10 +196,7 @@ def bind(self, *, parent=None, request=None):
         if hasattr(result, 'attrs'):
             result.attrs = evaluate_attrs(result, **result.iommi_evaluate_parameters())
 
-        evaluated_attributes = [
-            k for k, v in items(result.get_declared('refinable')) if is_evaluated_refinable(v)
-        ]
-        evaluate_members(result, evaluated_attributes, **evaluate_parameters)
+        evaluate_members(result, bind_plan.evaluated_attributes, **evaluate_parameters)
 
         if hasattr(result, 'extra_evaluated'):
             result.extra_evaluated = evaluate_strict_container(result.extra_evaluated or {}, **evaluate_parameters)
@@ -217,11 +225,30 @@ def get_context(self):
             return self.iommi_parent().get_context()
 
 
+def get_bind_plan(cls) -> Struct:
+    """
+    The parts of binding that only depend on the class, computed on the
+    first bind of each class and then reused.
+    """
+    declared = cls.get_declared('refinable')
+    bind_plan = cls.__dict__.get('_iommi_bind_plan')
+    if bind_plan is None or bind_plan.declared is not declared:
+        bind_plan = Struct(
+            declared=declared,
+            evaluated_attributes=[k for k, v in items(declared) if is_evaluated_refinable(v)],
+            is_member_container_by_name={k: isinstance(v, RefinableMembers) for k, v in items(declared)},
+            has_own_evaluate_parameters=getattr(cls, 'own_evaluate_parameters', None) is not Traversable.own_evaluate_parameters,
+        )
+        setattr(cls, '_iommi_bind_plan', bind_plan)
+    return bind_plan
+
+
 def declared_members(node: Traversable) -> Any:
     assert node.is_refine_done, "Trying to find declared_member on RefinableObject without doing refine_done() first"
     result = Namespace()
-    for k, v in items(node.get_declared('refinable')):
-        if isinstance(v, RefinableMembers):
+    bind_plan = get_bind_plan(type(node))
+    for k, is_member_container in items(bind_plan.is_member_container_by_name):
+        if is_member_container:
             result[k] = node.iommi_namespace.get(k, Namespace())
         else:
             child = getattr(node, k)
@@ -234,33 +261,72 @@ def declared_members(node: Traversable) -> Any:
     return result
 
 
+def _get_path_index(root):
+    """
+    The short and long path maps of a root. The tree has the same shape for
+    every bind of a declaration, so for a bound root the maps are built the
+    first time and then stored on the declaration (e.g. the target of
+    `as_view`), to be shared by all following binds of it.
+    """
+    path_index = getattr(root, '_path_index', None)
+    if path_index is None:
+        declared = getattr(root, '_declared', None) if root._is_bound else None
+        if declared is not None and declared.is_refine_done:
+            path_index = getattr(declared, '_shared_path_index', None)
+            if path_index is None:
+                path_index = declared._shared_path_index = _build_path_index(root, is_shared=True)
+        else:
+            path_index = _build_path_index(root, is_shared=False)
+        root._path_index = path_index
+    return path_index
+
+
+def _build_path_index(root, *, is_shared):
+    long_path_by_path = build_long_path_by_path(root)
+    return Struct(
+        long_path_by_path=long_path_by_path,
+        path_by_long_path={v: k for k, v in items(long_path_by_path)},
+        is_shared=is_shared,
+    )
+
+
+def rebuild_shared_path_index(root) -> bool:
+    """
+    Parts that are set up during bind, and parts removed during bind, can
+    differ between binds. If a path is missing from a shared index, this
+    gives the root an index of its own. Returns `False` if the root already
+    had its own index.
+    """
+    if not _get_path_index(root).is_shared:
+        return False
+    root._path_index = _build_path_index(root, is_shared=False)
+    return True
+
+
 def get_long_path_by_path(node):
-    root = node.iommi_root()
-    long_path_by_path = getattr(root, '_long_path_by_path', None)
-    if long_path_by_path is None:
-        long_path_by_path = build_long_path_by_path(root)
-        root._long_path_by_path = long_path_by_path
-    return long_path_by_path
+    return _get_path_index(node.iommi_root()).long_path_by_path
 
 
 def get_path_by_long_path(node):
-    root = node.iommi_root()
-    path_by_long_path = getattr(root, '_path_by_long_path', None)
-    if path_by_long_path is None:
-        long_path_by_path = get_long_path_by_path(root)
-        path_by_long_path = {v: k for k, v in items(long_path_by_path)}
-        root._path_by_long_path = path_by_long_path
-    return path_by_long_path
+    return _get_path_index(node.iommi_root()).path_by_long_path
 
 
 def build_long_path(node: Traversable) -> str:
-    def _traverse(t: Traversable) -> List[str]:
-        assert t.iommi_name() is not None
-        if t.iommi_parent() is None:
-            return []
-        return _traverse(t.iommi_parent()) + [t.iommi_name()]
-
-    return '/'.join(_traverse(node))
+    long_path = node.__dict__.get('_iommi_long_path')
+    if long_path is not None:
+        return long_path
+
+    assert node.iommi_name() is not None
+    parent = node.iommi_parent()
+    if parent is None:
+        long_path = ''
+    else:
+        parent_long_path = build_long_path(parent)
+        long_path = f'{parent_long_path}/{node.iommi_name()}' if parent_long_path else node.iommi_name()
+
+    if node._is_bound:
+        node._iommi_long_path = long_path
+    return long_path
 
 
 def include_in_short_path(node):
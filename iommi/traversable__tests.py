@@ -42,8 +42,12 @@
     superinvoking_classmethod,
     with_defaults,
 )
+from iommi import traversable
+from iommi.endpoint import find_target
 from iommi.traversable import (
     build_long_path_by_path,
+    get_bind_plan,
+    get_long_path_by_path,
     Traversable,
 )
 from tests.helpers import (
@@ -160,6 +164,7 @@ class MyPage(Page):
         'input': 'parts/some_form/fields/fisk/input',
         'label': 'parts/some_form/fields/fisk/label',
         'header': 'parts/a_table/header',
+        'footer': 'parts/a_table/footer',
         'non_editable_input': 'parts/some_form/fields/fisk/non_editable_input',
         'page': 'parts/a_table/parts/page',
         'query': 'parts/a_table/query',
@@ -425,3 +430,73 @@ class MyBasket(Basket):
             'fruit_shortcut_base',
             'my_basket_fruit_invoke',
         })
+
+
+def test_bind_plan_is_computed_once_per_class():
+    class MyTraversable(Traversable):
+        foo = EvaluatedRefinable()
+        bar = Refinable()
+        baz = RefinableMembers()
+
+        def own_evaluate_parameters(self):
+            return dict(my_traversable=self)
+
+    bind_plan = get_bind_plan(MyTraversable)
+    assert bind_plan.evaluated_attributes == ['foo']
+    assert [k for k, v in items(bind_plan.is_member_container_by_name) if v] == ['assets', 'endpoints', 'baz']
+    assert bind_plan.has_own_evaluate_parameters
+    assert not get_bind_plan(Traversable).has_own_evaluate_parameters
+
+    bound = MyTraversable(foo=lambda my_traversable, **_: my_traversable).bind()
+    assert bound.foo is bound
+    assert get_bind_plan(MyTraversable) is bind_plan
+
+    class MySubTraversable(MyTraversable):
+        qux = EvaluatedRefinable()
+
+    assert get_bind_plan(MySubTraversable).evaluated_attributes == ['foo', 'qux']
+    assert get_bind_plan(MyTraversable) is bind_plan
+
+
+def test_path_index_is_shared_between_binds_of_a_declaration(monkeypatch):
+    calls = []
+    original_build_long_path_by_path = traversable.build_long_path_by_path
+
+    def counting_build_long_path_by_path(root):
+        calls.append(root)
+        return original_build_long_path_by_path(root)
+
+    monkeypatch.setattr(traversable, 'build_long_path_by_path', counting_build_long_path_by_path)
+
+    declaration = Box(items__basket=Basket(fruits__banana=Fruit())).refine_done()
+
+    first = declaration.bind(request=None)
+    banana = find_target(path='/banana', root=first)
+    assert banana.iommi_path == 'banana'
+    assert banana._iommi_path == 'banana'
+    assert banana._iommi_long_path == 'items/basket/fruits/banana'
+
+    second = declaration.bind(request=None)
+    assert find_target(path='/banana', root=second).iommi_path == 'banana'
+    assert get_long_path_by_path(second) is get_long_path_by_path(first)
+    assert len(calls) == 1
+
+    # A root that isn't refined beforehand has nothing to share with
+    Box(items__basket=Basket(fruits__banana=Fruit())).bind(request=None).iommi_path
+    assert len(calls) == 2
+
+
+def test_path_missing_from_shared_path_index():
+    declaration = Box(items__basket=Basket(fruits__banana=Fruit())).refine_done()
+    first = declaration.bind(request=None)
+    assert get_long_path_by_path(first)
+
+    second = declaration.bind(request=None)
+    # Something set up during this bind only
+    extra = Fruit(_name='extra').refine_done(parent=second).bind(parent=second)
+    second._declared_members = Struct(extra=extra)
+    assert extra.iommi_path == 'extra'
+    assert get_long_path_by_path(second)['extra'] == 'extra'
+
+    assert 'extra' not in get_long_path_by_path(first)
+    assert 'extra' not in get_long_path_by_path(declaration.bind(request=None))